@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare the libyaml and pure-Python backends of :py:func:`deployer.loader.ordered_load`; and the machine formats.
+
+Usage::
+
+    python benchmarks/bench_loader.py [--tasks 5000] [--repeat 3]
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import timeit
+
+import yaml
+from six import StringIO
+
+from deployer import loader
+
+TASK = '''
+- name: task {index}
+  stage:
+    - name: echo {index}
+      echo: "{{{{ item }}}} of {index}"
+      with_items: [a, b, c]
+    - name: shell {index}
+      shell:
+        script: |
+          echo "{index}"
+      tags: [build, test]
+'''
+
+
+def generate(tasks):
+    """Generate a pipeline document of `tasks` stages, each holding two tasks."""
+    return ''.join(TASK.format(index=index) for index in range(tasks))
+
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=5000, help="Number of generated tasks.")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of timed loads, per backend.")
+    options = parser.parse_args()
+
+    text = generate(options.tasks)
+    print("Document: %d lines, %d bytes" % (text.count('\n'), len(text)))
+
+    backends = [('pure-Python', yaml.SafeLoader)]
+    if loader.FastSafeLoader is not yaml.SafeLoader:
+        backends.insert(0, ('libyaml', loader.FastSafeLoader))
+    else:
+        print("libyaml is unavailable; only the pure-Python backend is measured.")
+
+    def _yaml(backend):
+        return lambda: loader.ordered_load(StringIO(text), loader=backend)
+
+    def _format(format):
+        data = loader.dumps(loader.ordered_load(text), format)
+        return lambda: loader.load(data, format)
+
+    candidates = [(name, _yaml(backend)) for name, backend in backends]
+    candidates.append(('json', _format('json')))
+    if loader.msgpack is not None:
+        candidates.append(('msgpack', _format('msgpack')))
+
+    baseline = None
+    for name, candidate in candidates:
+        best = min(timeit.repeat(candidate, number=1, repeat=options.repeat))
+        baseline = baseline or best
+        print("%-12s best of %d: %8.3f s (%7.3fx)" % (name, options.repeat, best, best / baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure executing a task looping over a large list variable, which the task itself also references.
+
+Usage::
+
+    python benchmarks/bench_loops.py [--sizes 250,500,1000,2000] [--repeat 3]
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import logging
+import timeit
+from collections import OrderedDict
+
+from deployer.cli import register_plugins
+from deployer.context import Context
+from deployer.plugins.plugin import Plugin
+from deployer.rendering import clear_memos
+
+
+def generate(size):
+    """Generate a pipeline setting a list of `size` hosts, then echoing once for each of them."""
+    return [OrderedDict([('name', 'hosts'), ('set', OrderedDict([('hosts', list(range(size)))]))]),
+            OrderedDict([('name', 'loop'), ('echo', '{{ item }} of {{ hosts | length }}'),
+                         ('with_items', '{{ hosts }}')])]
+
+
+def execute(document):
+    """Build, then execute every task of, the `document`."""
+    clear_memos()
+    context = Context()
+    for plugins in Plugin._compile(document):
+        for plugin in plugins:
+            plugin.execute(context)
+
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='250,500,1000,2000', help="Comma-separated list lengths.")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of timed runs, per length.")
+    options = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    register_plugins()
+
+    print("%6s %12s %16s" % ('size', 'total (ms)', 'per item (us)'))
+    for size in [int(size) for size in options.sizes.split(',')]:
+        document = generate(size)
+        best = min(timeit.repeat(lambda: execute(document), number=1, repeat=options.repeat))
+        print("%6d %12.2f %16.2f" % (size, best * 1000, best * 1e6 / size))
+
+
+if __name__ == '__main__':
+    main()
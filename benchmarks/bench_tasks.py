@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the memory held by each built task, and the overhead of executing each one; for very large pipelines.
+
+Usage::
+
+    python benchmarks/bench_tasks.py [--tasks 100000] [--repeat 3]
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import gc
+import logging
+import sys
+import timeit
+import tracemalloc
+from collections import OrderedDict
+
+from deployer.cli import register_plugins
+from deployer.context import Context
+from deployer.plugins.plugin import Plugin
+from deployer.result import Result
+
+
+def generate(tasks):
+    """Generate a pipeline document of `tasks` trivial tasks; each registering its result."""
+    return [OrderedDict([('name', 'task %d' % index), ('set', OrderedDict([('value', index)])), ('register', 'last')])
+            for index in range(tasks)]
+
+
+def allocated(function):
+    """Return the result of calling `function`, and the number of bytes it left allocated."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = function()
+        gc.collect()
+        return value, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def execute(tree):
+    """Execute every task of the built `tree`."""
+    context = Context()
+    for plugins in tree:
+        for plugin in plugins:
+            plugin.execute(context)
+
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=100000, help="Number of generated tasks.")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of timed executions.")
+    options = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    register_plugins()
+
+    document = generate(options.tasks)
+    tree, size = allocated(lambda: Plugin._compile(document))
+    results, results_size = allocated(lambda: [Result(result='success') for _ in range(options.tasks)])
+
+    print("Tasks:              %d" % options.tasks)
+    print("Memory per task:    %.1f bytes (%d bytes per task node)" % (size / options.tasks, sys.getsizeof(tree[0][0])))
+    print("Memory per result:  %.1f bytes" % (results_size / options.tasks))
+
+    best = min(timeit.repeat(lambda: execute(tree), number=1, repeat=options.repeat))
+    print("Execution:          %.3f s (%.2f us per task)" % (best, best * 1e6 / options.tasks))
+
+
+if __name__ == '__main__':
+    main()
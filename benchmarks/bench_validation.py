@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure validating and building pipelines of deeply nested stages; with and without memoized validation.
+
+Usage::
+
+    python benchmarks/bench_validation.py [--depths 10,20,40,80] [--breadth 3] [--repeat 3]
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import logging
+import timeit
+from collections import OrderedDict
+
+from deployer.cli import register_plugins
+from deployer.plugins.plugin import Plugin
+from deployer.plugins.top_level import TopLevel
+
+
+def generate(depth, breadth):
+    """Generate a pipeline of `depth` nested stages; every stage also holding `breadth` echo tasks."""
+    tasks = [OrderedDict([('name', 'leaf'), ('echo', 'Hello.')])]
+    for level in range(depth):
+        echoes = [OrderedDict([('name', 'echo %d.%d' % (level, n)), ('echo', 'Hello {{ item }}.')]) for n in range(breadth)]
+        tasks = [OrderedDict([('name', 'stage %d' % level), ('stage', OrderedDict([('tasks', echoes + tasks)]))])]
+    return tasks
+
+
+def count(document):
+    """Count every node of the `document`."""
+    total = 0
+    for node in document:
+        total += 1
+        if 'stage' in node:
+            total += count(node['stage']['tasks'])
+    return total
+
+
+def validate_and_build(depth, breadth):
+    """Validate, then build the task tree of, a freshly generated document."""
+    document = generate(depth, breadth)
+    assert TopLevel.valid(document)  # nosec
+    Plugin._compile(document)
+
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--depths', default='10,20,40,80', help="Comma-separated nesting depths.")
+    parser.add_argument('--breadth', type=int, default=3, help="Number of echo tasks within each stage.")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of timed runs, per depth.")
+    options = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    register_plugins()
+
+    memoized = Plugin.__dict__['_valid_node']
+    unmemoized = staticmethod(lambda plugin, node: plugin.valid(node))
+
+    print("%6s %6s %14s %14s %10s" % ('depth', 'nodes', 'memoized (ms)', 'without (ms)', 'speed-up'))
+    for depth in [int(depth) for depth in options.depths.split(',')]:
+        timings = []
+        for validator in (memoized, unmemoized):
+            Plugin._valid_node = validator
+            try:
+                timings.append(min(timeit.repeat(lambda: validate_and_build(depth, options.breadth),
+                                                 number=1, repeat=options.repeat)))
+            finally:
+                Plugin._valid_node = memoized
+
+        print("%6d %6d %14.2f %14.2f %9.1fx" % (depth, count(generate(depth, options.breadth)),
+                                                timings[0] * 1000, timings[1] * 1000, timings[1] / timings[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -68,11 +68,12 @@ setup(
         'click',
         'colorama;platform_system=="Windows"',
         'colorlog',
-        'Jinja2',
+        'enum34;python_version<"3.4"',
+        'Jinja2>=2.11',
         'pluggy',
         'pyaml',
         'schema',
-        'six',
+        'six>=1.13',
         'Twisted[windows_platform];platform_system=="Windows"',
         'Twisted;platform_system!="Windows"',
         # eg: 'aspectlib==1.1.1', 'six>=1.7',
@@ -81,6 +82,7 @@ setup(
         # eg:
         #   'rst': ['docutils>=0.11'],
         #   ':python_version=="2.6"': ['argparse'],
+        'msgpack': ['msgpack>=1.0'],
     },
     entry_points={
         'console_scripts': [
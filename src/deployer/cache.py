@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A size-bounded, on-disk cache shared by concurrent ```PyDeployer``` processes.
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import errno
+import logging
+import os
+import tempfile
+
+LOGGER = logging.getLogger(__name__)
+
+#: The default upper bound, in bytes, of a cache directory.
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+#: The environment variable naming a directory for the persistent template bytecode cache.
+TEMPLATE_CACHE_ENVVAR = 'DEPLOYER_TEMPLATE_CACHE'
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+def write_atomically(path, data):
+    """Write the bytes `data` to the file at `path`; through a temporary file, renamed into place."""
+    directory = os.path.dirname(path) or os.curdir
+    try:
+        os.makedirs(directory)
+    except OSError as e:
+        if e.errno != errno.EEXIST:                              # noqa: no-cover
+            raise                                                # noqa: no-cover
+
+    fd, name = tempfile.mkstemp(suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        _replace(name, path)
+    except (IOError, OSError):                                   # noqa: no-cover
+        try:
+            os.unlink(name)
+        except OSError:
+            pass
+        raise
+
+
+class DirectoryCache(object):
+    """A directory of opaque entries, evicting the least-recently-used once `max_size` bytes are exceeded.
+
+    Entries are written to a temporary file and atomically renamed into place, so
+    readers never observe a partial entry, even with many processes sharing the directory.
+
+    The size of the directory is estimated in memory; so it is only listed when the estimate
+    exceeds `max_size`, or once every :py:attr:`PRUNE_INTERVAL` writes, to account for other
+    processes sharing it.
+    """
+
+    SUFFIX = '.cache'
+
+    #: The number of writes after which the directory is listed, whatever the estimated size.
+    PRUNE_INTERVAL = 256
+
+    #: The fraction of `max_size` to which an oversized cache is pruned; leaving room for later writes.
+    LOW_WATER = 0.9
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        """Ctor."""
+        self.directory = directory
+        self.max_size = max_size
+        self._size = None
+        self._writes = 0
+
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:                          # noqa: no-cover
+                raise                                            # noqa: no-cover
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key):
+        """Return the bytes stored under `key`; otherwise `None`."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except (IOError, OSError):
+            return None
+
+        # mark as recently used.
+        try:
+            os.utime(path, None)
+        except OSError:                                          # noqa: no-cover
+            pass                                                 # noqa: no-cover
+
+        return data
+
+    def set(self, key, data, prune=True):
+        """Store `data` under `key`, then evict old entries if the size bound is exceeded; unless `prune` is false."""
+        try:
+            write_atomically(self._path(key), data)
+        except (IOError, OSError) as e:                          # noqa: no-cover
+            LOGGER.debug("Unable to write cache entry %s: %s", key, e)
+            return
+
+        if self._size is not None:
+            # an over-estimate, when an entry is replaced.
+            self._size += len(data)
+        self._writes += 1
+
+        if prune and (self._size is None or self._size > self.max_size or self._writes >= self.PRUNE_INTERVAL):
+            self.prune()
+
+    def entries(self):
+        """Return a list of `(mtime, size, path)` for every entry, least-recently-used first."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:                                          # noqa: no-cover
+            return entries
+
+        for name in names:
+            if not name.endswith(self.SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                # removed by a concurrent process.
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        entries.sort()
+        return entries
+
+    def prune(self):
+        """Evict the least-recently-used entries, once the cache exceeds `max_size`, until it fits within :py:attr:`LOW_WATER` of it."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        limit = self.max_size * self.LOW_WATER if total > self.max_size else self.max_size
+
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                # removed by a concurrent process.
+                pass
+            total -= size
+
+        self._size = total
+        self._writes = 0
+
+    def clear(self):
+        """Remove all entries."""
+        self._size = 0
+        for _, _, path in self.entries():
+            try:
+                os.unlink(path)
+            except OSError:                                      # noqa: no-cover
+                pass                                             # noqa: no-cover
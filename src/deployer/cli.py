@@ -29,24 +29,26 @@ Why does this file exist, and why not put this in __main__?
 
   Also see (1) from http://click.pocoo.org/5/setuptools/#setuptools-integration
 """
+import json
 import logging
 import os
 import platform
 import sys
+from collections import OrderedDict
+from io import BytesIO
 
 import click
 import pluggy
 import six
 
 from deployer import __version__
+from deployer import pipeline_cache
 from deployer import plugins as builtin_plugins
-from deployer.context import Context
-from deployer.loader import ordered_load
+from deployer.cache import TEMPLATE_CACHE_ENVVAR
+from deployer.entry_points import register_entry_points
 from deployer.plugins import hookspec as hookspecs
-from deployer.plugins.top_level import TopLevel
+from deployer.programs import resolve_program
 from deployer.registry import Registry
-from deployer.util import start_reactor
-from deployer.util import stop_reactor
 
 try:
     import colorama                                            # noqa: no-cover
@@ -86,7 +88,7 @@ def _get_plugin_manager(plugins=()):  # noqa: no-cover
     pm.add_hookspecs(hookspecs)
     pm.register(sys.modules[__name__])
     pm.register(builtin_plugins)
-    pm.load_setuptools_entrypoints('py-deployer')
+    Registry.distributions = register_entry_points(pm)
     for plugin in plugins:
         if isinstance(plugin, six.string_types):
             __import__(plugin)
@@ -105,17 +107,187 @@ def _get_plugin_manager(plugins=()):  # noqa: no-cover
 LOGGER = logging.getLogger(__name__)
 THE_REACTOR = None
 
+#: The names of the pipeline document formats; as :py:data:`deployer.loader.FORMATS`, without importing the parsers.
+FORMATS = ('yaml', 'json', 'msgpack')
+
+
+def report_render_stats(echo=True, path=None, limit=20):
+    """Print the templates taking the most render time; and/or write all statistics, as JSON, to `path`."""
+    from deployer import rendering
+
+    report = rendering.RENDER_PROFILE.report()
+
+    if path is not None:
+        with open(path, 'w') as f:
+            json.dump({
+                'templates': report,
+                'counters': rendering.statistics(),
+                'template_cache': rendering.cache_info(),
+                'render_memo': rendering.RENDER_MEMO.info(),
+                'expansion_memo': rendering.EXPANSION_MEMO.info(),
+                'expression_cache': rendering.get_environment().expression_cache.info(),
+                'safe_eval_cache': rendering.safe_eval_cache_info(),
+            }, f, indent=2)
+
+    if not echo:
+        return
+
+    click.echo("%8s %12s %12s %10s  %s" % ('calls', 'total (s)', 'max (s)', 'size', 'template'), err=True)
+    for entry in report[:limit]:
+        template = entry['template'] if isinstance(entry['template'], six.string_types) else repr(entry['template'])
+        template = template.replace('\n', '\\n')
+        if len(template) > 60:
+            template = template[:57] + '...'
+        click.echo("%8d %12.6f %12.6f %10d  %s" % (entry['calls'], entry['total'], entry['max'], entry['size'], template),
+                   err=True)
+
+
+def _log_problems(problems):
+    problems = list(problems)
+    for problem in problems:
+        if problem.fatal:
+            LOGGER.error("Preflight: %s", problem)
+        else:
+            LOGGER.warning("Preflight: %s", problem)
 
-def initialize(level=logging.DEBUG):
-    """Perform basic initialization of program."""
-    global THE_REACTOR
+    return not any(problem.fatal for problem in problems)
 
-    setup_logging(level)
+
+def preflight(document):
+    """Statically analyse a valid `document`; logging all problems and returning `False` if any are fatal."""
+    from deployer.preflight import Preflight
+
+    return _log_problems(Preflight().check(document))
+
+
+def preflight_each(nodes):
+    """Statically analyse each of the valid `nodes` as it arrives; raising :py:class:`FailedValidation` upon fatal problems."""
+    from deployer.plugins.plugin import FailedValidation
+    from deployer.preflight import Preflight
+
+    checker = Preflight()
+    for node in nodes:
+        reported = len(checker.problems)
+        checker.tasks([node])
+        if not _log_problems(checker.problems[reported:]):
+            raise FailedValidation(node)
+        yield node
+
+
+def _initialize_worker(pipeline_cache_directory, substring_matching=False):
+    pipeline_cache.configure(pipeline_cache_directory)
+    Registry.substring_matching = substring_matching
+    if not Registry().plugins():                               # noqa: no-cover
+        register_plugins()                                     # noqa: no-cover
+
+
+def recording_errors(errors):
+    """Return a validator of pipeline documents, which appends the reasons an invalid document fails to `errors`."""
+    from deployer.plugins.top_level import TopLevel
+
+    def _valid(document):
+        if TopLevel.valid(document):
+            return True
+
+        errors.extend(TopLevel.errors(document))
+        return False
+
+    return _valid
+
+
+def validate_one(task):
+    """Validate the contents of one pipeline file, given as a `(name, data, format, preflight_checks)` tuple.
+
+    Returns a JSON-serializable result; this may run within a worker process.
+    """
+    from deployer.validation import format_path
+
+    name, data, format, preflight_checks = task
+    result = OrderedDict([('path', name), ('valid', False), ('error', None), ('errors', []), ('problems', []),
+                          ('programs', {})])
+
+    errors = []
+    try:
+        document = pipeline_cache.load(BytesIO(data), recording_errors(errors), format)
+    except Exception as e:  # noqa: E722
+        result['error'] = "Unable to load the document: %s" % e
+        return result
+
+    if document is None:
+        result['error'] = "The document failed validation."
+        result['errors'] = [OrderedDict([('where', format_path(error.path)), ('message', error.message)]) for error in errors]
+        return result
+
+    problems = []
+    if preflight_checks:
+        from deployer.preflight import Preflight
+
+        checker = Preflight()
+        problems = checker.check(document)
+        result['programs'] = checker.programs
+    result['problems'] = [OrderedDict([('where', problem.where), ('message', problem.message), ('fatal', problem.fatal)])
+                          for problem in problems]
+    result['valid'] = not any(problem.fatal for problem in problems)
+    return result
+
+
+def programs_unchanged(result):
+    """Return whether every program checked by a :py:func:`validate_one` `result` still resolves to the same path."""
+    return all(resolve_program(program) == resolved for program, resolved in result.get('programs', {}).items())
+
+
+def validate_all(tasks, jobs=1):
+    """Validate many pipeline files, as :py:func:`validate_one` tasks; fanning out over `jobs` processes."""
+    if jobs == 1 or len(tasks) < 2:
+        return [validate_one(task) for task in tasks]
+
+    import multiprocessing
+    pool = multiprocessing.Pool(min(jobs, len(tasks)), initializer=_initialize_worker,
+                                initargs=(pipeline_cache.get_directory(), Registry.substring_matching))
+    try:
+        return pool.map(validate_one, tasks, chunksize=max(1, len(tasks) // (jobs * 4)))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def stream_document(pipeline, preflight_checks=True):
+    """Return an iterable of the validated top-level nodes of `pipeline`, parsed by a background thread as they are consumed."""
+    from deployer import loader
+    from deployer.plugins.top_level import TopLevel
+    from deployer.util import iterate_in_background
+
+    nodes = TopLevel.validated(iterate_in_background(loader.iter_load(pipeline, loader.detect_format(pipeline.name))))
+    return preflight_each(nodes) if preflight_checks else nodes
+
+
+def register_plugins():
+    """Register all built-in and installed plug-ins."""
     Registry.plugin_manager = _get_plugin_manager()
     Registry.plugin_manager.hook.deployer_register(registry=Registry())
 
-    # start the twisted reactor
+
+def initialize(level=logging.DEBUG, reactor=True):
+    """Perform basic initialization of program.
+
+    The Twisted reactor, needed only to execute tasks, is started when `reactor` is set; otherwise
+    it is left to :py:func:`ensure_reactor`.
+    """
+    setup_logging(level)
+    register_plugins()
+
+    if reactor:
+        ensure_reactor()
+
+
+def ensure_reactor():
+    """Start the Twisted reactor, unless it is already running."""
+    global THE_REACTOR
+
     if THE_REACTOR is None:
+        from deployer.util import start_reactor
+        from deployer.util import stop_reactor
+
         THE_REACTOR = start_reactor()
 
         import atexit
@@ -128,15 +300,29 @@ def initialize(level=logging.DEBUG):
               help="Enable debugging and verbose output.")
 @click.option('--silent', '-d', is_flag=True, default=False,
               help="Show minimal output; namely errors and fatal messages.")
-def main(ctx, debug, silent):
+@click.option('--template-cache', default=None, type=click.Path(file_okay=False), envvar=TEMPLATE_CACHE_ENVVAR,
+              help="Persist compiled templates within this directory, for re-use across runs.")
+@click.option('--pipeline-cache', 'pipeline_cache_directory', default=None, type=click.Path(file_okay=False),
+              envvar=pipeline_cache.PIPELINE_CACHE_ENVVAR,
+              help="Persist validated pipelines within this directory, skipping parsing and validation of unchanged files.")
+@click.option('--substring-plugin-matching', is_flag=True, default=False, envvar='DEPLOYER_SUBSTRING_PLUGIN_MATCHING',
+              help="Also dispatch a task to the plug-in whose name is part of one of its keys; as older releases did.")
+def main(ctx, debug, silent, template_cache, pipeline_cache_directory, substring_plugin_matching):
     """Entry point."""
+    Registry.substring_matching = substring_plugin_matching
+    if template_cache or 'deployer.rendering' in sys.modules:
+        # otherwise, the template engine is configured from the environment upon first use.
+        from deployer import rendering
+        rendering.configure(template_cache=template_cache)
+    pipeline_cache.configure(pipeline_cache_directory)
+
     # determine logging level
     level = logging.INFO
     if debug:
         level = logging.DEBUG
     if silent:
         level = logging.ERROR
-    initialize(level)
+    initialize(level, reactor=False)
 
     # print banner information
     LOGGER.info("Starting PyDeployer version %s" % __version__)
@@ -157,53 +343,177 @@ def main(ctx, debug, silent):
 @click.option('--matrix-tags', '-m', default='', type=click.STRING, envvar='DEPLOYER_MATRIX_TAGS',
               help="Only run the tasks within a matrix; if the fnmatch-style pattern succeeds "
                    "(Should be a comma-separated, fnmatch-style pattern.)")
+@click.option('--preflight/--no-preflight', 'preflight_checks', default=True,
+              help="Statically check templates and programs before running any task.")
+@click.option('--stream', is_flag=True, default=False,
+              help="Start running tasks while the rest of the pipeline is still being parsed and validated.")
+@click.option('--render-stats', is_flag=True, default=False,
+              help="Print the templates taking the most render time, once the pipeline ends.")
+@click.option('--render-stats-json', default=None, type=click.Path(dir_okay=False, writable=True),
+              help="Write per-template render statistics, as JSON, to this file once the pipeline ends.")
 @click.argument('pipeline', nargs=1, type=click.File('rb'), required=True, metavar='<path/to/pipeline.yaml>')
 @click.argument('args', nargs=-1, type=click.UNPROCESSED, metavar='[pipeline arguments]')
-def execute(tag, matrix_tags, pipeline, args):
+def execute(tag, matrix_tags, preflight_checks, stream, render_stats, render_stats_json, pipeline, args):
     """Execute a pipeline definition."""
+    import yaml
+
+    from deployer import loader
+    from deployer import rendering
+    from deployer.context import Context
+    from deployer.plugins.plugin import FailedValidation
+    from deployer.plugins.top_level import TopLevel
+
+    ensure_reactor()
     LOGGER.info("Processing pipeline definition '%s'", pipeline.name)
 
-    try:
-        document = ordered_load(pipeline)
-    except Exception as e:  # noqa: E722
-        LOGGER.exception("Failed validation", e)
-        document = None
+    if stream:
+        document = stream_document(pipeline, preflight_checks)
+    else:
+        errors = []
+        try:
+            document = pipeline_cache.load(pipeline, recording_errors(errors), loader.detect_format(pipeline.name))
+        except Exception as e:  # noqa: E722
+            LOGGER.exception("Failed validation", e)
+            document = None
+        for error in errors:
+            LOGGER.error("Failed validation: %s", error)
 
-    if TopLevel.valid(document):
+    if document is not None and (stream or not preflight_checks or preflight(document)):
         nodes = TopLevel.build(document)
 
         context = Context()
         context.args = args
         context.tags = tag
+        if os.path.isfile(pipeline.name):
+            context.directory = os.path.dirname(os.path.abspath(pipeline.name))
         if isinstance(matrix_tags, six.string_types):
             context.matrix_tags = [i.strip() for i in matrix_tags.split(',') if i != '']
         else:  # noqa: no-cover
             LOGGER.critical("Matrix tags must be a string.")
             sys.exit(3)
 
-        for node in nodes:
-            result = node.execute(context)
-
-            if not result:
-                sys.exit(1)
+        rendering.RENDER_PROFILE.enabled = render_stats or render_stats_json is not None
+        try:
+            for node in nodes:
+                result = node.execute(context)
+
+                LOGGER.debug("Safe-eval cache statistics: %r", rendering.safe_eval_cache_info())
+
+                if not result:
+                    sys.exit(1)
+        except (FailedValidation, ValueError, yaml.YAMLError) as e:
+            LOGGER.error("Failed validation: %s", e)
+            sys.exit(2)
+        finally:
+            if render_stats or render_stats_json is not None:
+                report_render_stats(echo=render_stats, path=render_stats_json)
     else:
         sys.exit(2)
 
 
 @main.command()
+@click.option('--preflight/--no-preflight', 'preflight_checks', default=True,
+              help="Statically check templates and programs, too.")
+@click.option('--jobs', '-j', default=1, type=click.IntRange(min=0),
+              help="Validate this many files at once, in separate processes (0 means one per CPU.)")
+@click.option('--summary-json', default=None, type=click.Path(dir_okay=False, writable=True),
+              help="Write the results of every file, as JSON, to this file.")
 @click.argument('pipeline', nargs=-1, type=click.File('rb'), required=True, metavar='<path/to/pipeline.yaml>')
-def validate(pipeline):
-    """Validate a pipeline definition for syntactic correctness."""
-    for f in pipeline:
-        LOGGER.info("Processing pipeline definition '%s'", f.name)
+def validate(preflight_checks, jobs, summary_json, pipeline):
+    """Validate a pipeline definition for syntactic correctness.
 
-        try:
-            document = ordered_load(f)
-        except:  # noqa: E722
-            document = None
+    Every file is validated, and all results are reported at the end. When the pipeline
+    cache is configured, the results of unchanged files are re-used.
+    """
+    from deployer import loader
 
-        if TopLevel.valid(document):
+    results_cache = pipeline_cache.get_result_cache()
+    options = {'preflight': preflight_checks, 'path': os.environ.get('PATH') if preflight_checks else None}
+
+    results = [None] * len(pipeline)
+    pending = []
+    keys = {}
+    for index, f in enumerate(pipeline):
+        LOGGER.info("Processing pipeline definition '%s'", f.name)
+        data = f.read()
+        format = loader.detect_format(f.name)
+
+        if results_cache is not None:
+            keys[index] = results_cache.key(data, format, options)
+            results[index] = results_cache.get(keys[index])
+            if results[index] is not None and not programs_unchanged(results[index]):
+                results[index] = None
+            if results[index] is not None:
+                # the result may be of a copy of this file, under another name.
+                results[index]['path'] = f.name
+                results[index]['cached'] = True
+                continue
+
+        pending.append((index, (f.name, data, format, preflight_checks)))
+
+    if not jobs:
+        import multiprocessing
+        jobs = multiprocessing.cpu_count()
+
+    for (index, _), result in zip(pending, validate_all([task for _, task in pending], jobs)):
+        result['cached'] = False
+        results[index] = result
+        if results_cache is not None:
+            results_cache.set(keys[index], result, prune=False)
+    if results_cache is not None and pending:
+        results_cache.prune()
+
+    for result in results:
+        if result['error']:
+            LOGGER.error("%s: %s", result['path'], result['error'])
+        for error in result.get('errors', ()):
+            LOGGER.error("%s: %s: %s", result['path'], error['where'] or '<document>', error['message'])
+        if result['problems']:
+            from deployer.preflight import Problem
+
+            _log_problems(Problem(**problem) for problem in result['problems'])
+
+        if result['valid']:
             click.secho('Document is OK.', fg='green')
         else:
             click.secho('Document is BAD.', fg='red')
-            sys.exit(1)
+
+    valid = sum(1 for result in results if result['valid'])
+    if len(results) > 1:
+        click.echo("%d of %d documents are OK (%d cached.)" % (valid, len(results), sum(1 for result in results if result['cached'])))
+
+    if summary_json is not None:
+        with open(summary_json, 'w') as f:
+            json.dump(OrderedDict([('valid', valid), ('invalid', len(results) - valid), ('files', results)]), f, indent=2)
+
+    if valid != len(results):
+        sys.exit(1)
+
+
+@main.command()
+@click.option('--from', 'source_format', default=None, type=click.Choice(FORMATS),
+              help="The format of the input; by default, detected from its file extension.")
+@click.option('--to', 'target_format', default=None, type=click.Choice(FORMATS),
+              help="The format of the output; by default, detected from its file extension.")
+@click.argument('source', nargs=1, type=click.File('rb'), required=True, metavar='<path/to/pipeline>')
+@click.argument('target', nargs=1, type=click.File('wb'), required=True, metavar='<path/to/output>')
+def convert(source_format, target_format, source, target):
+    """Convert a pipeline definition between the YAML, JSON and msgpack formats."""
+    from deployer import loader
+    from deployer.plugins.top_level import TopLevel
+
+    source_format = source_format or loader.detect_format(source.name)
+    target_format = target_format or loader.detect_format(target.name)
+    LOGGER.info("Converting pipeline definition '%s' from %s to %s", source.name, source_format, target_format)
+
+    try:
+        document = loader.load(source, source_format)
+        data = loader.dumps(document, target_format)
+    except Exception as e:  # noqa: E722
+        LOGGER.error("Failed conversion: %s", e)
+        sys.exit(1)
+
+    if not TopLevel.valid(document):
+        LOGGER.warning("The pipeline definition '%s' is not valid.", source.name)
+
+    target.write(data)
@@ -22,13 +22,74 @@ Data services and state management.
 :license: Apache License 2.0, see LICENSE.txt for full details.
 """
 
+import itertools
 import os
 import platform
 import sys
 from collections import deque
 
+_GENERATIONS = itertools.count(1)
 
-class Stack:  # noqa: no-cover
+
+class Scope(dict):
+    """A mapping of templating variables, carrying a `generation` which changes upon every mutation.
+
+    Every scope is assigned a generation unique to the process, so a generation identifies
+    one state of one scope; allowing values derived from a scope to be cached safely.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Ctor."""
+        super(Scope, self).__init__(*args, **kwargs)
+        self.generation = next(_GENERATIONS)
+
+    def _changed(self):
+        self.generation = next(_GENERATIONS)
+
+    def __setitem__(self, key, value):
+        """Set an item."""
+        super(Scope, self).__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        """Delete an item."""
+        super(Scope, self).__delitem__(key)
+        self._changed()
+
+    def clear(self):
+        """Remove all items."""
+        super(Scope, self).clear()
+        self._changed()
+
+    def pop(self, *args):
+        """Remove an item, returning its value."""
+        value = super(Scope, self).pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        """Remove an arbitrary item, returning it."""
+        item = super(Scope, self).popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        """Get an item; setting it to `default` when absent."""
+        value = super(Scope, self).setdefault(key, default)
+        self._changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        """Update from a mapping or an iterable of pairs."""
+        super(Scope, self).update(*args, **kwargs)
+        self._changed()
+
+    def copy(self):
+        """Return a shallow copy; as a new scope."""
+        return Scope(self)
+
+
+class Stack:
     """Stack data structure."""
 
     def __init__(self):  # noqa: no-cover
@@ -41,7 +102,7 @@ class Stack:  # noqa: no-cover
 
     def push(self, p):  # noqa: no-cover
         """Add element to stack."""
-        self.__storage.append(p)
+        self.__storage.append(p if isinstance(p, Scope) else Scope(p))
 
     def pop(self):  # noqa: no-cover
         """Remove element from stack."""
@@ -57,7 +118,7 @@ class Stack:  # noqa: no-cover
 
     def push_last(self):  # noqa: no-cover
         """Re-push the last item on to the stack."""
-        self.__storage.append(self.last().copy())
+        self.__storage.append(Scope(self.last()))
 
 
 class Context(object):
@@ -71,12 +132,19 @@ class Context(object):
 
     matrix_tags = None  # User selected `matrix` tags to filter.
 
+    directory = None  # The directory relative includes are resolved against.
+
+    #: The names of all templating variables a new context defines.
+    BUILTIN_VARIABLES = ('args', 'nbcpus', 'node', 'platform', 'is_linux', 'is_bsd', 'is_darwin',
+                         'is_windows', 'is_travis', 'is_appveyor', 'is_ci')
+
     def __init__(self):
         """Ctor."""
         # create our basic variables
         self.__class__.args = []
         self.__class__.tags = []
         self.__class__.matrix_tags = []
+        self.__class__.directory = os.getcwd()
 
         # create our variable stack
         self.__class__.variables = Stack()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A cached index of the entry points of installed plug-in distributions.
+
+Scanning every installed distribution for entry points is slow; so the result is kept in a
+small JSON file, and re-used for as long as no directory on ``sys.path`` is modified, as
+installing or removing a distribution does.
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+
+from deployer.cache import write_atomically
+
+LOGGER = logging.getLogger(__name__)
+
+#: The entry point group of ```PyDeployer``` plug-ins.
+ENTRY_POINT_GROUP = 'py-deployer'
+
+#: The environment variable naming the entry point index file; an empty value disables it.
+ENTRY_POINT_CACHE_ENVVAR = 'DEPLOYER_ENTRY_POINT_CACHE'
+
+
+def default_path():
+    """Return the path of the entry point index; or `None` when it is disabled."""
+    path = os.environ.get(ENTRY_POINT_CACHE_ENVVAR)
+    if path is not None:
+        return path or None
+
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'deployer', 'entry-points.json')
+
+
+def stamp(group=ENTRY_POINT_GROUP):
+    """Return a digest of the interpreter, and of every directory on ``sys.path`` with its modification time."""
+    digest = hashlib.sha1(('%s\0%s\0%s\0' % (group, sys.executable, sys.version)).encode('utf-8'))  # nosec
+    for entry in sys.path:
+        try:
+            mtime = os.stat(entry or os.curdir).st_mtime
+        except OSError:
+            mtime = None
+        digest.update(('%s\0%r\0' % (entry, mtime)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def scan(group=ENTRY_POINT_GROUP):
+    """Return the ``(name, value, project, version)`` of every installed entry point in `group`."""
+    try:
+        from importlib import metadata
+    except ImportError:                                        # noqa: no-cover
+        import pkg_resources                                   # noqa: no-cover
+        return [(ep.name, '%s:%s' % (ep.module_name, '.'.join(ep.attrs)) if ep.attrs else ep.module_name,
+                 ep.dist.project_name, ep.dist.version)
+                for ep in pkg_resources.iter_entry_points(group)]  # noqa: no-cover
+
+    entries = []
+    seen = set()
+    for dist in metadata.distributions():
+        project = dist.metadata['name']
+        if project in seen:
+            # e.g. the same distribution found through two entries of ``sys.path``.
+            continue
+        seen.add(project)
+        for ep in dist.entry_points:
+            if ep.group == group:
+                entries.append((ep.name, ep.value, project, dist.version))
+    return entries
+
+
+def load_index(group=ENTRY_POINT_GROUP, path=None):
+    """Return the entry points of `group`, as :py:func:`scan` does; re-using the index at `path` while it is current."""
+    path = path if path is not None else default_path()
+    key = stamp(group)
+
+    if path is not None:
+        try:
+            with open(path, 'r') as f:
+                index = json.load(f)
+            if index.get('stamp') == key:
+                return [tuple(entry) for entry in index['entries']]
+        except (IOError, OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    entries = scan(group)
+    if path is not None:
+        try:
+            write_atomically(path, json.dumps({'stamp': key, 'entries': entries}).encode('utf-8'))
+        except (IOError, OSError) as e:                        # noqa: no-cover
+            LOGGER.debug("Unable to write the entry point index '%s': %s", path, e)  # noqa: no-cover
+    return entries
+
+
+def resolve(value):
+    """Import the object named by an entry point `value`, given as ``'package.module:attribute'``."""
+    module, _, attribute = value.partition(':')
+    obj = importlib.import_module(module.strip())
+    for part in attribute.strip().split('.') if attribute.strip() else ():
+        obj = getattr(obj, part)
+    return obj
+
+
+def register_entry_points(plugin_manager, group=ENTRY_POINT_GROUP, path=None):
+    """Register every plug-in of `group` with the `plugin_manager`; returning the ``(project, version)`` of each.
+
+    Behaves as :py:meth:`pluggy.PluginManager.load_setuptools_entrypoints`; but through the index.
+    """
+    distributions = []
+    for name, value, project, version in load_index(group, path):
+        if plugin_manager.get_plugin(name) or plugin_manager.is_blocked(name):
+            continue
+        plugin_manager.register(resolve(value), name=name)
+        distributions.append((project, version))
+    return distributions
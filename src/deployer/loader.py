@@ -1,12 +1,50 @@
 """Pipeline Loader."""
+import json
+import os
 from collections import OrderedDict
 
 import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
 
+try:
+    from yaml import CSafeLoader as FastSafeLoader             # noqa: no-cover
+    from yaml.cyaml import CParser                             # noqa: no-cover
 
-# @staticmethod
-def ordered_load(stream, loader=yaml.SafeLoader, object_pairs_hook=OrderedDict):
-    """Load YAML, preserving the ordering of all data."""
+    class FastStreamingLoader(CParser, Composer, SafeConstructor, Resolver):  # noqa: no-cover
+        """A safe loader, backed by libyaml, which composes nodes one at a time; see :py:func:`iter_ordered_load`."""
+
+        def __init__(self, stream):
+            """Ctor."""
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+except ImportError:                                            # noqa: no-cover
+    FastSafeLoader = yaml.SafeLoader                           # noqa: no-cover
+    FastStreamingLoader = yaml.SafeLoader                      # noqa: no-cover
+
+try:
+    from yaml import CSafeDumper as FastSafeDumper             # noqa: no-cover
+except ImportError:                                            # noqa: no-cover
+    FastSafeDumper = yaml.SafeDumper                           # noqa: no-cover
+
+try:
+    import msgpack                                             # noqa: no-cover
+except ImportError:                                            # noqa: no-cover
+    msgpack = None                                             # noqa: no-cover
+
+#: The pipeline document formats, with their file extensions.
+FORMATS = OrderedDict([
+    ('yaml', ('.yaml', '.yml')),
+    ('json', ('.json',)),
+    ('msgpack', ('.msgpack', '.mpk')),
+])
+
+
+def make_ordered_loader(loader, object_pairs_hook=OrderedDict):
+    """Derive a loader class from `loader`, constructing every mapping with `object_pairs_hook`."""
     class OrderedLoader(loader):
         pass
 
@@ -18,4 +56,133 @@ def ordered_load(stream, loader=yaml.SafeLoader, object_pairs_hook=OrderedDict):
         yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
         construct_mapping)
 
-    return yaml.load(stream, OrderedLoader)  # nosec
+    return OrderedLoader
+
+
+#: The ordered loader used by default; backed by libyaml, when it is available.
+OrderedLoader = make_ordered_loader(FastSafeLoader)
+
+#: The ordered loader implemented in pure Python.
+PureOrderedLoader = make_ordered_loader(yaml.SafeLoader)
+
+#: The ordered loader used when streaming the items of a document.
+StreamingOrderedLoader = make_ordered_loader(FastStreamingLoader)
+
+_LOADERS = {
+    (FastSafeLoader, OrderedDict): OrderedLoader,
+    (yaml.SafeLoader, OrderedDict): PureOrderedLoader,
+    (FastStreamingLoader, OrderedDict): StreamingOrderedLoader,
+}
+
+
+def _ordered_loader(loader, object_pairs_hook):
+    key = (loader, object_pairs_hook)
+    if key not in _LOADERS:
+        _LOADERS[key] = make_ordered_loader(loader, object_pairs_hook)
+    return _LOADERS[key]
+
+
+# @staticmethod
+def ordered_load(stream, loader=FastSafeLoader, object_pairs_hook=OrderedDict):
+    """Load YAML, preserving the ordering of all data."""
+    return yaml.load(stream, _ordered_loader(loader, object_pairs_hook))  # nosec
+
+
+def iter_ordered_load(stream, loader=FastStreamingLoader, object_pairs_hook=OrderedDict):
+    """Load a YAML sequence, preserving the ordering of all data; yielding each item as soon as it is parsed.
+
+    The `loader` must compose nodes with :py:class:`yaml.composer.Composer`. A document which is
+    not a sequence, including an empty document, raises :py:class:`yaml.YAMLError`.
+    """
+    instance = _ordered_loader(loader, object_pairs_hook)(stream)
+    try:
+        instance.get_event()                                   # StreamStartEvent
+        instance.get_event()                                   # DocumentStartEvent
+        if not instance.check_event(yaml.SequenceStartEvent):
+            raise yaml.YAMLError("The pipeline document must be a list of tasks.")
+        instance.get_event()
+
+        while not instance.check_event(yaml.SequenceEndEvent):
+            yield instance.construct_document(instance.compose_node(None, None))
+        instance.get_event()
+
+        instance.get_event()                                   # DocumentEndEvent
+        if not instance.check_event(yaml.StreamEndEvent):
+            raise yaml.YAMLError("The pipeline must consist of a single document.")
+    finally:
+        instance.dispose()
+
+
+def detect_format(name, default='yaml'):
+    """Return the document format of the file `name`, by its extension; otherwise `default`."""
+    extension = os.path.splitext(name or '')[1].lower()
+    for format, extensions in FORMATS.items():
+        if extension in extensions:
+            return format
+    return default
+
+
+def _read(stream):
+    data = stream.read() if hasattr(stream, 'read') else stream
+    return data.encode('utf-8') if not isinstance(data, bytes) else data
+
+
+def _require_msgpack():
+    if msgpack is None:                                        # noqa: no-cover
+        raise ValueError("The msgpack format requires the 'msgpack' package be installed.")
+
+
+def load(stream, format='yaml'):
+    """Load a document in `format`; with every mapping an `OrderedDict`, just as :py:func:`ordered_load` produces."""
+    if format == 'yaml':
+        return ordered_load(stream)
+    if format == 'json':
+        return json.loads(_read(stream).decode('utf-8'), object_pairs_hook=OrderedDict)
+    if format == 'msgpack':
+        _require_msgpack()
+        return msgpack.unpackb(_read(stream), raw=False, object_pairs_hook=OrderedDict, strict_map_key=False)
+    raise ValueError("Unknown document format '%s'." % format)
+
+
+def iter_load(stream, format='yaml'):
+    """Load a sequence document in `format`, yielding each item as soon as it is decoded; see :py:func:`iter_ordered_load`."""
+    if format == 'yaml':
+        for item in iter_ordered_load(stream):
+            yield item
+    elif format == 'msgpack':
+        _require_msgpack()
+        unpacker = msgpack.Unpacker(stream if hasattr(stream, 'read') else None, raw=False,
+                                    object_pairs_hook=OrderedDict, strict_map_key=False)
+        if not hasattr(stream, 'read'):
+            unpacker.feed(_read(stream))
+        try:
+            length = unpacker.read_array_header()
+        except msgpack.UnpackValueError:
+            raise ValueError("The pipeline document must be a list of tasks.")
+        for _ in range(length):
+            yield unpacker.unpack()
+    else:
+        document = load(stream, format)
+        if type(document) is not list:
+            raise ValueError("The pipeline document must be a list of tasks.")
+        for item in document:
+            yield item
+
+
+class OrderedDumper(FastSafeDumper):
+    """A safe YAML dumper which writes an `OrderedDict` as a plain mapping, in order."""
+
+
+OrderedDumper.add_representer(OrderedDict, lambda dumper, data: dumper.represent_dict(data.items()))
+
+
+def dumps(document, format='yaml'):
+    """Serialize a `document` in `format`, as bytes."""
+    if format == 'yaml':
+        return yaml.dump(document, Dumper=OrderedDumper, default_flow_style=False, allow_unicode=True, encoding='utf-8')
+    if format == 'json':
+        return json.dumps(document, indent=2).encode('utf-8')
+    if format == 'msgpack':
+        _require_msgpack()
+        return msgpack.packb(document, use_bin_type=True)
+    raise ValueError("Unknown document format '%s'." % format)
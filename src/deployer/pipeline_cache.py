@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A persistent cache of parsed and validated pipeline documents.
+
+Documents are keyed by a hash of the file contents, together with the versions
+of ```PyDeployer``` and of every registered plug-in; so a repeated run of an
+unchanged pipeline skips parsing and validation entirely.
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+
+from deployer import __version__
+from deployer.cache import DEFAULT_MAX_SIZE
+from deployer.cache import DirectoryCache
+from deployer.registry import Registry
+
+LOGGER = logging.getLogger(__name__)
+
+#: The environment variable naming the default pipeline cache directory.
+PIPELINE_CACHE_ENVVAR = 'DEPLOYER_PIPELINE_CACHE'
+
+
+def fingerprint():
+    """Return a string identifying the versions of ```PyDeployer``` and every registered plug-in."""
+    parts = ['deployer==%s' % __version__]
+
+    for project, version in Registry.distributions:
+        parts.append('%s==%s' % (project, version))
+
+    # without importing the plug-ins registered lazily.
+    for name, path in sorted(Registry().plugin_paths().items()):
+        parts.append('%s=%s' % (name, path))
+
+    if Registry.substring_matching:
+        parts.append('substring-matching')
+
+    return '\n'.join(parts)
+
+
+class PipelineCache(object):
+    """A size-bounded directory of validated pipeline documents; see :py:class:`deployer.cache.DirectoryCache`.
+
+    Documents are stored as JSON, and only when they survive the round-trip unchanged.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        """Ctor."""
+        self._cache = DirectoryCache(directory, max_size=max_size)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, data, format='yaml'):
+        """Return the key of the pipeline file contents `data` in `format`, for the running versions."""
+        digest = hashlib.sha1(fingerprint().encode('utf-8'))  # nosec
+        digest.update(b'\0' + format.encode('utf-8') + b'\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, data, format='yaml'):
+        """Return the validated document of the pipeline file contents `data`; otherwise `None`."""
+        entry = self._cache.get(self.key(data, format))
+        if entry is not None:
+            try:
+                document = json.loads(entry.decode('utf-8'), object_pairs_hook=OrderedDict)
+            except ValueError:                                   # noqa: no-cover
+                document = None                                  # noqa: no-cover
+            if document is not None:
+                self.hits += 1
+                return document
+
+        self.misses += 1
+        return None
+
+    def set(self, data, document, format='yaml'):
+        """Store the validated `document` of the pipeline file contents `data`."""
+        try:
+            entry = json.dumps(document)
+        except (TypeError, ValueError):
+            return
+
+        # e.g. integer mapping keys, or timestamps, do not survive the trip.
+        if json.loads(entry, object_pairs_hook=OrderedDict) != document:
+            return
+
+        self._cache.set(self.key(data, format), entry.encode('utf-8'))
+
+    def clear(self):
+        """Remove all entries."""
+        self._cache.clear()
+
+
+class ResultCache(object):
+    """A size-bounded directory of validation results; keyed by file contents, format and validation options."""
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        """Ctor."""
+        self._cache = DirectoryCache(directory, max_size=max_size)
+
+    def key(self, data, format='yaml', options=None):
+        """Return the key of validating the pipeline file contents `data` in `format`, with `options`."""
+        digest = hashlib.sha1(fingerprint().encode('utf-8'))  # nosec
+        digest.update(b'\0' + format.encode('utf-8') + b'\0')
+        digest.update(json.dumps(options, sort_keys=True).encode('utf-8') + b'\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the result stored under `key`; otherwise `None`."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        try:
+            return json.loads(entry.decode('utf-8'))
+        except ValueError:                                       # noqa: no-cover
+            return None                                          # noqa: no-cover
+
+    def set(self, key, result, prune=True):
+        """Store the `result` under `key`."""
+        self._cache.set(key, json.dumps(result).encode('utf-8'), prune=prune)
+
+    def prune(self):
+        """Evict the least-recently-used results, until the cache fits within its size bound."""
+        self._cache.prune()
+
+
+_DEFAULT_DIRECTORY = None
+_DEFAULT_CACHE = None
+_CONFIGURED = False
+
+
+def configure(directory=None):
+    """Set the directory of the default pipeline cache; or disable it with `None`.
+
+    Without an explicit configuration, the ``DEPLOYER_PIPELINE_CACHE`` environment variable is honored.
+    """
+    global _DEFAULT_DIRECTORY, _DEFAULT_CACHE, _CONFIGURED
+    _DEFAULT_DIRECTORY = directory or None
+    _DEFAULT_CACHE = PipelineCache(directory) if directory else None
+    _CONFIGURED = True
+
+
+def get_cache():
+    """Return the default pipeline cache; or `None` when it is disabled."""
+    if not _CONFIGURED:
+        configure(os.environ.get(PIPELINE_CACHE_ENVVAR) or None)
+    return _DEFAULT_CACHE
+
+
+def get_directory():
+    """Return the directory of the default pipeline cache; or `None` when it is disabled."""
+    get_cache()
+    return _DEFAULT_DIRECTORY
+
+
+def get_result_cache():
+    """Return the cache of validation results, kept beneath the default pipeline cache; or `None` when it is disabled."""
+    directory = get_directory()
+    return ResultCache(os.path.join(directory, 'results')) if directory else None
+
+
+def load(stream, validate, format='yaml'):
+    """Load and validate the pipeline document within `stream`, re-using a cached document when possible.
+
+    Returns the document if `validate` accepts it; otherwise `None`. Any loading error propagates.
+    """
+    from deployer.loader import load as load_document
+
+    cache = get_cache()
+    if cache is None:
+        document = load_document(stream, format)
+        return document if validate(document) else None
+
+    data = stream.read()
+    if not isinstance(data, bytes):
+        data = data.encode('utf-8')
+
+    document = cache.get(data, format)
+    if document is not None:
+        from deployer.plugins.plugin import Plugin
+
+        LOGGER.debug("Re-using the cached, validated pipeline document.")
+        Plugin.trust(document)
+        return document
+
+    document = load_document(data, format)
+    if not validate(document):
+        return None
+
+    cache.set(data, document, format)
+    return document
@@ -13,75 +13,56 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Namespace for all built-in plugins shipped with ```PyDeployer```."""
+"""Namespace for all built-in plugins shipped with ```PyDeployer```.
+
+The plug-in modules, and with them ``schema``, Jinja2 and Twisted, are only imported once
+used; either by a pipeline using the plug-in, or by importing its class from this package.
+"""
 
 # flake8: noqa
 
-import logging
+import importlib
+import sys
 from collections import OrderedDict
 
-from deployer.result import Result
-
 from .api import hookimpl
-from .command import Command
-from .cont import Continue
-from .echo import Echo
-from .env import Env
-from .matrix import Matrix
-from .plugin import Plugin
-from .set import Set
-from .shell import Shell
-from .stage import Stage
-from .top_level import TopLevel
-
-LOGGER = logging.getLogger(__name__)
-
-
-class Fail(Plugin):
-    """Fail with purpose."""
 
-    TAG = 'fail'
+#: The built-in plug-ins, by name; with the module defining each.
+BUILTIN_PLUGINS = OrderedDict([
+    ('command', ('command', 'Command')),
+    ('continue', ('cont', 'Continue')),
+    ('echo', ('echo', 'Echo')),
+    ('env', ('env', 'Env')),
+    ('fail', ('fail', 'Fail')),
+    ('include', ('include', 'Include')),
+    ('matrix', ('matrix', 'Matrix')),
+    ('set', ('set', 'Set')),
+    ('shell', ('shell', 'Shell')),
+    ('stage', ('stage', 'Stage')),
+])
 
-    def __init__(self, msg):
-        """Ctor."""
-        self.fail = msg['fail'] if 'fail' in msg else ''
+_EXPORTS = dict((cls, module) for module, cls in BUILTIN_PLUGINS.values())
+_EXPORTS.update(Plugin='plugin', TopLevel='top_level')
 
-    @staticmethod
-    def valid(node):
-        """Ensure node structure is valid."""
-        if type(node) is not OrderedDict:
-            return False
 
-        if Fail.TAG not in node:
-            return False
+def __getattr__(name):
+    """Import the built-in plug-in class `name` upon first use."""
+    if name not in _EXPORTS:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
-        return True
+    value = getattr(importlib.import_module('.' + _EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
 
-    @staticmethod
-    def build(node):
-        """Build a ```Fail``` node."""
-        yield Fail(node)
 
-    def execute(self, context):
-        """Perform the plugin's task purpose."""
-        if context:
-            from deployer.rendering import render
-            msg = render(self.fail, **context.variables.last())
-        else:
-            msg = self.fail
-        LOGGER.error("| %s", msg)
-        return Result(result='failure')
+if sys.version_info < (3, 7):                                  # noqa: no-cover
+    # module-level `__getattr__` is unavailable; see PEP 562.
+    for _name in _EXPORTS:                                     # noqa: no-cover
+        __getattr__(_name)                                     # noqa: no-cover
 
 
 @hookimpl
 def deployer_register(registry):
     """Perform built-in plug-in registrations."""
-    registry.register_plugin('command', Command)
-    registry.register_plugin('continue', Continue)
-    registry.register_plugin('echo', Echo)
-    registry.register_plugin('env', Env)
-    registry.register_plugin('fail', Fail)
-    registry.register_plugin('matrix', Matrix)
-    registry.register_plugin('set', Set)
-    registry.register_plugin('shell', Shell)
-    registry.register_plugin('stage', Stage)
+    for name, (module, cls) in BUILTIN_PLUGINS.items():
+        registry.register_lazy_plugin(name, '%s.%s:%s' % (__name__, module, cls))
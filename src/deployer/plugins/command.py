@@ -29,14 +29,11 @@ spawning programs).
 
 import logging
 import shlex
-from collections import OrderedDict
 
 from schema import And
-from schema import Schema
-from schema import SchemaError
 from twisted.internet.error import ProcessTerminated
 
-from deployer.rendering import render
+from deployer.rendering import Renderable
 from deployer.result import Result
 
 from .plugin import Plugin
@@ -53,34 +50,37 @@ class Command(Plugin):
 
     def __init__(self, node):
         """Ctor."""
-        self.cmd = node
+        self.cmd = Renderable(node)
 
     @staticmethod
-    def valid(node):
-        """Ensure node structure is valid."""
-        if type(node) is not OrderedDict:
-            return False
+    def build(node):
+        """Build a ```Command``` node."""
+        yield Command(node[Command.TAG])
 
-        if Command.TAG not in node:
-            return False
+    @staticmethod
+    def preflight(node, checker):
+        """Statically analyse the command line, and resolve the program it runs."""
+        cmd = node[Command.TAG]
+        checker.template(cmd)
 
         try:
-            Schema(Command.SCHEMA).validate(node[Command.TAG])
-        except SchemaError:
-            return False
+            argv = shlex.split(cmd, False, False)
+        except ValueError as e:
+            checker.report(checker.where, "Unable to parse %r: %s" % (cmd, e))
+            return
 
-        return True
+        if argv:
+            checker.executable(argv[0])
 
-    @staticmethod
-    def build(node):
-        """Build a ```Command``` node."""
-        yield Command(node[Command.TAG])
+    def renderables(self):
+        """Return the templated fields rendered against the task's own variable scope."""
+        return (self.cmd,)
 
     def execute(self, context):
         """Perform the plugin's task purpose."""
         result = Result(result='success')
 
-        cmd = render(self.cmd, **context.variables.last())
+        cmd = self.cmd.render(context.variables.last())
         argv = shlex.split(cmd, False, False)
         LOGGER.debug("Running: %r" % argv)
 
@@ -23,12 +23,9 @@ The module plug-in providing the ```continue``` command.
 """
 
 import logging
-from collections import OrderedDict
 
 from schema import And
 from schema import Or
-from schema import Schema
-from schema import SchemaError
 
 from deployer.rendering import BooleanExpression
 from deployer.result import Result
@@ -49,35 +46,24 @@ class Continue(Plugin):
 
     def __init__(self, node):
         """Ctor."""
-        self._conditions = node['when'] if 'when' in node else []
-
-    @staticmethod
-    def valid(node):
-        """Ensure node structure is valid."""
-        if type(node) is not OrderedDict:
-            return False
-
-        if Continue.TAG not in node:
-            return False
-
-        try:
-            Schema(Continue.SCHEMA).validate(node[Continue.TAG])
-        except SchemaError:
-            return False
-
-        return True
+        self._conditions = [BooleanExpression(condition) for condition in node['when']] if 'when' in node else []
 
     @staticmethod
     def build(node):
         """Build a `Continue` node."""
         yield Continue(node[Continue.TAG])
 
+    @staticmethod
+    def preflight(node, checker):
+        """Statically analyse the conditions."""
+        for condition in node[Continue.TAG]['when'] if 'when' in node[Continue.TAG] else []:
+            if not isinstance(condition, bool):
+                checker.expression(condition)
+
     def execute(self, context):
         """Perform the plugin's task purpose."""
         for condition in self._conditions:
-            expr = BooleanExpression(condition)
-
-            if expr.evaluate(context):
+            if condition.evaluate(context):
                 return Result(result='continue')
 
         return Result(result='success')
@@ -23,9 +23,8 @@ The module plug-in providing the ```echo``` command.
 """
 
 import logging
-from collections import OrderedDict
 
-from deployer.rendering import render
+from deployer.rendering import Renderable
 from deployer.result import Result
 
 from .plugin import Plugin
@@ -40,30 +39,28 @@ class Echo(Plugin):
 
     def __init__(self, msg):
         """Ctor."""
-        self.msg = msg['echo']
-
-    @staticmethod
-    def valid(node):
-        """Ensure node structure is valid."""
-        if type(node) is not OrderedDict:
-            return False
-
-        if Echo.TAG not in node:
-            return False
-
-        return True
+        self.msg = Renderable(msg['echo'])
 
     @staticmethod
     def build(node):
         """Build an `Echo` node."""
         yield Echo(node)
 
+    @staticmethod
+    def preflight(node, checker):
+        """Statically analyse the message; this node defines no variables."""
+        checker.templates(node[Echo.TAG])
+
+    def renderables(self):
+        """Return the templated fields rendered against the task's own variable scope."""
+        return (self.msg,)
+
     def execute(self, context):
         """Perform the plugin's task purpose."""
         if context:
-            msg = render(self.msg, **context.variables.last())
+            msg = self.msg.render(context.variables.last())
         else:
-            msg = self.msg
+            msg = self.msg.source
 
         for line in msg.splitlines(False):
             LOGGER.info("| %s", line)
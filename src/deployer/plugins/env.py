@@ -25,15 +25,12 @@ The module plug-in providing the ``env`` command.
 import fnmatch
 import logging
 import os
-from collections import OrderedDict
 
 from schema import And
 from schema import Optional
 from schema import Or
-from schema import Schema
-from schema import SchemaError
 
-from deployer.rendering import render
+from deployer.rendering import Renderable
 from deployer.result import Result
 
 from .plugin import Plugin
@@ -53,7 +50,7 @@ class Env(Plugin):
 
     def __init__(self, node):
         """Ctor."""
-        self.env_set = node['set'] if 'set' in node else {}
+        self.env_set = [(key, Renderable(value)) for key, value in node['set'].items()] if 'set' in node else []
 
         if 'unset' in node:
             if type(node['unset']) not in (list,):
@@ -63,27 +60,20 @@ class Env(Plugin):
         else:
             self.env_unset = []
 
-    @staticmethod
-    def valid(node):
-        """Ensure node structure is valid."""
-        if type(node) is not OrderedDict:
-            return False
-
-        if Env.TAG not in node:
-            return False
-
-        try:
-            Schema(Env.SCHEMA).validate(node[Env.TAG])
-        except SchemaError:
-            return False
-
-        return True
+    def renderables(self):
+        """Return the templated fields rendered against the task's own variable scope."""
+        return tuple(value for _, value in self.env_set)
 
     @staticmethod
     def build(node):
         """Build an Echo node."""
         yield Env(node['env'])
 
+    @staticmethod
+    def preflight(node, checker):
+        """Statically analyse the values being set."""
+        checker.templates(node[Env.TAG]['set'] if 'set' in node[Env.TAG] else {})
+
     def execute(self, context):
         """Perform the plugin's task purpose."""
         for env in os.environ.copy():
@@ -97,9 +87,11 @@ class Env(Plugin):
                     del os.environ[env]
                 else:
                     LOGGER.debug("Keeping '%s' present in the system environment.", env)
-        for key, value in self.env_set.items():
+        for key, value in self.env_set:
             if context:
-                value = render(value, **context.variables.last())
+                value = value.render(context.variables.last())
+            else:
+                value = value.source
 
             LOGGER.debug("Setting '%s' to '%s', in the system environment.", key, value)
             os.putenv(key, value)
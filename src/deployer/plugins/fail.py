@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The module plug-in providing the ```fail``` command.
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+import logging
+
+from deployer.rendering import Renderable
+from deployer.result import Result
+
+from .plugin import Plugin
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Fail(Plugin):
+    """Fail with purpose."""
+
+    TAG = 'fail'
+
+    def __init__(self, msg):
+        """Ctor."""
+        self.fail = Renderable(msg['fail'] if 'fail' in msg else '')
+
+    @staticmethod
+    def build(node):
+        """Build a ```Fail``` node."""
+        yield Fail(node)
+
+    @staticmethod
+    def preflight(node, checker):
+        """Statically analyse the message; this node defines no variables."""
+        checker.templates(node[Fail.TAG])
+
+    def execute(self, context):
+        """Perform the plugin's task purpose."""
+        if context:
+            msg = self.fail.render(context.variables.last())
+        else:
+            msg = self.fail.source
+        LOGGER.error("| %s", msg)
+        return Result(result='failure')
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The module plug-in providing the ```include``` command.
+
+Fragments are loaded lazily, only when the ```include``` task executes; and each
+distinct file is parsed and validated once per process, however often it is included.
+A fragment including itself, directly or through others, fails instead of recursing.
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+import contextlib
+import glob
+import logging
+import os
+import threading
+
+from schema import And
+from schema import Or
+
+from deployer import pipeline_cache
+from deployer.loader import detect_format
+from deployer.rendering import Renderable
+from deployer.result import Result
+
+from .plugin import Plugin
+from .top_level import TopLevel
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FragmentError(RuntimeError):
+    """Exception thrown when an included fragment cannot be loaded, or is invalid."""
+
+    def __init__(self, path, reason):
+        """Ctor."""
+        self.path = path
+        self.reason = reason
+
+    def __str__(self):
+        """Get a string representation of this exception."""
+        return "Unable to include '%s': %s" % (self.path, self.reason)
+
+
+class FragmentCache(object):
+    """The parsed and validated documents of included files; keyed by path, and invalidated upon modification.
+
+    Documents are additionally shared across processes through the pipeline cache, when it is configured;
+    see :py:mod:`deployer.pipeline_cache`.
+    """
+
+    def __init__(self):
+        """Ctor."""
+        self._documents = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path):
+        """Return the validated document of the file at `path`; raising :py:class:`FragmentError` otherwise."""
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            raise FragmentError(path, e.strerror)
+        stamp = (st.st_mtime, st.st_size)
+
+        with self._lock:
+            entry = self._documents.get(path)
+            if entry is not None and entry[0] == stamp:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        LOGGER.debug("Loading the fragment '%s'.", path)
+        try:
+            with open(path, 'rb') as f:
+                document = pipeline_cache.load(f, TopLevel.valid, format=detect_format(path))
+        except Exception as e:
+            raise FragmentError(path, e)
+        if document is None:
+            raise FragmentError(path, "the document is not a valid list of tasks")
+
+        with self._lock:
+            self._documents[path] = (stamp, document)
+        return document
+
+    def clear(self):
+        """Forget all loaded documents."""
+        with self._lock:
+            self._documents.clear()
+
+
+#: The fragments loaded by this process.
+FRAGMENTS = FragmentCache()
+
+
+_EXECUTING = threading.local()
+
+
+@contextlib.contextmanager
+def executing(path):
+    """Mark the fragment at `path` as executing; raising :py:class:`FragmentError` when it already is, as it includes itself."""
+    paths = getattr(_EXECUTING, 'paths', None)
+    if paths is None:
+        paths = _EXECUTING.paths = []
+
+    if path in paths:
+        raise FragmentError(path, "it includes itself, through %s" % ' > '.join(paths[paths.index(path):] + [path]))
+
+    paths.append(path)
+    try:
+        yield
+    finally:
+        paths.pop()
+
+
+@contextlib.contextmanager
+def included_from(context, directory):
+    """Resolve relative includes against `directory`, for the duration of a fragment's execution."""
+    if context:
+        previous = context.directory
+        context.directory = directory
+    try:
+        yield
+    finally:
+        if context:
+            context.directory = previous
+
+
+class Include(Plugin):
+    """Include the tasks of other pipeline files; given by path or glob pattern."""
+
+    TAG = 'include'
+
+    SCHEMA = Or(And(str, len), [And(str, len)])
+
+    def __init__(self, node):
+        """Ctor."""
+        self._patterns = [Renderable(pattern) for pattern in (node if isinstance(node, list) else [node])]
+        self._compiled = {}
+
+    @staticmethod
+    def build(node):
+        """Build an ```Include``` node."""
+        yield Include(node[Include.TAG])
+
+    @staticmethod
+    def preflight(node, checker):
+        """Statically analyse the paths; without loading the fragments, which may define variables."""
+        checker.templates(node[Include.TAG])
+        checker.uncertain()
+
+    def renderables(self):
+        """Return the templated fields rendered against the task's own variable scope."""
+        return tuple(self._patterns)
+
+    def _paths(self, context):
+        directory = context.directory if context and context.directory else os.getcwd()
+
+        paths = []
+        for pattern in self._patterns:
+            pattern = os.path.join(directory, pattern.render(context.variables.last()) if context else pattern.source)
+            if glob.has_magic(pattern):
+                matches = sorted(glob.glob(pattern))
+                if not matches:
+                    LOGGER.warning("No files match the include pattern '%s'.", pattern)
+                paths.extend(matches)
+            else:
+                paths.append(pattern)
+
+        return [os.path.abspath(path) for path in paths]
+
+    def execute(self, context):
+        """Perform the plugin's task purpose."""
+        result = Result(result='success')
+
+        for path in self._paths(context):
+            try:
+                document = FRAGMENTS.load(path)
+            except FragmentError as e:
+                LOGGER.error("%s", e)
+                return Result(result='failure')
+
+            # build each fragment's task tree once; again only if the file is modified.
+            compiled = self._compiled.get(path)
+            if compiled is None or compiled[0] is not document:
+                compiled = self._compiled[path] = (document, Plugin._compile(document, inherited_tags=self._match_tags))
+
+            try:
+                with executing(path), included_from(context, os.path.dirname(path)):
+                    for plugins in compiled[1]:
+                        for plugin in plugins:
+                            result = plugin.execute(context)
+                            if not result:
+                                return result
+            except FragmentError as e:
+                LOGGER.error("%s", e)
+                return Result(result='failure')
+
+        return result
@@ -32,7 +32,7 @@ from schema import And
 from schema import Or
 
 from deployer.plugins.plugin_with_tasks import PluginWithTasks
-from deployer.rendering import render
+from deployer.rendering import Renderable
 from deployer.result import Result
 
 LOGGER = logging.getLogger(__name__)
@@ -47,10 +47,10 @@ def matrix_scoped_variables(context, tag):
         # set the current matrix tag variable
         context.variables.last()['matrix_tag'] = tag
 
-        # append the current matrix tag onto the descending list of entered matrices.
-        if 'matrix_list' not in context.variables.last():
-            context.variables.last()['matrix_list'] = []
-        context.variables.last()['matrix_list'].append(tag)
+        # append the current matrix tag onto the descending list of entered matrices; without
+        # mutating the list shared with the enclosing scope.
+        matrix_list = context.variables.last()['matrix_list'] if 'matrix_list' in context.variables.last() else []
+        context.variables.last()['matrix_list'] = matrix_list + [tag]
     try:
         yield
     finally:
@@ -70,35 +70,39 @@ class Matrix(PluginWithTasks):
     def __init__(self, node):
         """Ctor."""
         self._tags = node['tags']
+        if isinstance(self._tags, (dict, OrderedDict)):
+            self._tag_variables = OrderedDict((tag, [(key, Renderable(value)) for key, value in variables.items()])
+                                              for tag, variables in self._tags.items())
+        else:
+            self._tag_variables = None
         super(Matrix, self).__init__(node)
 
-    @staticmethod
-    def valid(node):
-        """Ensure node structure is valid."""
-        if type(node) is not OrderedDict:
-            return False
-
-        if Matrix.TAG not in node:
-            return False
-
-        return PluginWithTasks._valid(Matrix.SCHEMA, Matrix.TAG, node)
-
     @staticmethod
     def build(node):
         """Build a ```Matrix``` node."""
         yield Matrix(node[Matrix.TAG])
 
+    @staticmethod
+    def preflight(node, checker):
+        """Statically analyse the tag variables and all nested tasks."""
+        tags = node[Matrix.TAG]['tags']
+        if isinstance(tags, (dict, OrderedDict)):
+            checker.templates(tags)
+
+        with checker.scope(names=('matrix_tag', 'matrix_list')):
+            checker.tasks(node[Matrix.TAG]['tasks'])
+
     def execute(self, context):
         """Perform the plugin's task purpose."""
         result = Result(result='success')
 
         for tag in self._tags:
-            if isinstance(self._tags, (dict, OrderedDict)):
+            if self._tag_variables is not None:
                 # we have a dictionary of items.
                 LOGGER.debug("Setting environment variables for tag.")
-                for key, value in self._tags[tag].items():
+                for key, value in self._tag_variables[tag]:
                     if context:
-                        value = render(value, **context.variables.last())
+                        value = value.render(context.variables.last())
                     else:  # noqa: no-cover
                         raise RuntimeError("Context is required.")
 
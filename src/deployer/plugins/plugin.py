@@ -23,17 +23,40 @@ The module providing the base class of all ```PyDeployer``` plug-ins.
 """
 
 import logging
+import weakref
+from collections import OrderedDict
 
 from deployer.registry import Registry
-from deployer.third_party.temp import NamedTemporaryFile
-from deployer.util import FailureLoggingSubprocessProtocol
-from deployer.util import LoggingSubprocessProtocol
-from deployer.util import sync_spawn_process
+from deployer.validation import ValidationError
+from deployer.validation import compile_schema
+from deployer.validation import schema_errors
 
 from .plugin_proxy import PluginProxy
 
 LOGGER = logging.getLogger(__name__)
 
+#: The memoized validity of every validated node; keyed by identity, for as long as the node lives.
+_VALIDATED = {}
+
+
+class _Validated(weakref.KeyedRef):
+    """A weak reference to a validated node, holding its validity; forgotten along with the node."""
+
+    __slots__ = ('valid',)
+
+    def __new__(cls, node, valid):
+        """Create a reference to `node`."""
+        return weakref.KeyedRef.__new__(cls, node, _forget, id(node))
+
+    def __init__(self, node, valid):
+        """Ctor."""
+        super(_Validated, self).__init__(node, _forget, id(node))
+        self.valid = valid
+
+
+def _forget(ref):
+    _VALIDATED.pop(ref.key, None)
+
 
 class InvalidNode(RuntimeError):
     """Exception thrown when a YAML section cannot be handled via all plug-ins."""
@@ -64,53 +87,180 @@ class Plugin(object):
 
     _match_tags = []
 
+    #: The schema of the value under the plug-in's ``TAG``; any value, when `None`.
+    SCHEMA = None
+
+    @classmethod
+    def schema(cls):
+        """Return the complete schema of the value under the plug-in's ``TAG``."""
+        return object if cls.SCHEMA is None else cls.SCHEMA
+
+    @classmethod
+    def validator(cls):
+        """Return the validator compiled from :py:meth:`schema`; once per class, normally when it is registered."""
+        validator = cls.__dict__.get('_validator')
+        if validator is None:
+            validator = compile_schema(cls.schema())
+            setattr(cls, '_validator', validator)
+        return validator
+
+    @classmethod
+    def valid(cls, node):
+        """Ensure node structure is valid."""
+        if type(node) is not OrderedDict:
+            return False
+
+        if cls.TAG not in node:
+            return False
+
+        return cls.validator().is_valid(node[cls.TAG])
+
+    @classmethod
+    def errors(cls, node, path=()):
+        """Return a list of the :py:class:`deployer.validation.ValidationError` of each problem within the `node`.
+
+        The list is empty when the node is valid; every error carries its `path` from the
+        root of the document, which begins with the given `path` of the `node`.
+        """
+        if type(node) is not OrderedDict:
+            return [ValidationError(path, "A task must be a mapping.")]
+
+        if cls.TAG not in node:
+            return [ValidationError(path, "The task does not hold the '%s' key." % cls.TAG)]
+
+        return schema_errors(cls.validator(), node[cls.TAG], path + (cls.TAG,))
+
+    @classmethod
+    def preflight(cls, node, checker):
+        """Statically analyse the `node` before execution, using a :py:class:`deployer.preflight.Preflight`.
+
+        By default, every string within the node is analysed as a template. As the variables
+        a plug-in defines are unknown, later problems are no longer fatal; see
+        :py:meth:`deployer.preflight.Preflight.uncertain`. Plug-ins defining no variables
+        override this.
+        """
+        checker.templates(node[cls.TAG])
+        checker.uncertain()
+
+    def compile_tasks(self):
+        """Build the task tree of any nested tasks; once, when this plug-in is itself built."""
+
+    def renderables(self):
+        """Return the templated fields rendered against the task's own variable scope.
+
+        A task looping over ``with_items`` pre-renders these for every item; see
+        :py:meth:`deployer.rendering.Renderable.prime`. Fields streamed through
+        :py:meth:`deployer.rendering.Renderable.render_to`, such as a script, are left out.
+        """
+        return ()
+
     @staticmethod
     def _find_matching_plugin_for_node(node):
         """Locate a plug-in which handles the specified `node`; else returns `None`."""
-        plugins = Registry().plugins()
-
-        # print("Got the key %s" % node_key)
-        for node_key in node.keys():
-            for plugin in plugins:
-                # print("Plug: %r" % plugin)
-                if plugin in node_key:
-                    return plugins[plugin]
-
-        return None
+        return Registry().find_plugin(node)
 
     @staticmethod
     def _recursive_valid(node):
         # find a workable plugin
         plugin = Plugin._find_matching_plugin_for_node(node)
         if plugin:
-            return plugin.valid(node)
+            return Plugin._valid_node(plugin, node)
         else:
             return False
 
+    @staticmethod
+    def _valid_node(plugin, node):
+        """Validate the `node` with `plugin`, once for the lifetime of the node.
+
+        Nested tasks are validated through :py:meth:`_recursive_valid` too, so a whole
+        document is validated in a single pass; and building it re-uses every result.
+        """
+        entry = _VALIDATED.get(id(node))
+        if entry is not None and entry() is node:
+            return entry.valid
+
+        return Plugin._remember(node, plugin.valid(node))
+
+    @staticmethod
+    def _remember(node, valid):
+        """Record the validity of the `node`, for its lifetime; see :py:meth:`_valid_node`."""
+        try:
+            entry = _Validated(node, valid)
+        except TypeError:
+            # e.g. a plain `dict`, which is never valid anyway.
+            return valid
+
+        _VALIDATED[entry.key] = entry
+        return valid
+
+    @staticmethod
+    def trust(document):
+        """Record every task node of the `document` as valid; so building it skips validation.
+
+        Only for a document already validated, such as one re-used from the pipeline cache.
+        """
+        pending = [document]
+        while pending:
+            value = pending.pop()
+            if isinstance(value, dict):
+                if Plugin._find_matching_plugin_for_node(value) is not None:
+                    Plugin._remember(value, True)
+                pending.extend(value.values())
+            elif isinstance(value, list):
+                pending.extend(value)
+
+    @staticmethod
+    def _recursive_errors(node, path=()):
+        """Return a list of the :py:class:`deployer.validation.ValidationError` of each problem within the `node`."""
+        plugin = Plugin._find_matching_plugin_for_node(node) if isinstance(node, dict) else None
+        if not plugin:
+            return [ValidationError(path, "No plug-in is able to handle the task.")]
+
+        if Plugin._valid_node(plugin, node):
+            return []
+
+        errors = plugin.errors(node, path) if hasattr(plugin, 'errors') else []
+        # e.g. a plug-in which overrides `valid`, but not `errors`.
+        return errors or [ValidationError(path, "The '%s' task is invalid." % plugin.TAG)]
+
     @staticmethod
     def _recursive_build(node, inherited_tags=()):
         # find a workable plugin
         plugin = Plugin._find_matching_plugin_for_node(node)
         if plugin:
-            if plugin.valid(node):
+            if Plugin._valid_node(plugin, node):
                 # handle common elements
                 name = node['name'] if 'name' in node else plugin.TAG
                 when = node['when'] if 'when' in node else None
                 with_items = node['with_items'] if 'with_items' in node else None
                 attempts = node['attempts'] if 'attempts' in node else 1
                 register = node['register'] if 'register' in node else None
-                tags = node['tags'] if 'tags' in node else []
-                tags.extend(inherited_tags)
+                # an immutable tuple; so every untagged task shares the same, empty, one.
+                tags = tuple(node['tags']) + tuple(inherited_tags) if 'tags' in node else tuple(inherited_tags)
                 for sub_node in plugin.build(node):
-                    yield PluginProxy(name, sub_node, when=when, with_items=with_items, attempts=attempts, tags=tags, register=register)
+                    proxy = PluginProxy(name, sub_node, when=when, with_items=with_items, attempts=attempts, tags=tags, register=register)
+                    # nested tasks inherit the tags, which are only known once proxied.
+                    sub_node.compile_tasks()
+                    yield proxy
             else:
                 raise FailedValidation(node)
         else:
             raise InvalidNode(node)
 
+    @staticmethod
+    def _compile(nodes, inherited_tags=()):
+        """Build the task tree of the `nodes`; a tuple holding, for each node, the tuple of its proxied plug-ins."""
+        return tuple(tuple(Plugin._recursive_build(node, inherited_tags=inherited_tags)) for node in nodes)
+
     @staticmethod
     def run(args=(), silent=False, timeout=None):
         """Execute another program, and wait until it completes."""
+        # Twisted is only imported once a plug-in runs a program.
+        from deployer.third_party.temp import NamedTemporaryFile
+        from deployer.util import FailureLoggingSubprocessProtocol
+        from deployer.util import LoggingSubprocessProtocol
+        from deployer.util import sync_spawn_process
+
         if not silent:
             process_protocol = LoggingSubprocessProtocol()
             return sync_spawn_process(process_protocol, args, timeout=timeout)
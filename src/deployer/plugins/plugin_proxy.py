@@ -28,23 +28,30 @@ import time
 
 import six
 
-from deployer.proxy import Proxy
+from deployer.context import Scope
 from deployer.rendering import BooleanExpression
-from deployer.rendering import my_safe_eval
-from deployer.rendering import render
+from deployer.rendering import Renderable
 from deployer.result import Result
 
 LOGGER = logging.getLogger(__name__)
 
+#: The number of ``with_items`` iterations whose templated fields are pre-rendered at once.
+PRIME_BATCH_SIZE = 64
+
+
+def item_scope(context, item):
+    """Return a new variable scope, for an iteration of a ``with_items`` loop over `item`."""
+    scope = Scope(context.variables.last())
+    scope['item'] = item
+    return scope
+
 
 @contextlib.contextmanager
-def with_scoped_variables(context, item):
+def with_scoped_variables(context, item, scope=None):
     """Ensure all variables introduced by the ```Matrix``` plug-in are scoped to itself."""
     if context and item is not None:
-        context.variables.push_last()
-
-        # set the current loop item variable
-        context.variables.last()['item'] = item
+        # enter the current loop item's variable scope
+        context.variables.push(scope if scope is not None else item_scope(context, item))
     try:
         yield
     finally:
@@ -52,19 +59,37 @@ def with_scoped_variables(context, item):
             context.variables.pop()
 
 
-class PluginProxy(Proxy):
-    """Wrap-around for all plug-ins."""
+class PluginProxy(object):
+    """Wrap-around for all plug-ins; a compact task node, holding the options common to every task.
 
-    def __init__(self, name, obj, when=None, with_items=None, attempts=1, tags=[], register=None):
+    Its own methods are dispatched directly; any other attribute is looked up on the wrapped plug-in.
+    """
+
+    __slots__ = ('_obj', '_name', '_when', '_with_items', '_attempts', '_match_tags', '_register')
+
+    def __init__(self, name, obj, when=None, with_items=None, attempts=1, tags=(), register=None):
         """Ctor."""
-        super(PluginProxy, self).__init__(obj)
+        self._obj = obj
         self._name = name
-        self._when = when
-        self._with_items = with_items
+        self._when = BooleanExpression(when) if when is not None else None
+        self._with_items = Renderable(with_items) if isinstance(with_items, six.string_types) else with_items
         self._attempts = attempts
         self._match_tags = tags
         self._register = register
 
+        # nested tasks inherit the tags; see `PluginWithTasks.compile_tasks`.
+        obj._match_tags = tags
+
+    def __getattr__(self, name):
+        """Get an attribute of the wrapped plug-in."""
+        if name == '_obj' or name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self._obj, name)
+
+    def __repr__(self):
+        """Get the string representation of the object."""
+        return repr(self._obj)                                           # noqa: no-cover
+
     def _execute_one(self, context):
         result = Result(result='failure')
         count = 0
@@ -74,7 +99,7 @@ class PluginProxy(Proxy):
             LOGGER.info("%s is starting.", self._name)
             # emit a start event here, events MUST have correlation id
             start = time.time()
-            result = object.__getattribute__(self, "_obj").execute(context)
+            result = self._obj.execute(context)
             end = time.time()
             LOGGER.info("%s has finished with %r, in %0.9f seconds.", self._name, result['result'], (end - start))
             # emit an end event here
@@ -93,6 +118,24 @@ class PluginProxy(Proxy):
 
         return result
 
+    def _prime(self, context, items):
+        """Pre-render the plug-in's templated fields for every one of the `items`, in one pass.
+
+        The loop primes at most :py:data:`PRIME_BATCH_SIZE` items at a time; so memory stays bounded.
+
+        Returns the variable scope of each item, which the loop must enter for the output to be re-used.
+        """
+        renderables = getattr(self._obj, 'renderables', lambda: ())()
+        if not context or len(items) < 2 or not any(renderable.needs_rendering for renderable in renderables):
+            for renderable in renderables:
+                renderable.prime(())
+            return None
+
+        scopes = [item_scope(context, item) for item in items]
+        for renderable in renderables:
+            renderable.prime(scopes)
+        return scopes
+
     def execute(self, context):
         """Proxy of a plug-in's `execute` method."""
         result = Result(result='failed')
@@ -107,22 +150,29 @@ class PluginProxy(Proxy):
                 LOGGER.debug("Skipping because this item does not have a user-selected tag.")
                 return Result(result='skipped')
 
-        if self._when is not None:
-            expr = BooleanExpression(self._when)
-
-            if not expr.evaluate(context):
-                return Result(result='skipped')
+        if self._when is not None and not self._when.evaluate(context):
+            return Result(result='skipped')
 
         if self._with_items is not None:
-            if context and isinstance(self._with_items, six.string_types):
-                with_items = my_safe_eval(render(self._with_items, **context.variables.last()))
+            if context and isinstance(self._with_items, Renderable):
+                with_items = self._with_items.evaluate(context.variables.last())
             else:
                 with_items = self._with_items
-            for item in with_items:
-                with with_scoped_variables(context, item):
-                    result = self._execute_one(context)
-                    if not result:
-                        break
+            items = list(with_items)
+            for start in range(0, len(items), PRIME_BATCH_SIZE):
+                batch = items[start:start + PRIME_BATCH_SIZE]
+                scopes = self._prime(context, batch)
+                try:
+                    for index, item in enumerate(batch):
+                        with with_scoped_variables(context, item, scopes[index] if scopes else None):
+                            result = self._execute_one(context)
+                            if not result:
+                                break
+                finally:
+                    if scopes:
+                        self._prime(None, ())
+                if not result:
+                    break
         else:
             result = self._execute_one(context)
 
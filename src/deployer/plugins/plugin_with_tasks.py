@@ -24,11 +24,7 @@ A module providing a base class of all ```PyDeployer``` plug-ins, which require
 
 import logging
 
-from schema import Schema
-from schema import SchemaError
-
 from deployer.result import Result
-from deployer.util import merge_dicts
 
 from .plugin import Plugin
 
@@ -45,25 +41,52 @@ class PluginWithTasks(Plugin):
     def __init__(self, node):
         """Ctor."""
         self._tasks = node['tasks']
-
-    @staticmethod
-    def _valid(schema, tag, node):
-        try:
-            Schema(merge_dicts(schema, PluginWithTasks.BASE_SCHEMA)).validate(node[tag])
-        except SchemaError:
+        self._compiled = None
+
+    @classmethod
+    def schema(cls):
+        """Return the complete schema of the value under the plug-in's ``TAG``; including the nested tasks."""
+        schema = dict(cls.SCHEMA or {})
+        schema.update(PluginWithTasks.BASE_SCHEMA)
+        return schema
+
+    @classmethod
+    def valid(cls, node):
+        """Ensure node structure is valid; including every nested task."""
+        if not super(PluginWithTasks, cls).valid(node):
             return False
 
-        for node in node[tag]['tasks']:
+        # each nested node is validated once, and memoized; see `Plugin._valid_node`.
+        for node in node[cls.TAG]['tasks']:
             if not Plugin._recursive_valid(node):
                 return False
 
         return True
 
+    @classmethod
+    def errors(cls, node, path=()):
+        """Return a list of the :py:class:`deployer.validation.ValidationError` of each problem; including nested tasks."""
+        errors = super(PluginWithTasks, cls).errors(node, path)
+        if errors:
+            return errors
+
+        for index, task in enumerate(node[cls.TAG]['tasks']):
+            errors.extend(Plugin._recursive_errors(task, path + (cls.TAG, 'tasks', index)))
+
+        return errors
+
+    def compile_tasks(self):
+        """Build the task tree of the nested tasks, inheriting this plug-in's tags."""
+        self._compiled = Plugin._compile(self._tasks, inherited_tags=self._match_tags)
+
     def _execute_tasks(self, context):
         result = Result(result='success')
 
-        for node in self._tasks:
-            for plugin in Plugin._recursive_build(node, inherited_tags=self._match_tags):
+        if self._compiled is None:
+            self.compile_tasks()
+
+        for plugins in self._compiled:
+            for plugin in plugins:
                 result = plugin.execute(context)
                 if not result:
                     break
@@ -23,11 +23,8 @@ The module plug-in providing the ```set``` command.
 """
 
 import logging
-from collections import OrderedDict
 
 from schema import And
-from schema import Schema
-from schema import SchemaError
 
 from deployer.result import Result
 
@@ -47,27 +44,17 @@ class Set(Plugin):
         """Ctor."""
         self.variables = node
 
-    @staticmethod
-    def valid(node):
-        """Ensure node structure is valid."""
-        if type(node) is not OrderedDict:
-            return False
-
-        if Set.TAG not in node:
-            return False
-
-        try:
-            Schema(Set.SCHEMA).validate(node[Set.TAG])
-        except SchemaError:
-            return False
-
-        return True
-
     @staticmethod
     def build(node):
         """Build a Set node."""
         yield Set(node[Set.TAG])
 
+    @staticmethod
+    def preflight(node, checker):
+        """Define the variables this node sets."""
+        for key in node[Set.TAG]:
+            checker.define(key)
+
     def execute(self, context):
         """Perform the plugin's task purpose."""
         if not context:  # noqa: no-cover
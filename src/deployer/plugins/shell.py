@@ -29,15 +29,12 @@ temporary file is then executed using the specified
 
 import logging
 import sys
-from collections import OrderedDict
 
 from schema import And
 from schema import Optional
-from schema import Schema
-from schema import SchemaError
 from twisted.internet.error import ProcessTerminated
 
-from deployer.rendering import render
+from deployer.rendering import Renderable
 from deployer.result import Result
 from deployer.third_party.temp import NamedTemporaryFile
 
@@ -96,39 +93,28 @@ class Shell(Plugin):
                 self.STANDARD_EXECUTABLES[executable]['flags']
             self._extension = self.STANDARD_EXECUTABLES[executable]['extension']
 
-        self._script = node['script']
+        self._script = Renderable(node['script'])
         self._silent = node['silent'] if 'silent' in node else False
         self._timeout = node['timeout'] if 'timeout' in node else None
 
-    @staticmethod
-    def valid(node):
-        """Ensure node structure is valid."""
-        if type(node) is not OrderedDict:
-            return False
-
-        if Shell.TAG not in node:
-            return False
-
-        try:
-            Schema(Shell.SCHEMA).validate(node[Shell.TAG])
-        except SchemaError:
-            return False
-
-        return True
-
     @staticmethod
     def build(node):
         """Build a ```Shell``` node."""
         yield Shell(node[Shell.TAG])
 
+    @staticmethod
+    def preflight(node, checker):
+        """Statically analyse the script, and resolve the executable which runs it."""
+        shell = Shell(node[Shell.TAG])
+        checker.template(shell._script.source)
+        checker.executable(shell._executable)
+
     def execute(self, context):
         """Perform the plugin's task purpose."""
         result = Result(result='success')
 
-        cmd = render(self._script, **context.variables.last())
-
         with NamedTemporaryFile('w+t', suffix=self._extension) as f:
-            f.write(cmd)
+            self._script.render_to(f, context.variables.last())
             f.flush()
 
             LOGGER.debug("Running: %r" % f.name)
@@ -24,7 +24,6 @@ The module plug-in providing the ```stage``` command.
 
 import contextlib
 import logging
-from collections import OrderedDict
 
 from schema import And
 from schema import Optional
@@ -61,22 +60,18 @@ class Stage(PluginWithTasks):
         super(Stage, self).__init__(node)
         self._scope = node['scope'] if 'scope' in node else True
 
-    @staticmethod
-    def valid(node):
-        """Ensure node structure is valid."""
-        if type(node) is not OrderedDict:
-            return False
-
-        if Stage.TAG not in node:
-            return False
-
-        return PluginWithTasks._valid(Stage.SCHEMA, Stage.TAG, node)
-
     @staticmethod
     def build(node):
         """Build a ```Stage``` node."""
         yield Stage(node[Stage.TAG])
 
+    @staticmethod
+    def preflight(node, checker):
+        """Statically analyse all nested tasks."""
+        scope = node[Stage.TAG]['scope'] if 'scope' in node[Stage.TAG] else True
+        with checker.scope(leak=not scope):
+            checker.tasks(node[Stage.TAG]['tasks'])
+
     def execute(self, context):
         """Perform the plugin's task purpose."""
         with scoped_variables(context, self._scope):
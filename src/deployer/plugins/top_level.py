@@ -25,8 +25,11 @@ The top-level object, representing an entire ```PyDeployer``` pipeline.
 import logging
 import time
 
+from deployer.rendering import clear_memos
 from deployer.result import Result
+from deployer.validation import ValidationError
 
+from .plugin import FailedValidation
 from .plugin import Plugin
 
 LOGGER = logging.getLogger(__name__)
@@ -38,6 +41,7 @@ class TopLevel(Plugin):
     def __init__(self, document):
         """Constructor."""
         self._document = document
+        self._compiled = None
 
     @staticmethod
     def valid(document):
@@ -51,6 +55,29 @@ class TopLevel(Plugin):
 
         return True
 
+    @staticmethod
+    def errors(document, path=()):
+        """Return a list of the :py:class:`deployer.validation.ValidationError` of each problem within the `document`."""
+        if type(document) is not list:
+            return [ValidationError(path, "The pipeline document must be a list of tasks.")]
+
+        errors = []
+        for index, node in enumerate(document):
+            errors.extend(Plugin._recursive_errors(node, path + (index,)))
+
+        return errors
+
+    @staticmethod
+    def validated(nodes):
+        """Validate each of the `nodes` as it arrives; raising :py:class:`FailedValidation` upon the first invalid one.
+
+        Allows a pipeline to be built from nodes which are still being parsed; see :py:func:`deployer.loader.iter_ordered_load`.
+        """
+        for node in nodes:
+            if not Plugin._recursive_valid(node):
+                raise FailedValidation(node)
+            yield node
+
     @staticmethod
     def build(document):
         """Produce an iterable AST representation of a YAML pipeline definition."""
@@ -61,10 +88,20 @@ class TopLevel(Plugin):
         result = Result(result='success')
 
         LOGGER.info("Starting pipeline execution.")
+        clear_memos()
         start = time.time()
 
-        for node in self._document:
-            for plugin in Plugin._recursive_build(node):
+        if isinstance(self._document, list):
+            # the task tree is built once, then re-used by every later execution.
+            if self._compiled is None:
+                self._compiled = Plugin._compile(self._document)
+            tree = self._compiled
+        else:
+            # a streamed document is built as it arrives; see :py:meth:`validated`.
+            tree = (Plugin._recursive_build(node) for node in self._document)
+
+        for plugins in tree:
+            for plugin in plugins:
                 result = plugin.execute(context)
                 if not result:
                     break
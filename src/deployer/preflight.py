@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Static analysis of a pipeline document, performed before any of it executes.
+
+Every template is checked against the variables known to be defined at its
+location, and every program a task runs is resolved on the ``PATH``.
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import contextlib
+import logging
+
+from jinja2 import meta
+from jinja2 import nodes
+from jinja2.exceptions import TemplateSyntaxError
+from six import string_types
+
+from deployer.context import Context
+from deployer.rendering import LITERAL
+from deployer.rendering import classify
+from deployer.programs import resolve_program
+from deployer.rendering import get_environment
+
+LOGGER = logging.getLogger(__name__)
+
+#: The filters, and tests, whose use of an undefined variable is deliberate.
+GUARDING_FILTERS = frozenset(['default', 'd'])
+GUARDING_TESTS = frozenset(['defined', 'undefined'])
+
+
+class Problem(object):
+    """A problem found by the static analysis.
+
+    Problems found beneath a ``when`` condition are not `fatal`, because the
+    condition may never hold; nor are those found after an unanalysed ``include``.
+    A missing program is never `fatal`, as an earlier task may yet provide it.
+    """
+
+    def __init__(self, where, message, fatal=True):
+        """Ctor."""
+        self.where = where
+        self.message = message
+        self.fatal = fatal
+
+    def __str__(self):
+        """Get a string representation of the problem."""
+        return "%s: %s" % (self.where, self.message)
+
+
+class Preflight(object):
+    """Statically analyse a pipeline document; see :py:meth:`check`."""
+
+    def __init__(self):
+        """Ctor."""
+        self.problems = []
+        self.programs = {}
+        self._environment = get_environment()
+        self._scopes = [set(Context.BUILTIN_VARIABLES) | set(['env'])]
+        self._where = []
+        self._conditional = 0
+        self._uncertain = False
+
+    def check(self, document):
+        """Analyse every node of the `document`, returning the list of problems found."""
+        self.tasks(document)
+        return self.problems
+
+    @property
+    def errors(self):
+        """All fatal problems found."""
+        return [problem for problem in self.problems if problem.fatal]
+
+    def report(self, where, message, fatal=True):
+        """Record a problem found at `where`; only `fatal` outside of conditions, and before any unanalysed tasks."""
+        self.problems.append(Problem(where, message, fatal=fatal and self._conditional == 0 and not self._uncertain))
+
+    @property
+    def where(self):
+        """The path of task names leading to the node being analysed."""
+        return ' > '.join(self._where) or '<pipeline>'
+
+    @contextlib.contextmanager
+    def scope(self, names=(), leak=False):
+        """Analyse within a nested variable scope, having `names` defined; optionally `leak` definitions outwards."""
+        scope = set(self._scopes[-1])
+        scope.update(names)
+        self._scopes.append(scope)
+        try:
+            yield
+        finally:
+            self._scopes.pop()
+            if leak:
+                self._scopes[-1].update(scope)
+
+    def uncertain(self):
+        """Mark the variables defined from here onwards as unknowable; all later problems are no longer fatal.
+
+        Used when a node pulls in tasks which are not analysed, such as an ```include```.
+        """
+        self._uncertain = True
+
+    def define(self, name):
+        """Mark the variable `name` as defined, within the current scope."""
+        self._scopes[-1].add(name)
+
+    def tasks(self, tasks):
+        """Analyse a list of task nodes."""
+        from deployer.plugins.plugin import Plugin
+
+        for node in tasks:
+            plugin = Plugin._find_matching_plugin_for_node(node)
+            if plugin is None:                                  # noqa: no-cover
+                continue
+
+            self._where.append(str(node['name'] if 'name' in node else plugin.TAG))
+            self._conditional += 1 if 'when' in node else 0
+            try:
+                if 'when' in node and not isinstance(node['when'], bool):
+                    self.expression(node['when'])
+
+                with_items = node['with_items'] if 'with_items' in node else None
+                if isinstance(with_items, string_types):
+                    self.template(with_items)
+
+                with self.scope(names=('item',) if with_items is not None else (), leak=with_items is None):
+                    plugin.preflight(node, self)
+            finally:
+                self._conditional -= 1 if 'when' in node else 0
+                self._where.pop()
+
+            # the result of a loop is registered within each item's scope; never outside of it.
+            if 'register' in node and with_items is None:
+                self.define(node['register'])
+
+    def templates(self, value):
+        """Analyse every string within `value`, recursively, as a template."""
+        if isinstance(value, string_types):
+            self.template(value)
+        elif isinstance(value, dict):
+            for item in value.values():
+                self.templates(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                self.templates(item)
+
+    def template(self, text):
+        """Analyse a template, reporting syntax errors and undefined variables."""
+        if classify(text) == LITERAL:
+            return
+        self._undefined(text, text)
+
+    def expression(self, text):
+        """Analyse a boolean expression, reporting syntax errors and undefined variables."""
+        self._undefined('{{ %s }}' % text, text)
+
+    def executable(self, program):
+        """Warn unless the `program` exists and may be executed; recording where it resolves to within `programs`."""
+        if not program or classify(program) != LITERAL:
+            return
+
+        resolved = self.programs[program] = resolve_program(program)
+        if resolved is None:
+            self.report(self.where, "The program '%s' was not found." % program, fatal=False)
+
+    def _undefined(self, source, text):
+        try:
+            ast = self._environment.parse(source)
+        except TemplateSyntaxError as e:
+            self.report(self.where, "Syntax error in %r: %s" % (text, e))
+            return
+
+        names = meta.find_undeclared_variables(ast) - _guarded(ast)
+        for name in sorted(names):
+            if name not in self._scopes[-1] and name not in self._environment.globals:
+                self.report(self.where, "The variable '%s' is undefined, in %r." % (name, text))
+
+
+def _guarded(ast):
+    """Return the names of the variables, within the template `ast`, passed to a ``default`` filter or ``defined`` test."""
+    guarded = set()
+    for node in ast.find_all((nodes.Filter, nodes.Test)):
+        names = GUARDING_FILTERS if isinstance(node, nodes.Filter) else GUARDING_TESTS
+        if node.name in names and isinstance(node.node, nodes.Name):
+            guarded.add(node.node.name)
+    return guarded
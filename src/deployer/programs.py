@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Resolution of the programs run by tasks; importable without the template engine.
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+try:
+    from shutil import which
+except ImportError:                                             # noqa: no-cover
+    from distutils.spawn import find_executable as which       # noqa: no-cover
+
+
+def resolve_program(program):
+    """Return the path the `program` runs from; or `None` when it is missing, or may not be executed."""
+    if os.path.dirname(program):
+        return program if os.path.isfile(program) and os.access(program, os.X_OK) else None
+    return which(program)
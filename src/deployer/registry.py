@@ -28,6 +28,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import importlib
 import logging
 
 import six
@@ -36,6 +37,9 @@ from deployer.singleton import Singleton
 
 LOGGER = logging.getLogger(__name__)
 
+#: The keys common to every task; never dispatched to a plug-in.
+RESERVED_KEYS = frozenset(['name', 'when', 'tags', 'with_items', 'attempts', 'register'])
+
 
 @six.add_metaclass(Singleton)
 class Registry(object):
@@ -45,18 +49,94 @@ class Registry(object):
 
     plugin_manager = None
 
+    #: The ``(project, version)`` of every distribution providing plug-ins, through entry points.
+    distributions = []
+
+    #: Dispatch a node to the first plug-in whose name is a substring of one of its keys; as older releases did.
+    substring_matching = False
+
     def __init__(self):
         """Ctor."""
         self._plugins = {}
+        self._index = {}
+        self._lazy = {}
 
     def plugins(self):
-        """All available plugins."""
+        """All available plugins; importing any registered lazily."""
+        for name in list(self._lazy):
+            self._load(name)
         return self._plugins
 
+    def plugin_paths(self):
+        """The dotted path of every registered plug-in class, by name; without importing any registered lazily."""
+        paths = dict((name, '%s.%s' % (cls.__module__, cls.__name__)) for name, cls in self._plugins.items())
+        paths.update((name, path.replace(':', '.')) for name, path in self._lazy.items())
+        return paths
+
     def register_plugin(self, name, cls):
         """Register the `cls` for handling pipeline nodes, utilizing `name`."""
         if not getattr(cls, 'TAG'):                                                # noqa: no-cover
             raise LookupError("All plug-ins must implement a TAG attribute.")      # noqa: no-cover
 
         LOGGER.debug('Registering %s, with class %s, as a plug-in.', name, cls.__name__)
+        self._add(name, cls)
+
+    def _add(self, name, cls):
+        self._lazy.pop(name, None)
         self._plugins.update([(name, cls)])
+        if name in RESERVED_KEYS:
+            LOGGER.warning("The plug-in %s is registered as '%s', a reserved key; it is never dispatched to.", cls.__name__, name)
+        else:
+            self._index[name] = cls
+
+        # a plug-in declaring a `SCHEMA` has it compiled once, now; see `Plugin.validator`.
+        validator = getattr(cls, 'validator', None)
+        if validator is not None:
+            validator()
+
+    def register_lazy_plugin(self, name, path):
+        """Register the class at `path`, given as ``'package.module:Class'``, for handling pipeline nodes, utilizing `name`.
+
+        The module is only imported once a pipeline uses the plug-in.
+        """
+        LOGGER.debug('Registering %s, with class %s, as a lazily imported plug-in.', name, path)
+        self._plugins.pop(name, None)
+        self._index.pop(name, None)
+        self._lazy[name] = path
+        if name in RESERVED_KEYS:
+            self._load(name)
+
+    def _load(self, name):
+        module, _, attribute = self._lazy[name].partition(':')
+        cls = importlib.import_module(module)
+        for part in attribute.split('.'):
+            cls = getattr(cls, part)
+        self._add(name, cls)
+        return cls
+
+    def find_plugin(self, node):
+        """Locate the plug-in handling the `node`, by the first of its keys naming a registered plug-in; else `None`."""
+        index = self._index
+        lazy = self._lazy
+        for key in node:
+            plugin = index.get(key)
+            if plugin is not None:
+                return plugin
+            if key in lazy:
+                return self._load(key)
+
+        if Registry.substring_matching:
+            self.plugins()
+            return self._find_plugin_by_substring(node)
+
+        return None
+
+    def _find_plugin_by_substring(self, node):
+        for key in node:
+            if key in RESERVED_KEYS or not isinstance(key, six.string_types):
+                continue
+            for name, plugin in self._index.items():
+                if name in key:
+                    return plugin
+
+        return None
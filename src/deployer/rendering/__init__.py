@@ -24,19 +24,84 @@ A recursive Jinja2 rendering engine.
 
 import ast
 import collections
+import contextlib
+import hashlib
 import logging
+import operator
 import os
 import re
 import sys
+import threading
+from timeit import default_timer
 
 from jinja2 import Environment
+from jinja2 import meta
+from jinja2 import nodes
+from jinja2.bccache import BytecodeCache
 from jinja2.exceptions import TemplateSyntaxError
 from jinja2.exceptions import UndefinedError
+from jinja2.nativetypes import NativeEnvironment
 from jinja2.runtime import StrictUndefined
+from jinja2.runtime import Undefined
 from six import string_types
+from six import text_type
+from six.moves.collections_abc import Mapping
+
+from deployer.cache import DEFAULT_MAX_SIZE
+from deployer.cache import TEMPLATE_CACHE_ENVVAR
+from deployer.cache import DirectoryCache
+
+try:
+    from jinja2 import pass_context
+except ImportError:  # noqa: no-cover
+    from jinja2 import contextfunction as pass_context  # noqa: no-cover
 
 LOGGER = logging.getLogger(__name__)
 
+#: The default maximum number of compiled templates held by each shared environment.
+DEFAULT_CACHE_SIZE = 1024
+
+#: The default maximum number of memoized render outputs, and their combined length.
+DEFAULT_MEMO_SIZE = 4096
+DEFAULT_MEMO_LENGTH = 16 * 1024 * 1024
+
+#: The most values a memo key may freeze; renders referencing larger variables are not memoized.
+MEMO_KEY_MAX_ITEMS = 256
+
+#: Filters whose output is not a function of their input alone.
+NON_DETERMINISTIC_FILTERS = frozenset(['random'])
+
+#: Classifications of a templated value, see :py:func:`classify`.
+LITERAL = 'literal'
+VARIABLE = 'variable'
+TEMPLATE = 'template'
+
+TEMPLATE_MARKERS = ('{{', '{%', '{#')
+
+RAW_SENTINEL = 'Z6db7f9f90d8c7519dcbb6ac0dd828a0f2a8ab18a34ab8b0cae0fb6c0469a1e19Z'
+RAW_REGEXP = re.compile(r"\{%\s*raw\s*%\}")
+NEWLINE_REGEXP = re.compile(r"(\r\n|\r|\n)")
+VARIABLE_REGEXP = re.compile(r"\{\{\s*([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*)\s*\}\}")
+
+#: Names Jinja2 parses as constants or operators, or resolves itself (e.g. ``self``), rather than variable lookups.
+RESERVED_NAMES = frozenset(['true', 'false', 'none', 'True', 'False', 'None', 'not', 'and', 'or', 'in', 'is', 'if', 'else',
+                            'self', 'loop', 'caller', 'varargs', 'kwargs'])
+
+_STATISTICS = collections.Counter()
+_STATISTICS_LOCK = threading.Lock()
+
+
+def _count(name, amount=1):
+    with _STATISTICS_LOCK:
+        _STATISTICS[name] += amount
+
+
+def statistics():
+    """Return a dictionary of the rendering counters; such as ``renders_avoided``."""
+    with _STATISTICS_LOCK:
+        return dict(_STATISTICS)
+
+
 # Based on: Using ast and whitelists to make python's eval() safe?
 # https://stackoverflow.com/questions/12523516/using-ast-and-whitelists-to-make-pythons-eval-safe
 
@@ -82,6 +147,14 @@ if sys.version_info[:2] >= (3, 4):  # noqa: no-cover
         )
     )
 
+# And in Python 3.8, all literals are parsed as constants
+if hasattr(ast, 'Constant'):  # noqa: no-cover
+    SAFE_NODES.update(
+        set(
+            (ast.Constant,)
+        )
+    )
+
 
 class CleansingNodeVisitor(ast.NodeVisitor):  # noqa: no-cover
     """Cleaning AST node visitor."""
@@ -98,42 +171,705 @@ class CleansingNodeVisitor(ast.NodeVisitor):  # noqa: no-cover
             raise Exception("Unknown function: %s" % call.func.id)
 
 
-def my_safe_eval(s):
-    """Safely evaluate a Pythonic expression string."""
+def _compile_safe_expression(s):
+    """Parse, vet and compile a Pythonic expression string."""
     tree = ast.parse(s, mode='eval')
     cnv = CleansingNodeVisitor()
     cnv.visit(tree)
-    compiled = compile(tree, s, "eval")
+    return compile(tree, s, "eval")
+
+
+def my_safe_eval(s):
+    """Safely evaluate a Pythonic expression string.
+
+    Each distinct expression is vetted and compiled once; see :py:func:`safe_eval_cache_info`.
+    """
+    compiled = _SAFE_EVAL_CACHE.get(s)
     return(eval(compiled, SAFE_FX, dict({})))  # nosec
 
 
 class BooleanExpression:
-    """Simplistic boolean conditional evaluation through the Jinja2 templating engine."""
+    """Simplistic boolean conditional evaluation through the Jinja2 templating engine.
+
+    The expression is compiled once, upon construction, into a native Jinja2 expression.
+    """
 
     INVALID_SEQUENCES = ['{{', '}}', '{%', '%}']
 
     def __init__(self, expression):
         """Ctor."""
         self._expression = expression
+        self._compiled = None
+
+        if isinstance(expression, bool):
+            return
+
+        source = expression if isinstance(expression, string_types) else str(expression)
+        for invalid in self.INVALID_SEQUENCES:
+            if invalid in source:
+                # reported upon evaluation, as the expression may never be reached.
+                return
+
+        self._compiled = get_environment().expression_cache.get(source)
 
     def evaluate(self, context):
-        """Evaluate the boolean expression through the templating system, returning the result."""
+        """Evaluate the boolean expression against the current variable scope, returning the result."""
         if isinstance(self._expression, bool):
             return self._expression
 
-        for invalid in self.INVALID_SEQUENCES:
-            if invalid in self._expression:
-                raise RuntimeError("Expression must not contain Jinja2 templating characters:\n%s" % self._expression)
+        if self._compiled is None:
+            raise RuntimeError("Expression must not contain Jinja2 templating characters:\n%s" % self._expression)
+
+        try:
+            return bool(self._compiled(context.variables.last(), env=os.environ))
+        except UndefinedError as exception:
+            LOGGER.error("evaluate(undefined): %s", exception)
+            raise
+
+
+class TemplateCache(object):
+    """A bounded, thread-safe, least-recently-used cache of compiled templates; keyed by source text.
+
+    The `compiler` callable produces the compiled object for a source text upon a cache miss.
+    """
+
+    def __init__(self, compiler, maxsize=DEFAULT_CACHE_SIZE):
+        """Ctor."""
+        self._compiler = compiler
+        self._maxsize = maxsize
+        self._templates = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, source):
+        """Return the compiled template for `source`, compiling it upon a cache miss."""
+        with self._lock:
+            template = self._templates.pop(source, None)
+            if template is not None:
+                self._templates[source] = template
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        # compile outside of the lock; a concurrent miss on the same source merely compiles twice.
+        template = self._compiler(source)
+
+        with self._lock:
+            self._templates[source] = template
+            while len(self._templates) > self._maxsize:
+                self._templates.popitem(last=False)
+                self.evictions += 1
+
+        return template
+
+    def clear(self):
+        """Remove all compiled templates and reset the statistics."""
+        with self._lock:
+            self._templates.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """Return a dictionary of cache statistics."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._templates),
+                'maxsize': self._maxsize,
+            }
+
+
+#: The vetted, compiled code objects of :py:func:`my_safe_eval`; keyed by expression text.
+_SAFE_EVAL_CACHE = TemplateCache(_compile_safe_expression)
+
+
+def safe_eval_cache_info():
+    """Return the statistics of the :py:func:`my_safe_eval` code object cache."""
+    return _SAFE_EVAL_CACHE.info()
+
+
+@pass_context
+def _finalize(context, value):
+    """Our internal Jinja2 finalizer; which recursively renders."""
+    return _finalize_value(context.environment, value, context.parent)
+
+
+def _finalize_value(environment, value, variables):
+    """Recursively render a printed `value` which is itself a template."""
+    if isinstance(value, string_types) and any(x in value for x in ['{{', '}}', '{%', '%}']):
+        if RAW_SENTINEL in value:
+            value = value.replace(RAW_SENTINEL, '')
+            value = RAW_REGEXP.sub(('{%% raw %%}%s' % RAW_SENTINEL), value)
+            return value
+
+        expansions = getattr(_STATE, 'expansions', None)
+        if expansions is not None and value not in expansions.keyed:
+            # e.g. built by an expression; so the variables it uses are not within the memo key.
+            expansions.unkeyed = True
+
+        value = RAW_REGEXP.sub(('{%% raw %%}%s' % RAW_SENTINEL), value)
+
+        generation = getattr(_STATE, 'generation', None)
+        if generation is None or isinstance(environment, NativeEnvironment):
+            return environment.template_cache.get(value).render(variables)
+
+        key = (value, generation)
+        expanded = EXPANSION_MEMO.get(key)
+        if expanded is None:
+            expanded = _expand(environment, value, variables)
+            if expanded is not None:
+                EXPANSION_MEMO.set(key, expanded)
+            else:
+                expanded = environment.template_cache.get(value).render(variables)
+        value = expanded
+    return value
+
+
+def _expand(environment, value, variables):
+    """Expand a variable's templated `value`; or return `None` when the expansion must not be memoized."""
+    texts = []
+    key = _memo_key(environment, value, variables, texts)
+    if key is None:
+        return None
+
+    key = ('expansion',) + key
+    expanded = RENDER_MEMO.get(key)
+    if expanded is None:
+        with _tracking_expansions(texts) as expansions:
+            expanded = environment.template_cache.get(value).render(variables)
+        if not expansions.unkeyed:
+            RENDER_MEMO.set(key, expanded)
+    return expanded
+
+
+class _Expansions(object):
+    """The template strings covered by the memo key of a render; and whether the render expanded any other."""
+
+    __slots__ = ('keyed', 'unkeyed')
+
+    def __init__(self, keyed):
+        """Ctor."""
+        self.keyed = frozenset(keyed)
+        self.unkeyed = False
+
+
+@contextlib.contextmanager
+def _tracking_expansions(keyed):
+    """Track the templates expanded by a memoized render; whose output must not be stored when any is not `keyed`."""
+    previous = getattr(_STATE, 'expansions', None)
+    expansions = _STATE.expansions = _Expansions(keyed)
+    try:
+        yield expansions
+    finally:
+        _STATE.expansions = previous
+        if previous is not None and expansions.unkeyed:
+            previous.unkeyed = True
+
+
+class DirectoryBytecodeCache(BytecodeCache):
+    """A Jinja2 bytecode cache persisted in a size-bounded directory; keyed by the template's source hash."""
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        """Ctor."""
+        self._cache = DirectoryCache(directory, max_size)
+
+    def load_bytecode(self, bucket):
+        """Load the bucket's bytecode from disk, if present."""
+        data = self._cache.get(bucket.key)
+        if data is not None:
+            bucket.bytecode_from_string(data)
+
+    def dump_bytecode(self, bucket):
+        """Persist the bucket's bytecode to disk."""
+        self._cache.set(bucket.key, bucket.bytecode_to_string())
+
+    def clear(self):
+        """Remove all persisted bytecode."""
+        self._cache.clear()
+
+
+class SharedEnvironment(Environment):
+    """A process-wide Jinja2 environment, owning caches of its compiled templates and expressions.
+
+    When `template_cache` names a directory, compiled template bytecode is also persisted there
+    and shared with other processes.
+    """
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, template_cache=None, template_cache_size=DEFAULT_MAX_SIZE, **options):
+        """Ctor."""
+        if template_cache:
+            options['bytecode_cache'] = DirectoryBytecodeCache(template_cache, template_cache_size)
+
+        super(SharedEnvironment, self).__init__(autoescape=False, undefined=StrictUndefined,
+                                                finalize=_finalize, **options)  # nosec
+        self.filters['render'] = render
+        self.template_cache = TemplateCache(self._compile_template, cache_size)
+        self.expression_cache = TemplateCache(self._compile_boolean_expression, cache_size)
+        self.dependency_cache = TemplateCache(self._analyse_dependencies, cache_size)
+
+    def _analyse_dependencies(self, source):
+        """Return the names a template references; or `None` when its output must never be memoized."""
+        ast = self.parse(source)
+        for node in ast.find_all(nodes.Filter):
+            if node.name in NON_DETERMINISTIC_FILTERS:
+                return None
+        return frozenset(meta.find_undeclared_variables(ast))
+
+    def _compile_template(self, source):
+        if self.bytecode_cache is None:
+            return self.from_string(source)
+
+        key = hashlib.sha1(source.encode('utf-8')).hexdigest()  # nosec
+        bucket = self.bytecode_cache.get_bucket(self, key, None, source)
+        if bucket.code is None:
+            bucket.code = self.compile(source)
+            self.bytecode_cache.set_bucket(bucket)
+
+        return self.template_class.from_code(self, bucket.code, self.make_globals(None))
+
+    def _compile_boolean_expression(self, source):
+        return self.compile_expression(source, undefined_to_none=False)
+
+
+class RenderMemo(object):
+    """A bounded, thread-safe, least-recently-used memo of rendered output.
+
+    Keys are a template's source text, plus the frozen values of only those variables the
+    template (transitively) references.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MEMO_SIZE, maxlength=DEFAULT_MEMO_LENGTH):
+        """Ctor."""
+        self._maxsize = maxsize
+        self._maxlength = maxlength
+        self._length = 0
+        self._outputs = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the memoized output for `key`; otherwise `None`."""
+        with self._lock:
+            output = self._outputs.pop(key, None)
+            if output is None:
+                self.misses += 1
+                return None
+            self._outputs[key] = output
+            self.hits += 1
+            return output
+
+    def set(self, key, output):
+        """Memoize `output` under `key`, evicting the least-recently-used outputs as necessary."""
+        if len(output) > self._maxlength:
+            return
+
+        with self._lock:
+            previous = self._outputs.pop(key, None)
+            if previous is not None:
+                self._length -= len(previous)
+            self._outputs[key] = output
+            self._length += len(output)
+            while len(self._outputs) > self._maxsize or self._length > self._maxlength:
+                _, evicted = self._outputs.popitem(last=False)
+                self._length -= len(evicted)
+
+    def clear(self):
+        """Forget all memoized outputs and reset the statistics."""
+        with self._lock:
+            self._outputs.clear()
+            self._length = 0
+            self.hits = self.misses = 0
+
+    def info(self):
+        """Return a dictionary of memo statistics."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._outputs),
+                'length': self._length,
+            }
+
+
+#: The run-scoped memo of rendered output; cleared upon the start of each pipeline execution.
+RENDER_MEMO = RenderMemo()
+
+#: The run-scoped memo of variable values expanded by the finalizer; keyed by value and scope generation.
+EXPANSION_MEMO = RenderMemo()
+
+#: Per-thread rendering state; namely the generation of the variable scope being rendered.
+_STATE = threading.local()
+
+
+def clear_memos():
+    """Forget all memoized output; performed upon the start of each pipeline execution."""
+    RENDER_MEMO.clear()
+    EXPANSION_MEMO.clear()
+
+
+_MISSING = object()
+
+
+class RenderProfile(object):
+    """Optional, per-template profiling counters of :py:func:`render` and friends.
+
+    For each distinct template source, records its call count, total and maximum
+    render time, and total output size. Disabled by default.
+    """
+
+    def __init__(self):
+        """Ctor."""
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._templates = {}
+
+    def record(self, source, elapsed, size):
+        """Record one render of `source`, taking `elapsed` seconds and producing `size` characters."""
+        with self._lock:
+            entry = self._templates.get(source)
+            if entry is None:
+                self._templates[source] = [1, elapsed, elapsed, size]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] = max(entry[2], elapsed)
+                entry[3] += size
 
-        template = "{%%- if %s %%}True{%% else %%}False{%% endif -%%}" % self._expression
-        result = render(template, **context.variables.last().copy())
+    def clear(self):
+        """Forget all recorded renders."""
+        with self._lock:
+            self._templates.clear()
 
-        if result == 'True':
-            return True
-        elif result == 'False':
-            return False
+    def report(self, limit=None):
+        """Return a list of per-template statistics, most total render time first."""
+        with self._lock:
+            entries = [{
+                'template': source,
+                'calls': calls,
+                'total': total,
+                'max': maximum,
+                'size': size,
+            } for source, (calls, total, maximum, size) in self._templates.items()]
 
-        raise RuntimeError("Jinja2 returned an invalid result for expression:\n%s" % self._expression)  # noqa: no-coverage
+        entries.sort(key=lambda entry: entry['total'], reverse=True)
+        return entries[:limit] if limit is not None else entries
+
+
+#: The process-wide render profile; see :py:class:`RenderProfile`.
+RENDER_PROFILE = RenderProfile()
+
+
+class _Unfreezable(Exception):
+    pass
+
+
+def _freeze(value, nested, budget):
+    """Produce a hashable equivalent of `value`; collecting any nested template strings into `nested`.
+
+    Each value frozen spends one of the remaining `budget`, a single element list; once spent, the
+    value is too large to be worth memoizing on.
+    """
+    budget[0] -= 1
+    if budget[0] < 0:
+        raise _Unfreezable()
+    if isinstance(value, string_types):
+        if any(marker in value for marker in TEMPLATE_MARKERS):
+            nested.append(value)
+        return (type(value), value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return (type(value), value)
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(x, nested, budget) for x in value))
+    if isinstance(value, (dict, Mapping)):
+        # e.g. a registered :py:class:`deployer.result.Result`.
+        return (type(value), tuple((_freeze(k, nested, budget), _freeze(v, nested, budget)) for k, v in value.items()))
+    raise _Unfreezable()
+
+
+def _memo_key(environment, source, variables, texts=None):
+    """Return the memo key of rendering `source` with `variables`; or `None` when it must not be memoized.
+
+    The template strings held by the variables, and so covered by the key, are appended to `texts`.
+    """
+    try:
+        pending = environment.dependency_cache.get(source)
+        if pending is None:
+            return None
+        pending = list(pending)
+
+        seen = set()
+        frozen = []
+        budget = [MEMO_KEY_MAX_ITEMS]
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+
+            if name not in variables:
+                if name in environment.globals:
+                    return None
+                frozen.append((name, _MISSING))
+                continue
+            if name == 'env':
+                # the process environment is mutable, by plug-ins and programs alike.
+                return None
+
+            nested = []
+            frozen.append((name, _freeze(variables[name], nested, budget)))
+            if texts is not None:
+                texts.extend(nested)
+            for text in nested:
+                names = environment.dependency_cache.get(text)
+                if names is None:
+                    return None
+                pending.extend(names)
+    except (_Unfreezable, TemplateSyntaxError):
+        return None
+
+    frozen.sort(key=operator.itemgetter(0))
+    return (source, tuple(frozen))
+
+
+class NativeSharedEnvironment(SharedEnvironment, NativeEnvironment):
+    """A process-wide Jinja2 environment, whose templates render native Python types."""
+
+
+_ENVIRONMENTS = {}
+_ENVIRONMENTS_LOCK = threading.Lock()
+_DEFAULT_OPTIONS = None
+
+
+def configure(**options):
+    """Set the configuration of the default shared environment; such as its `template_cache` directory.
+
+    Without an explicit configuration, the ``DEPLOYER_TEMPLATE_CACHE`` environment variable is honored.
+    """
+    global _DEFAULT_OPTIONS
+    _DEFAULT_OPTIONS = dict((k, v) for k, v in options.items() if v is not None)
+
+
+def get_environment(**options):
+    """Return the shared environment for the given configuration, creating it upon first use.
+
+    A `native` environment is never configured with the persistent `template_cache`.
+    """
+    if not options:
+        if _DEFAULT_OPTIONS is None:
+            configure(template_cache=os.environ.get(TEMPLATE_CACHE_ENVVAR) or None)
+        options = _DEFAULT_OPTIONS
+
+    key = tuple(sorted(options.items()))
+    with _ENVIRONMENTS_LOCK:
+        environment = _ENVIRONMENTS.get(key)
+        if environment is None:
+            factory = NativeSharedEnvironment if options.get('native') else SharedEnvironment
+            environment = _ENVIRONMENTS[key] = factory(**dict((k, v) for k, v in options.items() if k != 'native'))
+    return environment
+
+
+def cache_info(**options):
+    """Return the compiled-template cache statistics of the shared environment."""
+    return get_environment(**options).template_cache.info()
+
+
+def classify(value):
+    """Classify a templated value as a literal, a simple variable reference or a full template."""
+    if not isinstance(value, string_types):
+        return TEMPLATE
+
+    if not any(marker in value for marker in TEMPLATE_MARKERS):
+        return LITERAL
+
+    remainder = VARIABLE_REGEXP.sub('', value)
+    if any(marker in remainder for marker in TEMPLATE_MARKERS):
+        return TEMPLATE
+
+    for match in VARIABLE_REGEXP.finditer(value):
+        if match.group(1).split('.', 1)[0] in RESERVED_NAMES:
+            return TEMPLATE
+
+    return VARIABLE
+
+
+def _literal(value):
+    """Produce the output Jinja2 would render for a literal; normalizing newlines as it does."""
+    lines = NEWLINE_REGEXP.split(value)[::2]
+    if lines[-1] == '':
+        del lines[-1]
+    return '\n'.join(lines)
+
+
+def _compile_interpolation(source):
+    """Split a simple variable reference template into literal text and attribute lookup paths.
+
+    Returns `None` for any other kind of template; which Jinja2 must render.
+    """
+    if classify(source) != VARIABLE:
+        return None
+
+    source = _literal(source)
+    globals_ = get_environment().globals
+    parts = []
+    position = 0
+    for match in VARIABLE_REGEXP.finditer(source):
+        path = tuple(match.group(1).split('.'))
+        if path[0] in globals_:
+            # e.g. ``range``, which Jinja2 falls back to its globals for.
+            return None
+        if match.start() > position:
+            parts.append((source[position:match.start()], None))
+        parts.append((None, path))
+        position = match.end()
+    if position < len(source):
+        parts.append((source[position:], None))
+
+    return tuple(parts)
+
+
+#: The pre-compiled interpolations of simple variable reference templates; keyed by source text.
+_INTERPOLATIONS = TemplateCache(_compile_interpolation)
+
+
+def _lookup(environment, path, variables):
+    """Resolve an attribute lookup path, exactly as a Jinja2 template would."""
+    name = path[0]
+    if name == 'env':
+        value = os.environ
+    elif name in variables:
+        value = variables[name]
+    elif name in environment.globals:
+        value = environment.globals[name]
+    else:
+        value = environment.undefined(name=name)
+
+    for attribute in path[1:]:
+        value = environment.getattr(value, attribute)
+
+    return value
+
+
+def _interpolate(parts, variables):
+    """Render a pre-compiled interpolation; producing output identical to Jinja2's."""
+    environment = get_environment()
+    output = []
+    for text, path in parts:
+        if path is None:
+            output.append(text)
+        else:
+            output.append(text_type(_finalize_value(environment, _lookup(environment, path, variables), variables)))
+
+    _count('interpolations')
+    output = ''.join(output)
+    if RAW_SENTINEL in output:
+        output = output.replace(RAW_SENTINEL, '')
+    return output
+
+
+class Renderable(object):
+    """A templated field of a plug-in, classified once when the plug-in is built.
+
+    Literals are pre-computed and bypass Jinja2 entirely.
+    """
+
+    def __init__(self, source):
+        """Ctor."""
+        self.source = source
+        self.kind = classify(source)
+        self.needs_rendering = self.kind != LITERAL
+        self._output = None if self.needs_rendering else _literal(source)
+        self._primed = {}
+
+    def prime(self, scopes):
+        """Render against each of the `scopes`, in a single pass, ahead of their use.
+
+        A later :py:meth:`render` against a primed scope re-uses its output, for as long
+        as the scope remains unchanged. Output which depends upon the process environment,
+        or which fails to render, is left to be rendered when it is used.
+        """
+        self._primed = {}
+        if not self.needs_rendering:
+            return
+
+        environment = get_environment()
+        source = self.source
+        parts = _INTERPOLATIONS.get(source)
+        try:
+            if parts is None:
+                if 'raw' in source:
+                    source = RAW_REGEXP.sub(('{%% raw %%}%s' % RAW_SENTINEL), source)
+                template = environment.template_cache.get(source)
+        except TemplateSyntaxError:
+            return
+
+        start = default_timer()
+        primed = {}
+        for scope in scopes:
+            kwargs = dict(scope)
+            kwargs['env'] = os.environ
+            if _memo_key(environment, self.source, kwargs) is None:
+                continue
+
+            try:
+                with _scope_generation(scope.generation):
+                    output = _interpolate(parts, kwargs) if parts is not None else template.render(kwargs)
+            except Exception:
+                continue
+
+            if RAW_SENTINEL in output:
+                output = output.replace(RAW_SENTINEL, '')
+            primed[scope.generation] = output
+
+        _count('renders_primed', len(primed))
+        if RENDER_PROFILE.enabled and primed:
+            RENDER_PROFILE.record(self.source, default_timer() - start, sum(len(output) for output in primed.values()))
+        self._primed = primed
+
+    def _take_primed(self, variables):
+        if not self._primed:
+            return None
+        output = self._primed.pop(getattr(variables, 'generation', None), None)
+        if output is not None:
+            _count('primed_hits')
+        return output
+
+    def render(self, variables):
+        """Render against the `variables` mapping of the current scope."""
+        if not self.needs_rendering:
+            _count('renders_avoided')
+            return self._output
+        output = self._take_primed(variables)
+        if output is not None:
+            return output
+        return _render(self.source, dict(variables), getattr(variables, 'generation', None))
+
+    def render_to(self, stream, variables):
+        """Render against the `variables` mapping of the current scope, writing the output to `stream`."""
+        if not self.needs_rendering:
+            _count('renders_avoided')
+            stream.write(self._output)
+            return
+
+        output = self._take_primed(variables)
+        if output is not None:
+            stream.write(output)
+        else:
+            _render_to(stream, self.source, dict(variables), getattr(variables, 'generation', None))
+
+    def evaluate(self, variables):
+        """Evaluate against the `variables` mapping of the current scope, producing a native Python object."""
+        if not self.needs_rendering:
+            _count('renders_avoided')
+            return my_safe_eval(self._output)
+        return _render_native(self.source, dict(variables), getattr(variables, 'generation', None))
+
+    def __repr__(self):
+        """Get the string representation of the object."""
+        return 'Renderable(%r, kind=%r)' % (self.source, self.kind)
 
 
 def render(value, **kwargs):
@@ -150,34 +886,59 @@ def render(value, **kwargs):
     wouldn't help. Usually a pipeline runs in a isolated environment
     and there should not be any injection from outside; that's why: nosec.
     """
-    raw_sentinal = 'Z6db7f9f90d8c7519dcbb6ac0dd828a0f2a8ab18a34ab8b0cae0fb6c0469a1e19Z'
-    raw_regexp = re.compile(r"\{%\s*raw\s*%\}")
-    environment = None
-
-    def finalize(value):
-        """Our internal Jinja2 finalizer; which recursively renders."""
-        if isinstance(value, string_types) and any(x in value for x in ['{{', '}}', '{%', '%}']):
-            if raw_sentinal in value:
-                value = value.replace(raw_sentinal, '')
-                value = raw_regexp.sub(('{%% raw %%}%s' % raw_sentinal), value)
-                return value
-
-            value = raw_regexp.sub(('{%% raw %%}%s' % raw_sentinal), value)
-            value = environment.from_string(value).render(kwargs)
-        return value
+    return _render(value, kwargs)
+
+
+def _render(value, kwargs, generation=None):
+    if not RENDER_PROFILE.enabled:
+        return _render_template(value, kwargs, generation)
+
+    start = default_timer()
+    rendered_value = _render_template(value, kwargs, generation)
+    RENDER_PROFILE.record(value, default_timer() - start, len(rendered_value))
+    return rendered_value
 
+
+@contextlib.contextmanager
+def _scope_generation(generation):
+    """Expose the generation of the variable scope being rendered to the finalizer."""
+    previous = getattr(_STATE, 'generation', None)
+    _STATE.generation = generation
     try:
-        environment = Environment(autoescape=False, undefined=StrictUndefined, finalize=finalize)  # nosec
-        environment.filters['render'] = render
+        yield
+    finally:
+        _STATE.generation = previous
+
 
+def _render_template(value, kwargs, generation):
+    try:
         kwargs['env'] = os.environ
 
+        parts = _INTERPOLATIONS.get(value) if isinstance(value, string_types) else None
+        if parts is not None:
+            with _scope_generation(generation):
+                return _interpolate(parts, kwargs)
+
         if isinstance(value, string_types) and 'raw' in value:
-            value = raw_regexp.sub(('{%% raw %%}%s' % raw_sentinal), value)
+            value = RAW_REGEXP.sub(('{%% raw %%}%s' % RAW_SENTINEL), value)
+
+        environment = get_environment()
+        template = environment.template_cache.get(value)
+
+        texts = []
+        key = _memo_key(environment, value, kwargs, texts)
+        if key is not None:
+            rendered_value = RENDER_MEMO.get(key)
+            if rendered_value is not None:
+                return rendered_value
+
+        with _scope_generation(generation), _tracking_expansions(texts) as expansions:
+            rendered_value = template.render(kwargs)
+        if RAW_SENTINEL in rendered_value:
+            rendered_value = rendered_value.replace(RAW_SENTINEL, '')
 
-        rendered_value = environment.from_string(value).render(kwargs)
-        if raw_sentinal in rendered_value:
-            rendered_value = rendered_value.replace(raw_sentinal, '')
+        if key is not None and not expansions.unkeyed:
+            RENDER_MEMO.set(key, rendered_value)
 
         return rendered_value
     except UndefinedError as exception:
@@ -186,3 +947,90 @@ def render(value, **kwargs):
     except TemplateSyntaxError as exception:
         LOGGER.error("render(syntax error): %s", exception)
         raise
+
+
+def render_to(stream, value, **kwargs):
+    """Use Jinja2 for recursive, template-based rendering; writing each generated chunk to `stream`.
+
+    The complete output is never held in memory; see :py:func:`render`.
+    """
+    _render_to(stream, value, kwargs)
+
+
+def _render_to(stream, value, kwargs, generation=None):
+    source = value
+    size = 0
+    start = default_timer()
+    try:
+        kwargs['env'] = os.environ
+
+        if isinstance(value, string_types) and 'raw' in value:
+            value = RAW_REGEXP.sub(('{%% raw %%}%s' % RAW_SENTINEL), value)
+
+        parts = _INTERPOLATIONS.get(value) if isinstance(value, string_types) else None
+        with _scope_generation(generation):
+            if parts is not None:
+                chunks = [_interpolate(parts, kwargs)]
+            else:
+                chunks = get_environment().template_cache.get(value).generate(kwargs)
+
+            for chunk in chunks:
+                if RAW_SENTINEL in chunk:
+                    chunk = chunk.replace(RAW_SENTINEL, '')
+                stream.write(chunk)
+                size += len(chunk)
+    except UndefinedError as exception:
+        LOGGER.error("render(undefined): %s", exception)
+        raise
+    except TemplateSyntaxError as exception:
+        LOGGER.error("render(syntax error): %s", exception)
+        raise
+
+    if RENDER_PROFILE.enabled:
+        RENDER_PROFILE.record(source, default_timer() - start, size)
+
+
+def render_native(value, **kwargs):
+    """Use Jinja2 to evaluate a template into the native Python object it produces.
+
+    Such as a list, for a ``with_items`` of ``{{ items }}``; avoiding a round trip through text.
+    Whenever the result is text, it is rendered and safely evaluated exactly as before.
+    """
+    return _render_native(value, kwargs)
+
+
+def _render_native(value, kwargs, generation=None):
+    if isinstance(value, string_types) and 'raw' not in value:
+        kwargs['env'] = os.environ
+
+        parts = _INTERPOLATIONS.get(value)
+        if parts is not None and len(parts) == 1:
+            # a lone variable reference; its value is the native result.
+            try:
+                result = _lookup(get_environment(), parts[0][1], kwargs)
+                if isinstance(result, Undefined):
+                    str(result)
+            except UndefinedError as exception:
+                LOGGER.error("render(undefined): %s", exception)
+                raise
+            if not isinstance(result, string_types):
+                _count('interpolations')
+                return result
+
+        start = default_timer()
+        try:
+            result = get_environment(native=True).template_cache.get(value).render(kwargs)
+        except UndefinedError as exception:
+            LOGGER.error("render(undefined): %s", exception)
+            raise
+        except TemplateSyntaxError as exception:
+            LOGGER.error("render(syntax error): %s", exception)
+            raise
+
+        if RENDER_PROFILE.enabled:
+            RENDER_PROFILE.record(value, default_timer() - start, len(result) if hasattr(result, '__len__') else 0)
+
+        if not isinstance(result, string_types):
+            return result
+
+    return my_safe_eval(_render(value, kwargs, generation))
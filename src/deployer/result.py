@@ -22,13 +22,120 @@ A module holding the results of all plug-ins.
 :license: Apache License 2.0, see LICENSE.txt for full details.
 """
 
+import enum
 
-class Result(dict):
-    """Represents the resultant of a plug-in's execution."""
+import six
+from six.moves.collections_abc import MutableMapping
+
+
+class Status(str, enum.Enum):
+    """The outcome of a plug-in's execution; equal to, and rendered as, its string value."""
+
+    SUCCESS = 'success'
+    FAILURE = 'failure'
+    SKIPPED = 'skipped'
+    CONTINUE = 'continue'
+
+    def __str__(self):
+        """Get the string value."""
+        return self.value
+
+    def __format__(self, spec):
+        """Format the string value."""
+        return format(self.value, spec)
+
+    def __repr__(self):
+        """Get the representation of the string value; as logged before statuses were enumerated."""
+        return repr(self.value)
+
+
+_STATUSES = dict((status.value, status) for status in Status)
+
+
+class Result(MutableMapping):
+    """Represents the resultant of a plug-in's execution.
+
+    A compact, fixed-layout object; the outcome is held as a :py:class:`Status`. It still behaves as the
+    mapping it used to be, holding the ``result`` and ``stdout`` keys, so templates may use either
+    ``registered.stdout`` or ``registered['stdout']``. Any other key is kept aside, in a dictionary
+    created only when needed.
+
+    Unlike in earlier releases, a result is not a :py:class:`dict`; so ``isinstance(result, dict)`` no
+    longer holds, and serializing a result with :py:mod:`json` requires ``dict(result)`` first.
+    """
+
+    __slots__ = ('result', 'stdout', '_extra')
+
+    _FIELDS = ('result', 'stdout')
+
+    def __init__(self, *args, **kwargs):
+        """Ctor; accepting the same arguments as :py:class:`dict`."""
+        self._extra = None
+        if args or len(kwargs) != 1 or 'result' not in kwargs:
+            self.update(*args, **kwargs)
+        else:
+            self['result'] = kwargs['result']
+
+    def __getitem__(self, key):
+        """Get the value of `key`."""
+        if key in Result._FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        """Set the value of `key`."""
+        if key == 'result':
+            self.result = _STATUSES.get(value, value) if isinstance(value, six.string_types) else value
+        elif key == 'stdout':
+            self.stdout = value
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        """Remove the `key`."""
+        if key in Result._FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        for key in Result._FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            for key in self._extra:
+                yield key
+
+    def __len__(self):
+        """Get the number of keys."""
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        """Determine if `key` is present."""
+        if key in Result._FIELDS:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __repr__(self):
+        """Get the string representation of this result."""
+        return 'Result(%r)' % dict((key, str(value) if isinstance(value, Status) else value) for key, value in self.items())
 
     def __bool__(self):
         """Cast to boolean."""
-        return self['result'] != 'failure' and self['result'] != 'continue'
+        return self.result is not Status.FAILURE and self.result is not Status.CONTINUE
 
     def __nonzero__(self):
         """Cast to boolean."""
@@ -38,14 +145,18 @@ class Result(dict):
         """Return our `stdout` if present, otherwise returns the `result` value."""
         return self['stdout'] if 'stdout' in self else str(self['result'])
 
+    def copy(self):
+        """Return a shallow copy of this result."""
+        return Result(self)
+
     def failed(self):
         """Determine if the resultant is a failure."""
-        return self['result'] == 'failure'  # noqa: no-cover
+        return self.result is Status.FAILURE  # noqa: no-cover
 
     def succeeded(self):
         """Determine if the resultant is a success."""
-        return self['result'] != 'failure'  # noqa: no-cover
+        return self.result is not Status.FAILURE  # noqa: no-cover
 
     def skipped(self):
         """Determine if the resultant was skipped."""
-        return self['result'] == 'skipped'  # noqa: no-cover
+        return self.result is Status.SKIPPED  # noqa: no-cover
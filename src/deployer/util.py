@@ -29,9 +29,12 @@ from __future__ import print_function
 import errno
 import logging
 import sys
+import threading
 from collections import deque
 from io import BytesIO
 
+import six
+from six.moves import queue
 from twisted.internet import defer
 from twisted.internet.defer import Deferred
 from twisted.internet.error import ProcessDone
@@ -58,6 +61,51 @@ def merge_dicts(*dict_args):
     return result
 
 
+def iterate_in_background(iterable, maxsize=256):
+    """Yield the items of `iterable`, produced ahead of the consumer by a background thread.
+
+    At most `maxsize` items are buffered. An exception raised while producing is
+    re-raised to the consumer, in its turn; and abandoning the iteration stops the producer.
+    """
+    items = queue.Queue(maxsize)
+    stopped = threading.Event()
+    end = object()
+
+    def _put(entry):
+        while not stopped.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce():
+        try:
+            for item in iterable:
+                if not _put((item, None)):
+                    return
+        except Exception:
+            _put((end, sys.exc_info()))
+        else:
+            _put((end, None))
+
+    producer = threading.Thread(target=_produce, name='deployer-prefetch')
+    producer.daemon = True
+    producer.start()
+
+    try:
+        while True:
+            item, exc_info = items.get()
+            if item is end:
+                if exc_info is not None:
+                    six.reraise(*exc_info)
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
 class FailureLoggingSubprocessProtocol(ProcessProtocol):
     """Simple Twisted protocol which logs a process'es output."""
 
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compiled plug-in schemas, and structured reporting of why a pipeline node is invalid.
+
+.. moduleauthor:: Joseph Benden <joe@benden.us>
+
+:copyright: (c) Copyright 2018 by Joseph Benden.
+:license: Apache License 2.0, see LICENSE.txt for full details.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import re
+from collections import namedtuple
+
+import six
+from schema import And
+from schema import Optional
+from schema import Or
+from schema import Schema
+from schema import SchemaError
+
+try:
+    from schema import Literal                                 # noqa: no-cover
+except ImportError:                                            # noqa: no-cover
+    Literal = ()                                               # noqa: no-cover
+
+_KEY_ERROR = re.compile(r"^Key (.+) error:$")
+_WRONG_KEY = re.compile(r"^Wrong keys? (.+?) in ")
+
+
+class ValidationError(namedtuple('ValidationError', ['path', 'message'])):
+    """The reason a node is invalid; with the `path` of keys and list indices leading to the offending value."""
+
+    __slots__ = ()
+
+    def __str__(self):
+        """Get a string representation of this error."""
+        return "%s: %s" % (format_path(self.path) or '<document>', self.message)
+
+
+def format_path(path):
+    """Format a `path` of keys and list indices; e.g. ``[0].stage.tasks[1].shell``."""
+    parts = []
+    for part in path:
+        if isinstance(part, six.integer_types):
+            parts.append('[%d]' % part)
+        else:
+            parts.append(('.%s' if parts else '%s') % part)
+    return ''.join(parts)
+
+
+def _fallback(schema):
+    return Schema(schema).is_valid
+
+
+def _compile_type(schema):
+    if schema is int:
+        return lambda value: isinstance(value, int) and not isinstance(value, bool)
+    return lambda value: isinstance(value, schema)
+
+
+def _compile_iterable(schema):
+    container = type(schema)
+    elements = [_compile(element) for element in schema]
+    return lambda value: isinstance(value, container) and all(any(check(item) for check in elements) for item in value)
+
+
+def _compile_dict(schema):
+    # keys are matched in the same order as `schema.Schema`; a key is taken by the first
+    # schema key matching it, and only then must its value match that key's value schema.
+    entries = []
+    required = set()
+    for skey in sorted(schema, key=Schema._dict_key_priority):
+        if type(skey) is Optional:
+            check_key = _compile(skey._schema)
+        elif isinstance(skey, Schema):
+            return _fallback(schema)
+        else:
+            check_key = _compile(skey)
+            required.add(skey)
+        entries.append((skey, check_key, _compile(schema[skey])))
+
+    def check(value):
+        if not isinstance(value, dict):
+            return False
+        covered = set()
+        for key, item in value.items():
+            for skey, check_key, check_value in entries:
+                if check_key(key):
+                    if not check_value(item):
+                        return False
+                    covered.add(skey)
+                    break
+            else:
+                return False
+        return required.issubset(covered)
+
+    return check
+
+
+def _compile_callable(schema):
+    def check(value):
+        try:
+            return bool(schema(value))
+        except Exception:  # noqa: E722
+            return False
+
+    return check
+
+
+def _compile(schema):
+    """Compile the `schema` into a predicate, accepting exactly the values :py:class:`schema.Schema` accepts."""
+    if type(schema) in (list, tuple, set, frozenset):
+        return _compile_iterable(schema)
+    if isinstance(schema, dict):
+        return _compile_dict(schema)
+    if issubclass(type(schema), type):
+        return _compile_type(schema)
+    if type(schema) in (And, Or):
+        if getattr(schema, 'only_one', False) or schema._ignore_extra_keys or schema._schema_class is not Schema:
+            return _fallback(schema)
+        checks = [_compile(argument) for argument in schema._args]
+        if type(schema) is And:
+            return lambda value: all(check(value) for check in checks)
+        return lambda value: any(check(value) for check in checks)
+    if type(schema) is Schema and not schema._ignore_extra_keys:
+        return _compile(schema._schema)
+    if hasattr(schema, 'validate') or isinstance(schema, Literal):
+        # e.g. `Use`, `Regex` or `Hook`; validated by ``schema`` itself.
+        return _fallback(schema)
+    if callable(schema):
+        return _compile_callable(schema)
+    return lambda value: schema == value
+
+
+class CompiledSchema(object):
+    """A validator of a schema, compiled once into plain predicates; see :py:func:`compile_schema`.
+
+    Only deciding validity is compiled. The errors of an invalid value, and the validated
+    data, are still produced by :py:class:`schema.Schema`.
+    """
+
+    def __init__(self, schema):
+        """Ctor."""
+        self.schema = schema if isinstance(schema, Schema) else Schema(schema)
+        self._check = _compile(schema)
+
+    def is_valid(self, value):
+        """Return whether the `value` is valid."""
+        return self._check(value)
+
+    def validate(self, value):
+        """Return the validated `value`; otherwise raise :py:class:`schema.SchemaError`."""
+        return self.schema.validate(value)
+
+
+def compile_schema(schema):
+    """Return a reusable :py:class:`CompiledSchema` of `schema`."""
+    return schema if isinstance(schema, CompiledSchema) else CompiledSchema(schema)
+
+
+def _find_key(value, text):
+    """Return the key of the mapping `value` whose representation is `text`; otherwise `None`."""
+    if isinstance(value, dict):
+        for key in value:
+            if repr(key) == text:
+                return key
+    return None
+
+
+def _describe(error, value):
+    """Translate a :py:class:`schema.SchemaError` of `value` into the path, relative to `value`, and message."""
+    path = ()
+    message = None
+    for auto in error.autos:
+        if auto is None:
+            continue
+
+        match = _KEY_ERROR.match(auto)
+        key = _find_key(value, match.group(1)) if match else None
+        if key is not None:
+            path += (key,)
+            value = value[key]
+            continue
+
+        match = _WRONG_KEY.match(auto)
+        key = _find_key(value, match.group(1)) if match else None
+        if key is not None:
+            path += (key,)
+        message = auto
+
+    custom = [text for text in error.errors if text is not None]
+    return path, custom[-1] if custom else message or str(error)
+
+
+def schema_errors(validator, value, path=()):
+    """Return a list holding the :py:class:`ValidationError` of `value` against the `validator`; empty when valid.
+
+    The errors are only determined when the compiled check fails, so validating a valid value costs
+    no more than :py:meth:`CompiledSchema.is_valid`.
+    """
+    if validator.is_valid(value):
+        return []
+
+    try:
+        validator.validate(value)
+    except SchemaError as e:
+        relative, message = _describe(e, value)
+        return [ValidationError(tuple(path) + relative, message)]
+    return []
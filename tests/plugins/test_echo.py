@@ -28,7 +28,9 @@ from deployer.cli import initialize
 from deployer.context import Context
 from deployer.plugins import Fail
 from deployer.plugins import TopLevel
+from deployer.plugins import plugin_proxy
 from deployer.plugins.echo import Echo
+from deployer.rendering import statistics
 
 
 def test_plugin_fail_invalid():
@@ -273,3 +275,50 @@ def test_plugin_fail_fails_rendering_multiple_items_without_a_context(caplog):
 
     assert_that(len(caplog.records), equal_to(5))
     assert_that(caplog.text, contains_string("{{ item }}"))
+
+
+def test_plugin_echo_pre_renders_multiple_items(caplog):
+    stream = StringIO('''
+    - name: test0
+      echo: "{{ item | upper }} of {{ args | length }}"
+      with_items:
+        - a-0
+        - b-0
+        - c-0
+    ''')
+    document = loader.ordered_load(stream)
+
+    nodes = TopLevel.build(document)
+
+    context = Context()
+    before = statistics().get('primed_hits', 0)
+
+    for index, node in enumerate(nodes):
+        node.execute(context)
+
+    assert_that(statistics()['primed_hits'] - before, equal_to(3))
+    assert_that(caplog.text, contains_string("| A-0 of 0"))
+    assert_that(caplog.text, contains_string("| C-0 of 0"))
+
+
+def test_plugin_echo_pre_renders_items_in_batches(caplog, monkeypatch):
+    monkeypatch.setattr(plugin_proxy, 'PRIME_BATCH_SIZE', 2)
+    stream = StringIO('''
+    - name: test0
+      echo: "{{ item | upper }}"
+      with_items: [a-1, b-1, c-1, d-1, e-1]
+    ''')
+    document = loader.ordered_load(stream)
+
+    nodes = TopLevel.build(document)
+
+    context = Context()
+    before = statistics().get('primed_hits', 0)
+
+    for node in nodes:
+        node.execute(context)
+
+    # the last batch, of a single item, is rendered as it is used.
+    assert_that(statistics()['primed_hits'] - before, equal_to(4))
+    assert_that(caplog.text, contains_string("| A-1"))
+    assert_that(caplog.text, contains_string("| E-1"))
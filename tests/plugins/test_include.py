@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+
+from hamcrest import assert_that
+from hamcrest import contains_string
+from hamcrest import equal_to
+from hamcrest import instance_of
+from six import StringIO
+
+from deployer import loader
+from deployer.cli import initialize
+from deployer.context import Context
+from deployer.plugins import TopLevel
+from deployer.plugins.include import FRAGMENTS
+from deployer.plugins.include import Include
+
+
+def run(text, directory):
+    document = loader.ordered_load(StringIO(text))
+    assert_that(TopLevel.valid(document), equal_to(True))
+
+    context = Context()
+    context.directory = str(directory)
+
+    result = None
+    for node in TopLevel.build(document):
+        result = node.execute(context)
+    return result
+
+
+def test_plugin_include_invalid():
+    assert_that(Include.valid({}), equal_to(False))
+    assert_that(Include.valid(None), equal_to(False))
+    assert_that(Include.valid(OrderedDict({'include': ''})), equal_to(False))
+    assert_that(Include.valid(OrderedDict({'include': {'a': 'b'}})), equal_to(False))
+
+    initialize()
+
+
+def test_plugin_include_build():
+    subject = Include.build(OrderedDict({'include': ['a.yaml', 'b.yaml']}))
+    assert_that(next(subject), instance_of(Include))
+
+
+def test_plugin_include_works(caplog, tmpdir):
+    tmpdir.join('fragment.yaml').write('''
+- name: fragment
+  echo: Hello from {{ who }}.
+- set:
+    included: yes
+''')
+
+    result = run('''
+- set:
+    who: fragment
+- include: fragment.yaml
+- echo: "Included: {{ included }}"
+''', tmpdir)
+
+    assert_that(result, equal_to({'result': 'success'}))
+    assert_that(caplog.text, contains_string('| Hello from fragment.'))
+    assert_that(caplog.text, contains_string('| Included: True'))
+
+
+def test_plugin_include_parses_each_file_once(caplog, tmpdir):
+    FRAGMENTS.clear()
+    tmpdir.mkdir('parts').join('one.yaml').write('''- echo: "Part {{ item }}."\n''')
+    tmpdir.join('parts', 'two.yaml').write('''- echo: "Second {{ item }}."\n''')
+    before = FRAGMENTS.misses
+
+    run('''
+- include: "parts/*.yaml"
+  with_items: [1, 2, 3]
+''', tmpdir)
+
+    assert_that(FRAGMENTS.misses - before, equal_to(2))
+    assert_that(caplog.text, contains_string('| Part 3.'))
+    assert_that(caplog.text, contains_string('| Second 3.'))
+
+
+def test_plugin_include_is_lazy(tmpdir):
+    before = FRAGMENTS.misses
+
+    result = run('''
+- include: "missing.yaml"
+  when: false
+''', tmpdir)
+
+    assert_that(result, equal_to({'result': 'skipped'}))
+    assert_that(FRAGMENTS.misses, equal_to(before))
+
+
+def test_plugin_include_missing_file_fails(caplog, tmpdir):
+
+    result = run('''- include: missing.yaml\n''', tmpdir)
+
+    assert_that(result, equal_to({'result': 'failure'}))
+    assert_that(caplog.text, contains_string("Unable to include"))
+
+
+def test_plugin_include_invalid_fragment_fails(tmpdir):
+    tmpdir.join('broken.yaml').write('''- unknown: plugin\n''')
+
+    assert_that(run('''- include: broken.yaml\n''', tmpdir), equal_to({'result': 'failure'}))
+
+
+def test_plugin_include_reloads_modified_files(caplog, tmpdir):
+    fragment = tmpdir.join('fragment.yaml')
+    fragment.write('''- echo: First version.\n''')
+    run('''- include: fragment.yaml\n''', tmpdir)
+
+    fragment.write('''- echo: Second, longer version.\n''')
+    run('''- include: fragment.yaml\n''', tmpdir)
+
+    assert_that(caplog.text, contains_string('| Second, longer version.'))
+
+
+def test_plugin_include_cycle_fails(caplog, tmpdir):
+    tmpdir.join('self.yaml').write('''- include: self.yaml\n''')
+    tmpdir.join('ping.yaml').write('''- include: pong.yaml\n''')
+    tmpdir.join('pong.yaml').write('''- include: ping.yaml\n''')
+
+    assert_that(run('''- include: self.yaml\n''', tmpdir), equal_to({'result': 'failure'}))
+    assert_that(caplog.text, contains_string("Unable to include '%s': it includes itself" % tmpdir.join('self.yaml')))
+
+    assert_that(run('''- include: ping.yaml\n''', tmpdir), equal_to({'result': 'failure'}))
+    assert_that(caplog.text, contains_string("through %s > %s > %s" % (tmpdir.join('ping.yaml'), tmpdir.join('pong.yaml'),
+                                                                       tmpdir.join('ping.yaml'))))
+
+    # a fragment may still be included more than once, one after the other.
+    tmpdir.join('twice.yaml').write('''- include: pong-free.yaml\n- include: pong-free.yaml\n''')
+    tmpdir.join('pong-free.yaml').write('''- echo: once\n''')
+    assert_that(run('''- include: twice.yaml\n''', tmpdir), equal_to({'result': 'success'}))
@@ -28,6 +28,7 @@ from deployer.cli import initialize
 from deployer.context import Context
 from deployer.plugins import Matrix
 from deployer.plugins import TopLevel
+from deployer.plugins.echo import Echo
 
 
 def test_plugin_matrix_invalid():
@@ -251,3 +252,37 @@ def test_plugin_matrix_runs_with_two_matrices_with_multiple_attempts(caplog):
 
     assert_that(caplog.text, contains_string('Hello world.'))
     assert_that(caplog.text, is_not(contains_string('failure')))
+
+
+def test_plugin_matrix_builds_inner_tasks_once(caplog, monkeypatch):
+    built = []
+    original = Echo.__init__
+
+    def counting_init(self, msg):
+        built.append(msg)
+        original(self, msg)
+
+    monkeypatch.setattr(Echo, '__init__', counting_init)
+
+    stream = StringIO('''
+    - name: test1
+      matrix:
+        tags:
+          - m1
+          - m2
+          - m3
+        tasks:
+          - name: inner
+            echo: "{{ matrix_tag }}"
+            tags: [t1]
+    ''')
+    document = loader.ordered_load(stream)
+
+    context = Context()
+    for node in TopLevel.build(document):
+        node.execute(context)
+        node.execute(context)
+
+    assert_that(len(built), equal_to(1))
+    assert_that(caplog.text, contains_string('| m3'))
+    assert_that(document[0]['matrix']['tasks'][0]['tags'], equal_to(['t1']))
@@ -60,6 +60,11 @@ def test_plugin_shell_build():
     assert_that(next(subject), instance_of(Shell))
 
 
+def test_plugin_shell_script_is_never_pre_rendered():
+    subject = next(Shell.build({'shell': {'script': 'echo {{ item }}'}}))
+    assert_that(subject.renderables(), equal_to(()))
+
+
 @pytest.mark.skipif(IS_WINDOWS, reason='Irrelevant on non-unix')
 def test_plugin_shell_timeout_on_unix(caplog, reactor):  # noqa: no-cover
     stream = StringIO('''
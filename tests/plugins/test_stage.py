@@ -120,3 +120,31 @@ def test_plugin_stage_does_not_create_scope(caplog):
         node.execute(context)
 
     assert_that(caplog.text, contains_string('| benden'))
+
+
+def test_plugin_stage_nested_validates_each_node_once(monkeypatch):
+    calls = []
+    original = Stage.valid
+
+    def counting_valid(node):
+        calls.append(node)
+        return original(node)
+
+    monkeypatch.setattr(Stage, 'valid', staticmethod(counting_valid))
+
+    stream = StringIO('''
+    - stage:
+        tasks:
+          - stage:
+              tasks:
+                - stage:
+                    tasks:
+                      - echo: Deep.
+    ''')
+    document = loader.ordered_load(stream)
+
+    assert_that(TopLevel.valid(document), equal_to(True))
+    for node in TopLevel.build(document):
+        node.execute(Context())
+
+    assert_that(len(calls), equal_to(3))
@@ -13,18 +13,45 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import sys
+import threading
+from collections import OrderedDict
 
 from hamcrest import assert_that
 from hamcrest import calling
 from hamcrest import equal_to
+from hamcrest import instance_of
+from hamcrest import less_than_or_equal_to
 from hamcrest import raises
 from jinja2.exceptions import TemplateSyntaxError
 from jinja2.exceptions import UndefinedError
+from six import StringIO
+from six import text_type
 
 from deployer.context import Context
+from deployer.context import Scope
+from deployer.rendering import EXPANSION_MEMO
+from deployer.rendering import LITERAL
+from deployer.rendering import RENDER_MEMO
+from deployer.rendering import RENDER_PROFILE
+from deployer.rendering import TEMPLATE
+from deployer.rendering import VARIABLE
 from deployer.rendering import BooleanExpression
+from deployer.rendering import Renderable
+from deployer.rendering import SharedEnvironment
+from deployer.rendering import TemplateCache
+from deployer.rendering import cache_info
+from deployer.rendering import classify
+from deployer.rendering import clear_memos
+from deployer.rendering import configure
+from deployer.rendering import get_environment
+from deployer.rendering import my_safe_eval
 from deployer.rendering import render
+from deployer.rendering import render_native
+from deployer.rendering import render_to
+from deployer.rendering import safe_eval_cache_info
+from deployer.rendering import statistics
 
 
 def test_rendering_invalid_template():
@@ -145,3 +172,383 @@ def test_rendering_invalid_expression_raises():
     fixture = BooleanExpression("""{{ False }}""")
 
     assert_that(calling(fixture.evaluate).with_args(context), raises(RuntimeError))
+
+
+def test_rendering_reuses_shared_environment():
+    assert_that(get_environment() is get_environment(), equal_to(True))
+
+
+def test_rendering_caches_compiled_templates():
+    fixture = """Cached {{ a | string }} template."""
+    before = cache_info()
+    render(fixture, a=1)
+    render(fixture, a=2)
+    after = cache_info()
+
+    assert_that(after['misses'] - before['misses'], equal_to(1))
+    assert_that(after['hits'] - before['hits'], equal_to(1))
+
+
+def test_rendering_template_cache_evicts_least_recently_used():
+    cache = TemplateCache(get_environment().from_string, maxsize=2)
+    first = cache.get("{{ a }}")
+    cache.get("{{ b }}")
+    cache.get("{{ a }}")
+    cache.get("{{ c }}")
+
+    assert_that(cache.info()['evictions'], equal_to(1))
+    assert_that(cache.info()['size'], equal_to(2))
+    assert_that(cache.get("{{ a }}") is first, equal_to(True))
+    assert_that(cache.info()['misses'], equal_to(3))
+
+
+def test_rendering_is_thread_safe():
+    results = []
+
+    def worker(index):
+        for n in range(100):
+            results.append(render("{{ a }}-{{ b }}", a=index, b=n % 7) == "%d-%d" % (index, n % 7))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert_that(len(results), equal_to(800))
+    assert_that(all(results), equal_to(True))
+
+
+def test_rendering_boolean_expression_is_compiled_once():
+    context = Context()
+    fixture = BooleanExpression("""nbcpus > 0 and platform""")
+    before = cache_info()
+    subject = [fixture.evaluate(context) for _ in range(3)]
+    after = cache_info()
+
+    assert_that(subject, equal_to([True, True, True]))
+    assert_that(after['misses'], equal_to(before['misses']))
+
+
+def test_rendering_boolean_expression_returns_bool():
+    context = Context()
+    context.variables.last()['items'] = [1, 2]
+
+    assert_that(BooleanExpression("""items""").evaluate(context), equal_to(True))
+    assert_that(BooleanExpression("""items | length > 2""").evaluate(context), equal_to(False))
+
+
+def test_rendering_boolean_expression_undefined_raises():
+    context = Context()
+    fixture = BooleanExpression("""not_defined_anywhere""")
+
+    assert_that(calling(fixture.evaluate).with_args(context), raises(UndefinedError))
+
+
+def test_rendering_classifies_templates():
+    assert_that(classify("""Just a literal."""), equal_to(LITERAL))
+    assert_that(classify("""Hello {{ a }} and {{item.host}}."""), equal_to(VARIABLE))
+    assert_that(classify("""Hello {{ a | upper }}."""), equal_to(TEMPLATE))
+    assert_that(classify("""{% if a %}yes{% endif %}"""), equal_to(TEMPLATE))
+    assert_that(classify("""{# comment #}"""), equal_to(TEMPLATE))
+
+
+def test_rendering_literal_matches_jinja2_output():
+    for fixture in ["""one\ntwo\n""", """one\r\ntwo\r\n\n""", """one\rtwo""", """""", """a }} b"""]:
+        assert_that(Renderable(fixture).render({}), equal_to(render(fixture)))
+
+
+def test_rendering_literal_avoids_rendering():
+    subject = Renderable("""Nothing to see here.""")
+    before = statistics().get('renders_avoided', 0)
+
+    assert_that(subject.needs_rendering, equal_to(False))
+    assert_that(subject.render({}), equal_to("""Nothing to see here."""))
+    assert_that(statistics()['renders_avoided'] - before, equal_to(1))
+
+
+def test_rendering_renderable_template():
+    subject = Renderable("""Hello {{ a }}.""")
+
+    assert_that(subject.needs_rendering, equal_to(True))
+    assert_that(subject.render({'a': 'World'}), equal_to("""Hello World."""))
+
+
+def test_rendering_persists_bytecode(tmpdir):
+    configure(template_cache=str(tmpdir))
+    try:
+        assert_that(render("""Persisted {{ a | string }}.""", a=1), equal_to("""Persisted 1."""))
+    finally:
+        configure()
+
+    assert_that(len(tmpdir.listdir()), equal_to(1))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Should have loaded the bytecode from disk.")
+
+    environment = SharedEnvironment(template_cache=str(tmpdir))
+    environment.compile = fail
+
+    assert_that(environment.template_cache.get("""Persisted {{ a | string }}.""").render(a=2), equal_to("""Persisted 2."""))
+
+
+def test_rendering_memoizes_on_referenced_variables_only():
+    RENDER_MEMO.clear()
+    fixture = """Memoized {{ a | string }}."""
+
+    for item in range(5):
+        assert_that(render(fixture, a='x', item=item), equal_to("""Memoized x."""))
+
+    assert_that(RENDER_MEMO.info()['hits'], equal_to(4))
+    assert_that(RENDER_MEMO.info()['misses'], equal_to(1))
+
+
+def test_rendering_memo_distinguishes_referenced_values():
+    RENDER_MEMO.clear()
+    fixture = """Memoized {{ item }}."""
+
+    assert_that(render(fixture, item=1), equal_to("""Memoized 1."""))
+    assert_that(render(fixture, item=True), equal_to("""Memoized True."""))
+    assert_that(render(fixture, item=[1]), equal_to("""Memoized [1]."""))
+    assert_that(RENDER_MEMO.info()['hits'], equal_to(0))
+
+
+def test_rendering_memo_follows_indirections():
+    RENDER_MEMO.clear()
+    fixture = """{{ a }}."""
+
+    assert_that(render(fixture, a="{{ b }}", b="{{ c }}", c="one"), equal_to("""one."""))
+    assert_that(render(fixture, a="{{ b }}", b="{{ c }}", c="two"), equal_to("""two."""))
+
+
+def test_rendering_memo_skips_templates_built_while_rendering():
+    RENDER_MEMO.clear()
+    fixture = """{{ '{{ ' ~ which ~ ' }}' }}"""
+
+    assert_that(render(fixture, which='a', a='one'), equal_to("""one"""))
+    assert_that(render(fixture, which='a', a='CHANGED'), equal_to("""CHANGED"""))
+    assert_that(RENDER_MEMO.info()['size'], equal_to(0))
+
+
+def test_rendering_memo_skips_large_variables(monkeypatch):
+    from deployer import rendering
+
+    frozen = []
+    freeze = rendering._freeze
+    monkeypatch.setattr(rendering, '_freeze', lambda *args: frozen.append(1) or freeze(*args))
+    RENDER_MEMO.clear()
+    hosts = list(range(1000))
+
+    # e.g. ``with_items: "{{ hosts }}"``, whose task uses the list it loops over.
+    for item in hosts:
+        assert_that(render("""{{ item }} of {{ hosts | length }}""", hosts=hosts, item=item),
+                    equal_to("""%d of 1000""" % item))
+
+    assert_that(RENDER_MEMO.info()['size'], equal_to(0))
+    # each memo key gives up once its budget is spent; rather than freezing every host, for every item.
+    assert_that(len(frozen), less_than_or_equal_to(len(hosts) * (rendering.MEMO_KEY_MAX_ITEMS + 2)))
+
+
+def test_rendering_memo_skips_environment():
+    RENDER_MEMO.clear()
+    render("""{{ env.PATH }}""")
+    render("""{{ env.PATH }}""")
+
+    assert_that(RENDER_MEMO.info()['size'], equal_to(0))
+
+
+def test_rendering_safe_eval_caches_vetted_code():
+    fixture = """[1, 2, 'three', {'four': 4}]"""
+    before = safe_eval_cache_info()
+    first = my_safe_eval(fixture)
+    second = my_safe_eval(fixture)
+    after = safe_eval_cache_info()
+
+    assert_that(first, equal_to([1, 2, 'three', {'four': 4}]))
+    assert_that(second, equal_to(first))
+    assert_that(first is second, equal_to(False))
+    assert_that(after['hits'] - before['hits'], equal_to(1))
+    assert_that(after['misses'] - before['misses'], equal_to(1))
+
+
+def test_rendering_safe_eval_rejects_calls_every_time():
+    fixture = """__import__('os')"""
+
+    assert_that(calling(my_safe_eval).with_args(fixture), raises(Exception))
+    assert_that(calling(my_safe_eval).with_args(fixture), raises(Exception))
+
+
+def test_rendering_native_returns_python_objects():
+    fixture = [OrderedDict([('host', 'a'), ('port', 22)]), OrderedDict([('host', 'b'), ('port', 2222)])]
+    subject = render_native("""{{ hosts }}""", hosts=fixture)
+
+    assert_that(subject, equal_to(fixture))
+    assert_that(subject[1]['port'], equal_to(2222))
+
+
+def test_rendering_native_falls_back_for_text():
+    assert_that(render_native("""[{{ a }}, {{ b }}]""", a=1, b=2), equal_to([1, 2]))
+    assert_that(render_native("""{{ a }}""", a="{{ b }}", b="[1, 2]"), equal_to([1, 2]))
+
+
+def test_rendering_native_follows_safety_rules():
+    assert_that(calling(render_native).with_args("""{{ a }}""", a="__import__('os')"), raises(Exception))
+
+
+def test_rendering_to_a_stream():
+    fixtures = [
+        ("""{% for i in range(3) %}line {{ i }}\n{% endfor %}""", {}),
+        ("""{% raw %}Testing {% endraw %}{{ a }}""", {'a': '''{% raw %}{{ string }}.{% endraw %}'''}),
+        ("""{{ a }}.""", {'a': "{{ b }}", 'b': "Hello World"}),
+    ]
+
+    for fixture, variables in fixtures:
+        stream = StringIO()
+        render_to(stream, fixture, **dict(variables))
+
+        assert_that(stream.getvalue(), equal_to(render(fixture, **dict(variables))))
+
+
+def test_rendering_renderable_to_a_stream():
+    for fixture in ["""A literal\n""", """Hello {{ a }}."""]:
+        stream = StringIO()
+        Renderable(fixture).render_to(stream, {'a': 'World'})
+
+        assert_that(stream.getvalue(), equal_to(render(fixture, a='World')))
+
+
+def test_rendering_profile_records_templates():
+    RENDER_PROFILE.clear()
+    RENDER_PROFILE.enabled = True
+    try:
+        render("""Profiled {{ a }}.""", a='x')
+        render("""Profiled {{ a }}.""", a='yy')
+        render_to(StringIO(), """Streamed {{ a }}.""", a='z')
+    finally:
+        RENDER_PROFILE.enabled = False
+
+    render("""Profiled {{ a }}.""", a='not recorded')
+    report = dict((entry['template'], entry) for entry in RENDER_PROFILE.report())
+
+    assert_that(report["""Profiled {{ a }}."""]['calls'], equal_to(2))
+    assert_that(report["""Profiled {{ a }}."""]['size'], equal_to(len("""Profiled x.Profiled yy.""")))
+    assert_that(report["""Streamed {{ a }}."""]['calls'], equal_to(1))
+    assert_that(len(RENDER_PROFILE.report(limit=1)), equal_to(1))
+
+
+def test_rendering_expansions_are_memoized_per_scope_generation():
+    clear_memos()
+    context = Context()
+    scope = context.variables.last()
+    scope['greeting'] = """{{ salutation }}, {{ who }}"""
+    scope['salutation'] = """Hello"""
+    scope['who'] = """World"""
+
+    first = Renderable("""{{ greeting }}!""")
+    second = Renderable("""{{ greeting }}?""")
+
+    assert_that(first.render(context.variables.last()), equal_to("""Hello, World!"""))
+    assert_that(second.render(context.variables.last()), equal_to("""Hello, World?"""))
+    assert_that(EXPANSION_MEMO.info()['hits'], equal_to(1))
+
+    scope['who'] = """Earth"""
+    assert_that(first.render(context.variables.last()), equal_to("""Hello, Earth!"""))
+
+    context.variables.push_last()
+    context.variables.last()['who'] = """Mars"""
+    assert_that(first.render(context.variables.last()), equal_to("""Hello, Mars!"""))
+    context.variables.pop()
+
+    assert_that(second.render(context.variables.last()), equal_to("""Hello, Earth?"""))
+
+
+def test_rendering_scope_generation_changes_upon_mutation():
+    context = Context()
+    generation = context.variables.last().generation
+    context.variables.last()['a'] = 1
+
+    assert_that(context.variables.last().generation == generation, equal_to(False))
+
+    context.variables.push_last()
+    pushed = context.variables.last().generation
+    context.variables.pop()
+
+    assert_that(pushed == context.variables.last().generation, equal_to(False))
+
+
+def test_rendering_interpolates_simple_templates_without_jinja2():
+    fixtures = ["""{{ a }}""", """Hello {{ a }} and {{item.host}}.""", """{{ a.b }}-{{ a.c }}\n""",
+                """{{ n }} {{ a.keys }}""", """{{ env.PATH }}"""]
+    variables = {'a': {'b': 1, 'c': [1, 2]}, 'item': {'host': 'localhost'}, 'n': None}
+    before = cache_info()
+
+    for fixture in fixtures:
+        assert_that(render(fixture, **variables),
+                    equal_to(get_environment().from_string(fixture).render(dict(variables, env=os.environ))))
+
+    assert_that(cache_info()['misses'], equal_to(before['misses']))
+
+
+def test_rendering_interpolation_renders_unicode_as_jinja2():
+    variables = {'a': u'caf\u00e9', 'b': [u'\u00fc']}
+
+    for fixture in [u"""{{ a }}""", u"""{{ a }} and {{ b }}"""]:
+        rendered = render(fixture, **variables)
+        assert_that(rendered, equal_to(get_environment().from_string(fixture).render(variables)))
+        assert_that(rendered, instance_of(text_type))
+
+
+def test_rendering_interpolation_leaves_reserved_names_to_jinja2():
+    for fixture in ["""{{ self }}""", """{{ range }}""", """{{ a }} {{ self }}"""]:
+        variables = {'self': 'shadowed', 'range': 'shadowed', 'a': 1}
+        assert_that(render(fixture, **variables),
+                    equal_to(get_environment().from_string(fixture).render(dict(variables, env=os.environ))))
+
+
+def test_rendering_interpolation_recursively_renders():
+    assert_that(render("""{{ a }}""", a="""{{ b }}!""", b='deep'), equal_to("""deep!"""))
+
+
+def test_rendering_interpolation_undefined_raises():
+    assert_that(calling(render).with_args("""{{ missing }}"""), raises(UndefinedError))
+    assert_that(calling(render).with_args("""{{ a.missing }}""", a={}), raises(UndefinedError))
+
+
+def test_rendering_interpolation_leaves_constants_to_jinja2():
+    assert_that(classify("""{{ true }}"""), equal_to(TEMPLATE))
+    assert_that(render("""{{ none }}-{{ True }}"""), equal_to("""None-True"""))
+
+
+def test_rendering_native_interpolation_returns_value():
+    value = [1, 2]
+
+    assert_that(render_native("""{{ a }}""", a=value) is value, equal_to(True))
+
+
+def test_rendering_renderable_primes_scopes():
+    scopes = [Scope({'a': index}) for index in range(3)]
+    subject = Renderable("""Primed {{ a * 2 }}.""")
+    subject.prime(scopes)
+    before = statistics().get('primed_hits', 0)
+
+    assert_that([subject.render(scope) for scope in scopes], equal_to(["""Primed 0.""", """Primed 2.""", """Primed 4."""]))
+    assert_that(statistics()['primed_hits'] - before, equal_to(3))
+
+
+def test_rendering_renderable_ignores_changed_primed_scope():
+    scope = Scope({'a': 1})
+    subject = Renderable("""Primed {{ a }} {{ env.HOME is defined }}.""")
+    subject.prime([scope])
+    before = statistics().get('primed_hits', 0)
+    scope['a'] = 2
+
+    assert_that(subject.render(scope), equal_to("""Primed 2 True."""))
+    assert_that(statistics().get('primed_hits', 0) - before, equal_to(0))
+
+
+def test_rendering_renderable_defers_priming_failures():
+    scope = Scope()
+    subject = Renderable("""{{ missing }}""")
+    subject.prime([scope])
+
+    assert_that(calling(subject.render).with_args(scope), raises(UndefinedError))
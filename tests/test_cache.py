@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from hamcrest import assert_that
+from hamcrest import equal_to
+from hamcrest import none
+
+from deployer.cache import DirectoryCache
+
+
+def test_cache_roundtrip(tmpdir):
+    subject = DirectoryCache(str(tmpdir.join('cache')))
+    subject.set('abc', b'12345')
+
+    assert_that(subject.get('abc'), equal_to(b'12345'))
+    assert_that(subject.get('missing'), none())
+
+
+def test_cache_evicts_least_recently_used(tmpdir):
+    subject = DirectoryCache(str(tmpdir), max_size=10)
+    subject.set('a', b'1234')
+    os.utime(os.path.join(str(tmpdir), 'a' + DirectoryCache.SUFFIX), (1, 1))
+    subject.set('b', b'1234')
+    os.utime(os.path.join(str(tmpdir), 'b' + DirectoryCache.SUFFIX), (2, 2))
+    subject.set('c', b'1234')
+
+    assert_that(subject.get('a'), none())
+    assert_that(subject.get('b'), equal_to(b'1234'))
+    assert_that(subject.get('c'), equal_to(b'1234'))
+
+
+def test_cache_leaves_no_temporary_files(tmpdir):
+    subject = DirectoryCache(str(tmpdir))
+    subject.set('a', b'1234')
+    subject.set('a', b'5678')
+
+    assert_that(os.listdir(str(tmpdir)), equal_to(['a' + DirectoryCache.SUFFIX]))
+    assert_that(subject.get('a'), equal_to(b'5678'))
+
+
+def test_cache_clear(tmpdir):
+    subject = DirectoryCache(str(tmpdir))
+    subject.set('a', b'1234')
+    subject.clear()
+
+    assert_that(subject.get('a'), none())
+
+
+def test_cache_lists_the_directory_only_when_over_its_size(tmpdir, monkeypatch):
+    subject = DirectoryCache(str(tmpdir), max_size=1000)
+    listings = []
+    entries = subject.entries
+    monkeypatch.setattr(subject, 'entries', lambda: listings.append(1) or entries())
+
+    for index in range(200):
+        subject.set('entry%03d' % index, b'0123456789')
+
+    # once to learn the size; then once it first exceeds the bound, and after every further 11 writes.
+    assert_that(len(listings), equal_to(1 + 1 + 9))
+    assert_that(sum(size for _, size, _ in entries()), equal_to(900))
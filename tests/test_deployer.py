@@ -13,14 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
 
 from click.testing import CliRunner
 from hamcrest import assert_that
 from hamcrest import contains_string
 from hamcrest import equal_to
+from hamcrest import has_key
 from hamcrest import is_not
 
+from deployer import loader
+from deployer import pipeline_cache
 from deployer.cli import main
 
 
@@ -223,3 +227,193 @@ def test_exec_with_simple_matrix_tagging_example_not_selected_empty_matrix_tag()
     assert_that(result.exit_code, equal_to(0))
     assert_that(result.output, not contains_string('Hello World.'))
     assert_that(result.output, contains_string('Hello Earth.'))
+
+
+def test_exec_with_render_stats(tmpdir):
+    __path__ = os.path.dirname(__file__)
+    example = os.path.join(__path__, '..', 'examples', 'simple.yaml')
+    output = tmpdir.join('stats.json')
+
+    runner = CliRunner()
+    result = runner.invoke(main, ['exec', '--render-stats', '--render-stats-json', str(output), example])
+
+    assert_that(result.exit_code, equal_to(0))
+    stats = json.loads(output.read())
+    assert_that(stats, has_key('templates'))
+    assert_that(stats['safe_eval_cache'], has_key('hits'))
+    assert_that(stats['expression_cache'], has_key('hits'))
+
+
+def test_validate_with_pipeline_cache(tmpdir):
+    __path__ = os.path.dirname(__file__)
+    example = os.path.join(__path__, '..', 'examples', 'simple.yaml')
+
+    runner = CliRunner()
+    try:
+        for _ in range(2):
+            result = runner.invoke(main, ['--pipeline-cache', str(tmpdir), 'validate', example])
+
+            assert_that(result.exit_code, equal_to(0))
+            assert_that(result.output, contains_string('Document is OK.'))
+            assert_that(len(tmpdir.listdir('*.cache')), equal_to(1))
+            assert_that(len(tmpdir.join('results').listdir()), equal_to(1))
+    finally:
+        pipeline_cache.configure()
+
+
+def test_exec_streaming_simple_example():
+    __path__ = os.path.dirname(__file__)
+    example = os.path.join(__path__, '..', 'examples', 'simple.yaml')
+
+    runner = CliRunner()
+    result = runner.invoke(main, ['exec', '--stream', example])
+
+    assert_that(result.exit_code, equal_to(0))
+
+
+def test_exec_streaming_broken_file():
+    runner = CliRunner()
+    result = runner.invoke(main, ['exec', '--stream', __file__])
+
+    assert_that(result.exit_code, equal_to(2))
+
+
+def test_exec_streaming_runs_tasks_before_an_invalid_one(tmpdir):
+    pipeline = tmpdir.join('pipeline.yaml')
+    pipeline.write('''
+- name: first
+  echo: Hello Stream.
+- name: second
+  unknown: plugin
+''')
+
+    runner = CliRunner()
+    result = runner.invoke(main, ['exec', '--stream', str(pipeline)])
+
+    assert_that(result.exit_code, equal_to(2))
+    assert_that(result.output, contains_string('Hello Stream.'))
+
+
+def test_convert_and_exec_machine_formats(tmpdir):
+    __path__ = os.path.dirname(__file__)
+    example = os.path.join(__path__, '..', 'examples', 'simple.yaml')
+
+    runner = CliRunner()
+    for extension in ('json', 'msgpack') if loader.msgpack is not None else ('json',):
+        target = tmpdir.join('simple.%s' % extension)
+        result = runner.invoke(main, ['convert', example, str(target)])
+        assert_that(result.exit_code, equal_to(0))
+
+        result = runner.invoke(main, ['exec', str(target)])
+        assert_that(result.exit_code, equal_to(0))
+
+        result = runner.invoke(main, ['exec', '--stream', str(target)])
+        assert_that(result.exit_code, equal_to(0))
+
+    result = runner.invoke(main, ['convert', '--to', 'yaml', str(tmpdir.join('simple.json')), str(tmpdir.join('back.txt'))])
+
+    assert_that(result.exit_code, equal_to(0))
+    assert_that(tmpdir.join('back.txt').read(), contains_string('echo'))
+
+
+def test_convert_broken_file(tmpdir):
+    runner = CliRunner()
+    result = runner.invoke(main, ['convert', __file__, str(tmpdir.join('broken.json'))])
+
+    assert_that(result.exit_code, equal_to(1))
+
+
+def test_validate_reports_every_file(tmpdir):
+    __path__ = os.path.dirname(__file__)
+    example = os.path.join(__path__, '..', 'examples', 'simple.yaml')
+    summary = tmpdir.join('summary.json')
+
+    runner = CliRunner()
+    result = runner.invoke(main, ['validate', '--jobs', '2', '--summary-json', str(summary), __file__, example, example])
+
+    assert_that(result.exit_code, equal_to(1))
+    assert_that(result.output, contains_string('Document is BAD.'))
+    assert_that(result.output, contains_string('2 of 3 documents are OK'))
+
+    subject = json.loads(summary.read())
+    assert_that((subject['valid'], subject['invalid']), equal_to((2, 1)))
+    assert_that([entry['valid'] for entry in subject['files']], equal_to([False, True, True]))
+
+
+def test_validate_caches_results(tmpdir):
+    __path__ = os.path.dirname(__file__)
+    example = os.path.join(__path__, '..', 'examples', 'simple.yaml')
+    summary = tmpdir.join('summary.json')
+    cache = tmpdir.mkdir('cache')
+
+    runner = CliRunner()
+    try:
+        for cached in (False, True):
+            result = runner.invoke(main, ['--pipeline-cache', str(cache), 'validate', '--summary-json', str(summary),
+                                          example, __file__])
+
+            assert_that(result.exit_code, equal_to(1))
+            assert_that([entry['cached'] for entry in json.loads(summary.read())['files']], equal_to([cached, cached]))
+    finally:
+        pipeline_cache.configure()
+
+
+def test_validate_cached_results_report_their_own_path(tmpdir):
+    original = tmpdir.join('bad.yaml')
+    original.write('- shell:\n    script: 1\n')
+    copy = tmpdir.join('copy_of_bad.yaml')
+    copy.write('- shell:\n    script: 1\n')
+    summary = tmpdir.join('summary.json')
+    cache = tmpdir.mkdir('cache')
+
+    runner = CliRunner()
+    try:
+        for pipeline in (original, copy):
+            result = runner.invoke(main, ['--pipeline-cache', str(cache), 'validate', '--summary-json', str(summary),
+                                          str(pipeline)])
+            assert_that(result.exit_code, equal_to(1))
+
+        entry = json.loads(summary.read())['files'][0]
+        assert_that((entry['path'], entry['cached']), equal_to((str(copy), True)))
+    finally:
+        pipeline_cache.configure()
+
+
+def test_validate_cached_results_follow_programs(tmpdir):
+    tool = tmpdir.join('tool.sh')
+    pipeline = tmpdir.join('pipeline.yaml')
+    pipeline.write('- command: %s\n' % tool)
+    summary = tmpdir.join('summary.json')
+    cache = tmpdir.mkdir('cache')
+
+    def validate():
+        result = runner.invoke(main, ['--pipeline-cache', str(cache), 'validate', '--summary-json', str(summary), str(pipeline)])
+        assert_that(result.exit_code, equal_to(0))
+        entry = json.loads(summary.read())['files'][0]
+        return entry['cached'], len(entry['problems'])
+
+    runner = CliRunner()
+    try:
+        assert_that(validate(), equal_to((False, 1)))
+        assert_that(validate(), equal_to((True, 1)))
+
+        tool.write('#!/bin/sh\n')
+        tool.chmod(0o755)
+        assert_that(validate(), equal_to((False, 0)))
+        assert_that(validate(), equal_to((True, 0)))
+    finally:
+        pipeline_cache.configure()
+
+
+def test_validate_reports_where_the_document_is_invalid(tmpdir):
+    pipeline = tmpdir.join('pipeline.yaml')
+    pipeline.write('- stage:\n    tasks:\n      - shell:\n          script: 1\n')
+    summary = tmpdir.join('summary.json')
+
+    runner = CliRunner()
+    result = runner.invoke(main, ['validate', '--summary-json', str(summary), str(pipeline)])
+
+    assert_that(result.exit_code, equal_to(1))
+
+    errors = json.loads(summary.read())['files'][0]['errors']
+    assert_that([error['where'] for error in errors], equal_to(['[0].stage.tasks[0].shell.script']))
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+
+import pluggy
+from hamcrest import assert_that
+from hamcrest import equal_to
+from hamcrest import none
+
+from deployer import entry_points
+from deployer.plugins import echo
+
+
+def test_entry_point_index_is_reused_until_sys_path_changes(tmpdir, monkeypatch):
+    scans = []
+
+    def scan(group):
+        scans.append(group)
+        return [('example', 'deployer.plugins.echo', 'example-plugin', '1.0')]
+
+    monkeypatch.setattr(entry_points, 'scan', scan)
+    site = tmpdir.mkdir('site-packages')
+    monkeypatch.setattr(sys, 'path', sys.path + [str(site)])
+    path = str(tmpdir.join('entry-points.json'))
+
+    expected = [('example', 'deployer.plugins.echo', 'example-plugin', '1.0')]
+    assert_that(entry_points.load_index('py-deployer', path), equal_to(expected))
+    assert_that(entry_points.load_index('py-deployer', path), equal_to(expected))
+    assert_that(len(scans), equal_to(1))
+
+    with open(path) as f:
+        assert_that(json.load(f)['entries'], equal_to([list(entry) for entry in expected]))
+
+    # e.g. a distribution is installed.
+    site.join('example_plugin').mkdir()
+    os.utime(str(site), (0, 0))
+    assert_that(entry_points.load_index('py-deployer', path), equal_to(expected))
+    assert_that(len(scans), equal_to(2))
+
+
+def test_entry_point_index_recovers_from_a_corrupt_file(tmpdir, monkeypatch):
+    monkeypatch.setattr(entry_points, 'scan', lambda group: [])
+    path = tmpdir.join('entry-points.json')
+    path.write('{not json')
+
+    assert_that(entry_points.load_index('py-deployer', str(path)), equal_to([]))
+    assert_that(json.loads(path.read())['stamp'], equal_to(entry_points.stamp('py-deployer')))
+
+
+def test_entry_point_index_may_be_disabled(monkeypatch):
+    monkeypatch.setenv(entry_points.ENTRY_POINT_CACHE_ENVVAR, '')
+    assert_that(entry_points.default_path(), none())
+
+    monkeypatch.setenv(entry_points.ENTRY_POINT_CACHE_ENVVAR, '/tmp/index.json')
+    assert_that(entry_points.default_path(), equal_to('/tmp/index.json'))
+
+
+def test_entry_points_are_registered_from_the_index(tmpdir, monkeypatch):
+    monkeypatch.setattr(entry_points, 'scan', lambda group: [('example', 'deployer.plugins.echo', 'example-plugin', '1.0'),
+                                                             ('blocked', 'deployer.plugins.echo:Echo', 'other', '2.0')])
+    pm = pluggy.PluginManager('deployer')
+    pm.set_blocked('blocked')
+
+    distributions = entry_points.register_entry_points(pm, path=str(tmpdir.join('entry-points.json')))
+
+    assert_that(distributions, equal_to([('example-plugin', '1.0')]))
+    assert_that(pm.get_plugin('example'), equal_to(echo))
+    assert_that(entry_points.resolve('deployer.plugins.echo:Echo.build'), equal_to(echo.Echo.build))
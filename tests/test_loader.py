@@ -13,15 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import OrderedDict
+
+import yaml
 from hamcrest import assert_that
+from hamcrest import calling
 from hamcrest import equal_to
 from hamcrest import instance_of
+from hamcrest import raises
+from six import BytesIO
 from six import StringIO
 
 from deployer import loader
 from deployer.cli import initialize
 from deployer.plugins import TopLevel
 
+AVAILABLE_FORMATS = [format for format in loader.FORMATS if format != 'msgpack' or loader.msgpack is not None]
+
 
 def test_top_level_is_a_list():
     stream = StringIO('''
@@ -76,3 +84,83 @@ def test_top_level_is_created():
 
     for node in nodes:
         assert_that(node, instance_of(TopLevel))
+
+
+def test_loader_is_built_once():
+    first = loader._LOADERS[(loader.FastSafeLoader, OrderedDict)]
+    loader.ordered_load(StringIO('''- name: test1'''))
+
+    assert_that(loader._LOADERS[(loader.FastSafeLoader, OrderedDict)] is first, equal_to(True))
+
+
+def test_loader_backends_are_equivalent():
+    text = '''
+- name: test1
+  echo: "{{ a }}"
+  with_items: [1, 2.5, true, null, "x"]
+- base: &base
+    z: 1
+    a: 2
+  merged:
+    <<: *base
+    b: 3
+    '''
+    fast = loader.ordered_load(StringIO(text))
+    pure = loader.ordered_load(StringIO(text), loader=yaml.SafeLoader)
+
+    assert_that(fast, equal_to(pure))
+    assert_that(fast[1]['merged'], instance_of(OrderedDict))
+    assert_that(list(fast[1]['merged'].keys()), equal_to(['z', 'a', 'b']))
+
+
+def test_loader_iterates_items_of_a_sequence():
+    text = '''
+- name: test1
+  base: &base {z: 1}
+- name: test2
+  merged:
+    <<: *base
+    b: 3
+    '''
+    for backend in (loader.FastStreamingLoader, yaml.SafeLoader):
+        subject = list(loader.iter_ordered_load(StringIO(text), loader=backend))
+
+        assert_that(subject, equal_to(loader.ordered_load(StringIO(text))))
+        assert_that(subject[1]['merged'], instance_of(OrderedDict))
+
+
+def test_loader_iterating_requires_a_sequence():
+    for text in ('', 'name: test1', '- name: test1\n---\n- name: test2'):
+        assert_that(calling(list).with_args(loader.iter_ordered_load(StringIO(text))), raises(yaml.YAMLError))
+
+
+def test_loader_detects_formats():
+    assert_that(loader.detect_format('pipeline.yml'), equal_to('yaml'))
+    assert_that(loader.detect_format('pipeline.JSON'), equal_to('json'))
+    assert_that(loader.detect_format('pipeline.msgpack'), equal_to('msgpack'))
+    assert_that(loader.detect_format('<stdin>'), equal_to('yaml'))
+
+
+def test_loader_formats_round_trip():
+    document = loader.ordered_load(StringIO('''
+- name: test1
+  echo: "{{ a }}"
+  with_items: [1, 2.5, true, null]
+- z: 1
+  a: {q: 2, b: 3}
+    '''))
+
+    for format in AVAILABLE_FORMATS:
+        data = loader.dumps(document, format)
+        subject = loader.load(data, format)
+
+        assert_that(subject, equal_to(document))
+        assert_that(list(subject[1].keys()), equal_to(['z', 'a']))
+        assert_that(subject[1]['a'], instance_of(OrderedDict))
+        assert_that(list(loader.iter_load(BytesIO(data), format)), equal_to(document))
+
+
+def test_loader_iterating_formats_requires_a_sequence():
+    for format in AVAILABLE_FORMATS[1:]:
+        data = loader.dumps(OrderedDict([('name', 'test1')]), format)
+        assert_that(calling(list).with_args(loader.iter_load(data, format)), raises(ValueError))
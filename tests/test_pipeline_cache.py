@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+
+from hamcrest import assert_that
+from hamcrest import equal_to
+from hamcrest import instance_of
+from six import BytesIO
+
+from deployer import loader
+from deployer import pipeline_cache
+from deployer.cli import initialize
+from deployer.pipeline_cache import PipelineCache
+from deployer.plugins import Echo
+from deployer.plugins import TopLevel
+
+FIXTURE = b'''
+- name: test1
+  echo: "{{ a }}"
+- name: test2
+  echo: Hello
+'''
+
+
+def test_pipeline_cache_round_trips_documents(tmpdir):
+    cache = PipelineCache(str(tmpdir))
+    document = loader.ordered_load(FIXTURE)
+
+    assert_that(cache.get(FIXTURE), equal_to(None))
+    cache.set(FIXTURE, document)
+    cached = cache.get(FIXTURE)
+
+    assert_that(cached, equal_to(document))
+    assert_that(cached[0], instance_of(OrderedDict))
+    assert_that(list(cached[0].keys()), equal_to(['name', 'echo']))
+    assert_that((cache.hits, cache.misses), equal_to((1, 1)))
+
+
+def test_pipeline_cache_is_keyed_by_contents(tmpdir):
+    cache = PipelineCache(str(tmpdir))
+    cache.set(FIXTURE, loader.ordered_load(FIXTURE))
+
+    assert_that(cache.get(FIXTURE + b'\n'), equal_to(None))
+
+
+def test_pipeline_cache_skips_documents_not_surviving_json(tmpdir):
+    fixture = b'''- name: test1\n  echo: {1: one}\n'''
+    cache = PipelineCache(str(tmpdir))
+    cache.set(fixture, loader.ordered_load(fixture))
+
+    assert_that(cache.get(fixture), equal_to(None))
+    assert_that(tmpdir.listdir(), equal_to([]))
+
+
+def test_pipeline_cache_load_skips_validation(tmpdir):
+    initialize()
+    calls = []
+
+    def validate(document):
+        calls.append(document)
+        return TopLevel.valid(document)
+
+    pipeline_cache.configure(str(tmpdir))
+    try:
+        first = pipeline_cache.load(BytesIO(FIXTURE), validate)
+        second = pipeline_cache.load(BytesIO(FIXTURE), validate)
+    finally:
+        pipeline_cache.configure()
+
+    assert_that(second, equal_to(first))
+    assert_that(len(calls), equal_to(1))
+
+
+def test_pipeline_cache_load_skips_validation_when_building(tmpdir, monkeypatch):
+    initialize()
+    pipeline_cache.configure(str(tmpdir))
+    try:
+        pipeline_cache.load(BytesIO(FIXTURE), TopLevel.valid)
+        document = pipeline_cache.load(BytesIO(FIXTURE), TopLevel.valid)
+    finally:
+        pipeline_cache.configure()
+
+    calls = []
+    original = Echo.valid
+    monkeypatch.setattr(Echo, 'valid', classmethod(lambda cls, node: calls.append(node) or original(node)))
+
+    assert_that(len(TopLevel(document)._compile(document)), equal_to(2))
+    assert_that(calls, equal_to([]))
+
+
+def test_pipeline_cache_load_rejects_invalid_documents(tmpdir):
+    pipeline_cache.configure(str(tmpdir))
+    try:
+        document = pipeline_cache.load(BytesIO(b'''- name: test1\n  unknown: plugin\n'''), TopLevel.valid)
+    finally:
+        pipeline_cache.configure()
+
+    assert_that(document, equal_to(None))
+    assert_that(tmpdir.listdir(), equal_to([]))
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from click.testing import CliRunner
+from hamcrest import assert_that
+from hamcrest import contains_string
+from hamcrest import equal_to
+from six import StringIO
+
+from deployer import loader
+from deployer.cli import initialize
+from deployer.cli import main
+from deployer.context import Context
+from deployer.plugins.plugin import Plugin
+from deployer.preflight import Preflight
+from deployer.registry import Registry
+
+
+class Define(Plugin):
+    TAG = 'define'
+
+    SCHEMA = str
+
+
+def check(text):
+    initialize()
+    return Preflight().check(loader.ordered_load(StringIO(text)))
+
+
+def test_preflight_builtin_variables_match_context():
+    context = Context()
+
+    assert_that(sorted(Context.BUILTIN_VARIABLES), equal_to(sorted(context.variables.last().keys())))
+
+
+def test_preflight_accepts_known_variables():
+    problems = check('''
+    - set:
+        greeting: Hello
+    - echo: "{{ greeting }} {{ node }} {{ env.HOME }} {{ range(3) | list }}"
+    - echo: "{{ item }}"
+      with_items: [1, 2]
+    - echo: hi
+      register: result
+    - echo: "{{ result }}"
+    - echo: "Hello {{ who | default('world') }} {{ other | d(1) }}"
+    - echo: "{% if later is defined %}{{ later }}{% endif %}{% if never is undefined %}!{% endif %}"
+    - matrix:
+        tags: [m1]
+        tasks:
+          - echo: "{{ matrix_tag }} {{ matrix_list }}"
+    - stage:
+        scope: False
+        tasks:
+          - set:
+              leaked: yes
+    - echo: "{{ leaked }}"
+    ''')
+
+    assert_that([str(problem) for problem in problems], equal_to([]))
+
+
+def test_preflight_reports_undefined_variables():
+    problems = check('''
+    - name: Typo
+      echo: "{{ greting }}"
+    - name: Scoped
+      stage:
+        tasks:
+          - set:
+              inner: 1
+    - echo: "{{ inner }}"
+    - echo: "{{ item }}"
+    - echo: "{{ matrix_tag }}"
+    - echo: "{{ item }}"
+      with_items: [1, 2]
+      register: looped
+    - echo: "{{ looped }}"
+    ''')
+
+    assert_that(len(problems), equal_to(5))
+    assert_that(str(problems[0]), contains_string("Typo: The variable 'greting' is undefined"))
+    assert_that(str(problems[1]), contains_string("'inner'"))
+    assert_that(str(problems[2]), contains_string("'item'"))
+    assert_that(str(problems[3]), contains_string("'matrix_tag'"))
+    assert_that(str(problems[4]), contains_string("'looped'"))
+
+
+def test_preflight_reports_conditions():
+    problems = check('''
+    - echo: hi
+      when: nbcpus >
+    - continue:
+        when:
+          - missing_condition
+    ''')
+
+    assert_that(len(problems), equal_to(2))
+    assert_that(str(problems[0]), contains_string("Syntax error"))
+    assert_that(str(problems[1]), contains_string("'missing_condition'"))
+
+
+def test_preflight_resolves_programs():
+    problems = check('''
+    - command: this-program-does-not-exist --help
+    - command: "{{ node }} is not resolved"
+    - command: sh -c true
+    - shell:
+        executable: /no/such/shell
+        script: echo hi
+    ''')
+
+    assert_that(len(problems), equal_to(2))
+    assert_that(str(problems[0]), contains_string("'this-program-does-not-exist' was not found"))
+    assert_that(str(problems[1]), contains_string("'/no/such/shell' was not found"))
+    assert_that([problem.fatal for problem in problems], equal_to([False, False]))
+
+
+def test_preflight_conditional_problems_are_not_fatal():
+    checker = Preflight()
+    initialize()
+    checker.check(loader.ordered_load(StringIO('''
+    - echo: "{{ only_on_windows }}"
+      when: is_windows
+    ''')))
+
+    assert_that(len(checker.problems), equal_to(1))
+    assert_that(len(checker.errors), equal_to(0))
+
+
+def test_preflight_fails_validate(tmpdir):
+    pipeline = tmpdir.join('pipeline.yaml')
+    pipeline.write('''
+- echo: "{{ greting }}"
+''')
+
+    runner = CliRunner()
+
+    assert_that(runner.invoke(main, ['validate', str(pipeline)]).exit_code, equal_to(1))
+    assert_that(runner.invoke(main, ['validate', '--no-preflight', str(pipeline)]).exit_code, equal_to(0))
+    assert_that(runner.invoke(main, ['exec', str(pipeline)]).exit_code, equal_to(2))
+
+
+def test_preflight_allows_programs_created_by_earlier_tasks(tmpdir):
+    pipeline = tmpdir.join('pipeline.yaml')
+    pipeline.write('''
+- shell:
+    script: |
+      printf '#!/bin/sh\\necho created\\n' > tool.sh
+      chmod +x tool.sh
+- command: ./tool.sh
+''')
+
+    runner = CliRunner()
+
+    with tmpdir.as_cwd():
+        assert_that(runner.invoke(main, ['exec', str(pipeline)]).exit_code, equal_to(0))
+
+
+def test_preflight_undefined_after_include_is_not_fatal():
+    problems = check('''
+    - echo: "{{ before }}"
+    - include: fragment.yaml
+    - echo: "{{ maybe_from_fragment }}"
+    ''')
+
+    assert_that([problem.fatal for problem in problems], equal_to([True, False]))
+
+
+def test_preflight_third_party_plugins_may_define_variables(monkeypatch):
+    initialize()
+    monkeypatch.setattr(Registry(), '_plugins', dict(Registry().plugins()))
+    monkeypatch.setattr(Registry(), '_index', dict(Registry()._index))
+    Registry().register_plugin('define', Define)
+
+    problems = check('''
+    - define: "1.2.3"
+    - echo: "{{ version }}"
+    ''')
+
+    assert_that([problem.fatal for problem in problems], equal_to([False]))
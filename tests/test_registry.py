@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import subprocess
+import sys
+from collections import OrderedDict
+
+from hamcrest import assert_that
+from hamcrest import equal_to
+from hamcrest import is_not
+from hamcrest import none
+
+from deployer.cli import register_plugins
+from deployer.pipeline_cache import fingerprint
+from deployer.plugins import Echo
+from deployer.plugins import Set
+from deployer.plugins import Stage
+from deployer.plugins import TopLevel
+from deployer.plugins.plugin import Plugin
+from deployer.registry import RESERVED_KEYS
+from deployer.registry import Registry
+
+
+class Name(Plugin):
+    TAG = 'name'
+
+
+def test_registry_dispatches_by_exact_key():
+    register_plugins()
+
+    registry = Registry()
+    assert_that(registry.find_plugin(OrderedDict([('name', 'a'), ('when', True), ('echo', 'b')])), equal_to(Echo))
+    assert_that(registry.find_plugin(OrderedDict([('tags', ['a']), ('stage', {})])), equal_to(Stage))
+    assert_that(registry.find_plugin(OrderedDict([('set', {})])), equal_to(Set))
+    assert_that(registry.find_plugin(OrderedDict([('reset_cache', True)])), none())
+    assert_that(registry.find_plugin(OrderedDict([('name', 'only')])), none())
+    assert_that(Plugin._find_matching_plugin_for_node(OrderedDict([('echo', 'b')])), equal_to(Echo))
+
+
+def test_registry_never_dispatches_reserved_keys(monkeypatch):
+    register_plugins()
+    monkeypatch.setattr(Registry(), '_plugins', dict(Registry().plugins()))
+    monkeypatch.setattr(Registry(), '_index', dict(Registry()._index))
+
+    Registry().register_plugin('name', Name)
+
+    assert_that(Registry().plugins()['name'], equal_to(Name))
+    assert_that(Registry().find_plugin(OrderedDict([('name', 'a')])), none())
+    assert_that(set(Registry()._index) & RESERVED_KEYS, equal_to(set()))
+
+
+def test_registry_substring_matching(monkeypatch):
+    register_plugins()
+
+    node = OrderedDict([('name', 'legacy'), ('reset_cache', OrderedDict([('a', 1)]))])
+    assert_that(TopLevel.valid([node]), equal_to(False))
+
+    monkeypatch.setattr(Registry, 'substring_matching', True)
+
+    assert_that(Registry().find_plugin(node), equal_to(Set))
+    assert_that(Registry().find_plugin(OrderedDict([('name', 'x'), ('echo', 'b')])), equal_to(Echo))
+    assert_that(Registry().find_plugin(OrderedDict([('name', 'x')])), none())
+
+
+def test_registry_substring_matching_changes_pipeline_cache_fingerprint(monkeypatch):
+    register_plugins()
+    exact = fingerprint()
+
+    monkeypatch.setattr(Registry, 'substring_matching', True)
+
+    assert_that(fingerprint(), is_not(equal_to(exact)))
+
+
+def test_builtin_plugins_are_imported_upon_first_use():
+    script = '\n'.join([
+        "import sys",
+        "from collections import OrderedDict",
+        "from deployer.cli import register_plugins",
+        "from deployer.registry import Registry",
+        "register_plugins()",
+        "print('deployer.plugins.echo' in sys.modules)",
+        "print(Registry().plugin_paths()['echo'])",
+        "print(Registry().find_plugin(OrderedDict([('echo', 'a')])).__name__)",
+        "print('deployer.plugins.echo' in sys.modules, 'deployer.plugins.shell' in sys.modules)",
+    ])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), DEPLOYER_ENTRY_POINT_CACHE='')
+    output = subprocess.check_output([sys.executable, '-c', script], env=env).decode('utf-8')
+
+    assert_that(output.split('\n'), equal_to(['False', 'deployer.plugins.echo.Echo', 'Echo', 'True False', '']))
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from collections import OrderedDict
+
+from hamcrest import assert_that
+from hamcrest import calling
+from hamcrest import contains_string
+from hamcrest import equal_to
+from hamcrest import raises
+from hamcrest import same_instance
+from six import StringIO
+
+from deployer import loader
+from deployer.cli import initialize
+from deployer.context import Context
+from deployer.plugins import TopLevel
+from deployer.plugins.plugin import Plugin
+from deployer.result import Result
+from deployer.result import Status
+
+
+def test_result_is_compact():
+    initialize()
+    result = Result(result='success')
+
+    assert_that(hasattr(result, '__dict__'), equal_to(False))
+    assert_that(result['result'], same_instance(Status.SUCCESS))
+    assert_that(result.result, same_instance(Status.SUCCESS))
+
+
+def test_result_behaves_as_a_mapping():
+    result = Result(result='failure')
+    result['stdout'] = 'Hello.'
+    result['code'] = 1
+
+    assert_that(result, equal_to({'result': 'failure', 'stdout': 'Hello.', 'code': 1}))
+    assert_that(sorted(result), equal_to(['code', 'result', 'stdout']))
+    assert_that(len(result), equal_to(3))
+    assert_that('stdout' in result, equal_to(True))
+    assert_that(result.get('missing'), equal_to(None))
+    assert_that(str(result), equal_to('Hello.'))
+
+    del result['stdout']
+    assert_that('stdout' in result, equal_to(False))
+    assert_that(calling(result.__getitem__).with_args('stdout'), raises(KeyError))
+    assert_that(str(result), equal_to('failure'))
+
+
+def test_result_copies():
+    result = Result(result='success', stdout='Hello.')
+    copy = result.copy()
+    copy['stdout'] = 'Changed.'
+
+    assert_that(copy, equal_to({'result': 'success', 'stdout': 'Changed.'}))
+    assert_that(result['stdout'], equal_to('Hello.'))
+    assert_that(json.loads(json.dumps(dict(result))), equal_to({'result': 'success', 'stdout': 'Hello.'}))
+
+
+def test_result_truth():
+    assert_that(bool(Result(result='success')), equal_to(True))
+    assert_that(bool(Result(result='skipped')), equal_to(True))
+    assert_that(bool(Result(result='failure')), equal_to(False))
+    assert_that(bool(Result(result='continue')), equal_to(False))
+    assert_that(Result(result='failure').failed(), equal_to(True))
+    assert_that(Result(result='skipped').skipped(), equal_to(True))
+
+
+def test_status_renders_as_its_value():
+    assert_that(str(Status.SUCCESS), equal_to('success'))
+    assert_that('%s' % Status.FAILURE, equal_to('failure'))
+    assert_that('{0}'.format(Status.SKIPPED), equal_to('skipped'))
+    assert_that(Status.CONTINUE == 'continue', equal_to(True))
+    assert_that('%r' % Status.SUCCESS, equal_to(repr('success')))
+
+
+def test_registered_result_within_templates(caplog):
+    stream = StringIO('''
+    - name: test1
+      set:
+        a: 1
+      register: test1
+
+    - name: result1
+      echo: "--{{ test1.result }}--{{ test1['result'] }}--{{ test1.result == 'success' }}--"
+    ''')
+    document = loader.ordered_load(stream)
+
+    for node in TopLevel.build(document):
+        node.execute(Context())
+
+    assert_that(caplog.text, contains_string('--success--success--True--'))
+
+
+def test_task_node_is_compact():
+    document = [OrderedDict([('name', 'Hi'), ('echo', 'Hello.'), ('tags', ['a'])])]
+    node = Plugin._compile(document)[0][0]
+
+    assert_that(hasattr(node, '__dict__'), equal_to(False))
+    assert_that(node.msg.source, equal_to('Hello.'))
+    assert_that(node._match_tags, equal_to(('a',)))
+    assert_that(node._obj._match_tags, same_instance(node._match_tags))
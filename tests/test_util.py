@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import sys
+import time
 
 import pytest
 from hamcrest import assert_that
@@ -23,6 +24,7 @@ from hamcrest import raises
 from twisted.internet.error import ProcessTerminated
 
 from deployer.cli import initialize
+from deployer.util import iterate_in_background
 from deployer.util import stop_reactor
 from deployer.util import sync_check_output
 
@@ -55,3 +57,34 @@ def test_util_win_echo_works(reactor):
 @pytest.mark.skipif(not IS_WINDOWS, reason='Irrelevant on non-Windows')
 def test_util_win_nonexisting_fails(reactor):
     assert_that(calling(sync_check_output).with_args(["sdfsdfdsf329909092"]), raises(ProcessTerminated))  # noqa: no-cover
+
+
+def test_util_iterates_in_background():
+    assert_that(list(iterate_in_background(iter(range(1000)), maxsize=4)), equal_to(list(range(1000))))
+
+
+def test_util_iterating_in_background_reraises():
+    def produce():
+        yield 1
+        raise ValueError("broken")
+
+    subject = iterate_in_background(produce())
+
+    assert_that(next(subject), equal_to(1))
+    assert_that(calling(next).with_args(subject), raises(ValueError))
+
+
+def test_util_iterating_in_background_may_be_abandoned():
+    produced = []
+
+    def produce():
+        for n in range(100):
+            produced.append(n)
+            yield n
+
+    subject = iterate_in_background(produce(), maxsize=1)
+    next(subject)
+    subject.close()
+    time.sleep(0.5)
+
+    assert_that(len(produced) < 100, equal_to(True))
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 Joseph Benden <joe@benden.us>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+
+from hamcrest import assert_that
+from hamcrest import contains_string
+from hamcrest import equal_to
+from hamcrest import is_not
+from hamcrest import same_instance
+from schema import And
+from schema import Optional
+from schema import Or
+from schema import Regex
+from schema import Schema
+from schema import Use
+from six import StringIO
+
+from deployer import loader
+from deployer.cli import register_plugins
+from deployer.plugins import Continue
+from deployer.plugins import Env
+from deployer.plugins import Include
+from deployer.plugins import Matrix
+from deployer.plugins import Set
+from deployer.plugins import Shell
+from deployer.plugins import Stage
+from deployer.plugins import TopLevel
+from deployer.plugins.plugin import Plugin
+from deployer.registry import Registry
+from deployer.validation import ValidationError
+from deployer.validation import compile_schema
+from deployer.validation import format_path
+from deployer.validation import schema_errors
+
+
+class Greet(Plugin):
+    """A third-party plug-in, which only declares its schema."""
+
+    TAG = 'greet'
+
+    SCHEMA = {
+        'who': And(str, len),
+        Optional('loud'): bool,
+    }
+
+
+def test_format_path():
+    assert_that(format_path(()), equal_to(''))
+    assert_that(format_path((0, 'stage', 'tasks', 1, 'shell')), equal_to('[0].stage.tasks[1].shell'))
+    assert_that(str(ValidationError(('shell', 'script'), 'Bad.')), equal_to('shell.script: Bad.'))
+    assert_that(str(ValidationError((), 'Bad.')), equal_to('<document>: Bad.'))
+
+
+def test_compiled_schema_agrees_with_schema():
+    schemas = [
+        Shell.SCHEMA, Env.SCHEMA, Set.SCHEMA, Continue.SCHEMA, Include.SCHEMA, Matrix.schema(), Stage.schema(),
+        int, And(Use(int), lambda n: n > 0), Regex(r'^a+$'), Or(None, [str]), {Optional(str): object, 'k': 1},
+    ]
+    values = [
+        None, True, 0, 1, 1.5, '', 'a', 'aaa', [], [''], ['a', 1], {}, {'k': 1}, {'k': 2}, {'other': 1},
+        {'script': 'a'}, {'script': ''}, {'script': 'a', 'silent': 'no'}, {'script': 'a', 'timeout': 1.0},
+        {'set': {'a': 'b'}}, {'set': {'a': 1}}, {'unset': []}, {'unset': ['a']}, {'unset': 'a'},
+        {'when': [True, 'a']}, {'when': [1]}, {'tasks': []}, {'tasks': [], 'scope': 1}, {'tasks': {}},
+        {'tags': ['a', 1, 2.0], 'tasks': []}, {'tags': {'a': {'b': 'c'}}, 'tasks': []}, {'tags': [''], 'tasks': []},
+    ]
+
+    for schema in schemas:
+        validator = compile_schema(schema)
+        for value in values:
+            assert_that((schema, value, validator.is_valid(value)), equal_to((schema, value, Schema(schema).is_valid(value))))
+
+
+def test_schema_errors_paths():
+    validator = compile_schema({Optional('set'): {And(str, len): And(str, len)}, 'tasks': [object]})
+
+    assert_that(schema_errors(validator, {'tasks': []}), equal_to([]))
+
+    errors = schema_errors(validator, {'set': {'a': 1}, 'tasks': []}, ('env',))
+    assert_that([error.path for error in errors], equal_to([('env', 'set', 'a')]))
+    assert_that(errors[0].message, contains_string("should be instance of 'str'"))
+
+    errors = schema_errors(validator, {'tasks': [], 'other': 1})
+    assert_that([error.path for error in errors], equal_to([('other',)]))
+
+    errors = schema_errors(validator, {})
+    assert_that([error.path for error in errors], equal_to([()]))
+    assert_that(errors[0].message, contains_string("Missing key: 'tasks'"))
+
+
+def test_schema_compiled_once_per_class():
+    register_plugins()
+
+    assert_that(Shell.__dict__.get('_validator'), is_not(None))
+    assert_that(Shell.validator(), same_instance(Shell.validator()))
+    assert_that(Stage.validator(), is_not(same_instance(Plugin.validator())))
+
+
+def test_third_party_plugin_declaring_schema(monkeypatch):
+    monkeypatch.setattr(Registry(), '_plugins', dict(Registry().plugins()))
+    monkeypatch.setattr(Registry(), '_index', dict(Registry()._index))
+    Registry().register_plugin('greet', Greet)
+
+    assert_that(Greet.__dict__.get('_validator'), is_not(None))
+    assert_that(Greet.valid(OrderedDict([('greet', OrderedDict([('who', 'world')]))])), equal_to(True))
+    assert_that(Greet.valid(OrderedDict([('greet', OrderedDict([('who', '')]))])), equal_to(False))
+    assert_that(Greet.valid(OrderedDict([('other', 1)])), equal_to(False))
+    assert_that(Greet.valid({'greet': {'who': 'world'}}), equal_to(False))
+
+    errors = Greet.errors(OrderedDict([('greet', OrderedDict([('who', 'world'), ('loud', 'yes')]))]))
+    assert_that([error.path for error in errors], equal_to([('greet', 'loud')]))
+
+
+def test_top_level_errors_of_nested_tasks():
+    register_plugins()
+
+    stream = StringIO('''
+    - echo: Hello.
+    - stage:
+        tasks:
+          - echo: Fine.
+          - shell:
+              script: 1
+          - unknown: task
+    ''')
+    document = loader.ordered_load(stream)
+
+    assert_that(TopLevel.valid(document), equal_to(False))
+
+    errors = TopLevel.errors(document)
+    assert_that([format_path(error.path) for error in errors],
+                equal_to(['[1].stage.tasks[1].shell.script', '[1].stage.tasks[2]']))
+    assert_that(errors[1].message, contains_string('No plug-in'))
+
+    assert_that(TopLevel.errors(OrderedDict()), equal_to([ValidationError((), "The pipeline document must be a list of tasks.")]))
+    assert_that(TopLevel.errors([]), equal_to([]))